@@ -0,0 +1,105 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from dataclasses import fields
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auxillary.versioninfo import VersionInfo
+from network.headers.header import *
+from network.headers.gridrespond import GridRespond
+from network.headers.serverrespond import ServerRespond
+from network.packetsegment import TrustedDecode
+from network.packets.converter import *
+from network.packets.fenswitchgear import *
+from network.packets.gridconfig import *
+from network.packets.packetparser import PacketParser
+from network.packets.scibreakbreaker import *
+from network.packets.servercommand import *
+from network.payloads.converterrespond import ConverterLiveData
+from network.payloads.fenswitchgearrespond import FENSwitchgearLiveDataPayload
+from network.payloads.gridelementconfigs import *
+from network.payloads.scibreakbreakerrespond import SciBreakBreakerLiveDataPayload
+from network.payloads.serverrespond import ServerStatusPayload
+
+def CreateEncodePackets():
+    # one packet of every type the editor sends
+    nodes = [NodeConfig(id=i) for i in range(20)]
+    return (
+        ("ServerStartGrid", ServerStartGridPacket.FromConfig()[1]),
+        ("ConverterSetMode", ConverterSetModePacket.FromConfig(1, ConverterModes.MODE_IDLE)[1]),
+        ("ConverterUpdateData", ConverterUpdateDataPacket.FromConfig(1, 0, [1, 2, 3, 4])[1]),
+        ("FENSwitchgearSetSwitch", FENSwitchgearSetSwitchPacket.FromConfig(1, 3)[1]),
+        ("SciBreakBreakerSetTripLevel", SciBreakBreakerSetTripLevelPacket.FromConfig(1, [1, 2, 3, 4])[1]),
+        ("GridConfig (20 elements)", GridConfigPacket.FromConfig(nodes, VersionInfo(1, 0))[1][0]))
+
+def CreateFrame(packetType, deviceType, body):
+    # header of the frame followed by the body
+    length = Header.size + len(body)
+    return struct.pack("<BBHHH", packetType, deviceType, 1, length, 0) + body
+
+def CreateDecodeFrames():
+    # one frame of every type the editor receives
+    deviceData = struct.pack("<II", 1, 0)
+    return (
+        ("IsAlive", CreateFrame(PacketType.ISALIVE, DeviceType.NONE, bytes(8))),
+        ("CommandRespond", CreateFrame(PacketType.RESPOND, DeviceType.CONVERTER,
+            struct.pack("<II", 1, 2))),
+        ("ServerStatus", CreateFrame(PacketType.RESPOND, DeviceType.SERVER,
+            struct.pack("<II", ServerRespond.STATUS_DATA, 2) + bytes(ServerStatusPayload.totalSize))),
+        ("GridGetLength", CreateFrame(PacketType.RESPOND, DeviceType.GRID,
+            struct.pack("<II", GridRespond.GET_CONFIG_LENGTH, 2) + struct.pack("<IIII", 3, 0, 0, 0))),
+        ("FENSwitchgearLiveData", CreateFrame(PacketType.DEVICEDATA, DeviceType.FENSWITCHGEAR,
+            deviceData + bytes(FENSwitchgearLiveDataPayload.totalSize))),
+        ("SciBreakBreakerLiveData", CreateFrame(PacketType.DEVICEDATA, DeviceType.SCIBREAKBREAKER,
+            deviceData + bytes(SciBreakBreakerLiveDataPayload.totalSize))),
+        ("ConverterLiveData", CreateFrame(PacketType.DEVICEDATA, DeviceType.CONVERTER,
+            deviceData + bytes(ConverterLiveData.LIVE_DATA_LENGTH))))
+
+def Measure(function, argument, iterations):
+    # operations per second of a function
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return iterations / (time.perf_counter() - start)
+
+def Main():
+    parser = argparse.ArgumentParser(description="Encode and decode throughput per packet type")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    def Best(function, argument):
+        return max(Measure(function, argument, args.iterations) for _ in range(args.repeat))
+
+    print ("encode")
+    for name, packet in CreateEncodePackets():
+        print ("  {:30s} {:12.0f} packets/s".format(name, Best(type(packet).GetBytes, packet)))
+
+    print ("decode")
+    for name, frame in CreateDecodeFrames():
+        # decoding a frame straight from the receive buffer
+        view = memoryview(bytearray(frame))
+        print ("  {:30s} {:12.0f} packets/s".format(name, Best(PacketParser.GetPacketFromBytes, view)))
+
+    # converter live data with an open control window, all data sets are read
+    def DecodeAllDataSets(view):
+        payload = PacketParser.GetPacketFromBytes(view).payload
+        return [getattr(payload, f.name) for f in fields(payload)]
+
+    frame = dict(CreateDecodeFrames())["ConverterLiveData"]
+    print ("  {:30s} {:12.0f} packets/s".format("ConverterLiveData (data sets)",
+        Best(DecodeAllDataSets, memoryview(bytearray(frame)))))
+
+    print ("construction from wire fields")
+    headerFields = Header.ParseBytes(CreateFrame(PacketType.ISALIVE, DeviceType.NONE, b""))
+    print ("  {:30s} {:12.0f} headers/s".format("validated", Best(lambda f: Header(*f), headerFields)))
+    with TrustedDecode():
+        print ("  {:30s} {:12.0f} headers/s".format("trusted", Best(lambda f: Header(*f), headerFields)))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.headers.header import *
+from network.streamframer import StreamFramer
+
+# live data frames of the devices (deviceType, length)
+FRAME_TYPES = ((DeviceType.CONVERTER, 128), (DeviceType.FENSWITCHGEAR, 36),
+    (DeviceType.SCIBREAKBREAKER, 40))
+
+def CreateFrames(numberFrames, rng):
+    # list of consecutive live data frames of random devices
+    frames = []
+    for i in range(numberFrames):
+        deviceType, length = rng.choice(FRAME_TYPES)
+        header = struct.pack("<BBHHH", PacketType.DEVICEDATA, deviceType, i & 0xFFFF, length, 0)
+        frames.append(header + bytes(length - len(header)))
+    return frames
+
+def Corrupt(frames, rate, rng):
+    # insert garbage between frames, the frames themselves stay intact
+    stream = bytearray()
+    corrupted = 0
+    for frame in frames:
+        if rng.random() < rate:
+            stream += bytes(rng.randrange(256) for _ in range(rng.randrange(1, 64)))
+            corrupted += 1
+        stream += frame
+    return bytes(stream), corrupted
+
+def Chunks(stream, maxChunk, rng):
+    # split the stream like a socket would
+    chunks = []
+    position = 0
+    while position < len(stream):
+        size = rng.randrange(1, maxChunk + 1)
+        chunks.append(stream[position:position + size])
+        position += size
+    return chunks
+
+def Run(chunks):
+    # feed all chunks and count the frames
+    framer = StreamFramer()
+    frames = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        for frame in framer.Feed(chunk):
+            frames += 1
+    duration = time.perf_counter() - start
+    return frames, duration, framer.GetStatistics()
+
+def Main():
+    parser = argparse.ArgumentParser(description="Throughput and recovery of the stream framer")
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=4096, help="largest chunk size")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    frames = CreateFrames(args.frames, rng)
+
+    for rate in (0.0, 0.001, 0.01):
+        stream, corrupted = Corrupt(frames, rate, rng)
+        received, duration, statistics = Run(Chunks(stream, args.chunk, rng))
+        print ("corruption {:5.1%}: {:10.0f} frames/s, {} of {} frames, {} garbage blocks, {}".format(
+            rate, received / duration, received, len(frames), corrupted, statistics))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
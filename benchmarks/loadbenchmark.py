@@ -0,0 +1,374 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from file.filedata import GridFile
+from network.asyncnetworkinterface import AsyncNetworkInterface
+from network.eventloop import EventLoopThread
+from network.networkinterface import *
+from network.packetdistributor import PacketDistributor
+from network.packets.converter import ConverterSetModePacket
+from network.headers.convertercommand import ConverterModes
+from network.payloads.gridelementconfigs import *
+
+# received live data below this share of the offered frames is not sustained
+SUSTAINED_RATIO = 0.98
+
+class DirectBridge:
+    # there is no Tk loop, calls are made at once
+    def Post(self, function, *args):
+        function(*args)
+        return
+
+class HeadlessEditor:
+    # stands in for the editor, counts live data and passes responds to the
+    # packet distributor
+    def __init__(self):
+        self.tkBridge = DirectBridge()
+        self.packetDistributor = PacketDistributor()
+        self.Reset()
+
+    def Reset(self):
+        # live data id of every device, gaps in the ids are lost frames
+        self.lastIds = {}
+        self.frames = 0
+        self.gaps = 0
+        return
+
+    def NewPacket(self, packet):
+        header = packet.header
+        if header.packetType == PacketType.DEVICEDATA:
+            key = (header.deviceType, header.deviceId)
+            lastId = self.lastIds.get(key)
+            if lastId is not None and header.id != (lastId + 1) & 0xFFFFFFFF:
+                self.gaps += 1
+            self.lastIds[key] = header.id
+            self.frames += 1
+        elif header.packetType == PacketType.RESPOND and header.commandId:
+            self.packetDistributor.NewPacketData(header.commandId, packet)
+        return
+
+    def ChangedNetworkStatus(self):
+        pass
+
+    def ServerReconnected(self):
+        pass
+
+class NullProgress:
+    # progress window of the grid transfers
+    def SetProgress(self, value, text):
+        pass
+
+class Simulator:
+    # the simulated server runs in a process of its own, so it doesn't share
+    # the interpreter with the client
+    def __init__(self, devices, rate, liveData = True):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+
+        # the devices are split between the device types
+        converters = devices - 2 * (devices // 3)
+        arguments = [sys.executable, os.path.join(ROOT, "startSimulator.py"), "--port", str(self.port),
+            "--converters", str(converters), "--switchgears", str(devices // 3),
+            "--breakers", str(devices // 3), "--rate", str(rate), "--report", "0"]
+        if liveData:
+            arguments.append("--live-data")
+
+        self.process = subprocess.Popen(arguments, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+        # wait for the server to listen
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), 0.1).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+
+        self.Stop()
+        raise RuntimeError("Simulator did not start")
+
+    def Stop(self):
+        self.process.terminate()
+        self.process.wait()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Stop()
+
+class Client:
+    # network interface of the editor with a headless editor
+    def __init__(self, port, backend):
+        self.editor = HeadlessEditor()
+        self.eventLoop = None
+
+        if backend == "asyncio":
+            self.eventLoop = EventLoopThread()
+            self.networkInterface = AsyncNetworkInterface(self.editor, self.eventLoop)
+        else:
+            self.networkInterface = NetworkInterface(self.editor)
+
+        self.networkInterface.port = port
+        self.networkInterface.autoReconnect = False
+
+        self.gridFile = GridFile(self.editor, None, self.networkInterface, None)
+        self.networkInterface.SetGridFile(self.gridFile)
+
+        if not self.networkInterface.Connect():
+            raise RuntimeError("Cannot connect to the simulator")
+
+    def Close(self):
+        self.networkInterface.Disconnect()
+        if self.eventLoop is not None:
+            self.eventLoop.Stop()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+def Quiet():
+    # the transfers of the client print every packet
+    return contextlib.redirect_stdout(io.StringIO())
+
+def Percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def MeasureLiveData(args, devices) -> dict:
+    # raise the rate per device until the client doesn't receive all frames
+    steps = []
+
+    for rate in args.rates:
+        offered = devices * rate
+        with Simulator(devices, rate) as simulator, Quiet(), Client(simulator.port, args.backend) as client:
+            time.sleep(args.warmup)
+            client.editor.Reset()
+            time.sleep(args.duration)
+            frames = client.editor.frames
+            gaps = client.editor.gaps
+            dispatch = client.networkInterface.packetDispatcher.GetStatistics()
+
+        # gaps are live data frames replaced or dropped by the dispatch queue
+        received = frames / args.duration
+        sustained = received >= offered * SUSTAINED_RATIO and gaps == 0
+        steps.append({"rate" : rate, "offered" : offered, "received" : received,
+            "gaps" : gaps, "sustained" : sustained, "dispatch" : dispatch})
+
+        print ("  {:5d} devices at {:6.1f} Hz: offered {:9.0f} frames/s, received {:9.0f} frames/s, {} gaps{}".format(
+            devices, rate, offered, received, gaps, "" if sustained else ", not sustained"))
+
+        if not sustained:
+            break
+
+    sustainedSteps = [step["received"] for step in steps if step["sustained"]]
+    return {"maxSustained" : max(sustainedSteps, default=0.0), "steps" : steps}
+
+def MeasureCommandRtt(args, devices) -> dict:
+    # commands sent one after another while live data is received
+    latencies = []
+    timeouts = 0
+    modes = (ConverterModes.MODE_IDLE, ConverterModes.MODE_OFF)
+
+    with Simulator(devices, args.rtt_rate) as simulator, Quiet(), Client(simulator.port, args.backend) as client:
+        time.sleep(args.warmup)
+        packetDistributor = client.editor.packetDistributor
+
+        for i in range(args.commands):
+            id, packet = ConverterSetModePacket.FromConfig(1, modes[i % 2])
+
+            start = time.perf_counter()
+            handle = packetDistributor.RegisterTransfer(id)
+            client.networkInterface.SendData(packet.GetBytes())
+            respond = packetDistributor.WaitForTransferComplete(handle)
+
+            if respond is None:
+                timeouts += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    result = {"commands" : args.commands, "timeouts" : timeouts}
+    if latencies:
+        result.update({
+            "p50Ms"  : Percentile(latencies, 0.5) * 1000,
+            "p90Ms"  : Percentile(latencies, 0.9) * 1000,
+            "p99Ms"  : Percentile(latencies, 0.99) * 1000,
+            "maxMs"  : latencies[-1] * 1000})
+
+    print ("  {:5d} devices: command rtt p50 {:.2f} ms, p99 {:.2f} ms, {} timeouts".format(
+        devices, result.get("p50Ms", 0), result.get("p99Ms", 0), timeouts))
+    return result
+
+def MeasureGridTransfer(args, elements) -> dict:
+    # upload and download a grid of nodes
+    gridConfiguration = [NodeConfig(id=i & 0xFFFF) for i in range(elements)]
+
+    with Simulator(0, 1, False) as simulator, Quiet(), Client(simulator.port, args.backend) as client:
+        gridFile = client.gridFile
+
+        gridFile.gridConfigurationList = list(gridConfiguration)
+        start = time.perf_counter()
+        uploaded = (gridFile.ClearServerConfiguration() and
+            gridFile.UploadServerConfiguration(NullProgress()) and
+            gridFile.LoadServerConfiguration())
+        uploadTime = time.perf_counter() - start
+
+        gridFile.gridConfigurationList = []
+        start = time.perf_counter()
+        downloaded = gridFile.GetServerConfiguration(NullProgress())
+        downloadTime = time.perf_counter() - start
+
+        downloaded = downloaded and len(gridFile.gridConfigurationList) == elements
+
+    print ("  {:6d} elements: upload {:.3f} s{}, download {:.3f} s{}".format(elements,
+        uploadTime, "" if uploaded else " (failed)", downloadTime, "" if downloaded else " (failed)"))
+
+    return {"elements" : elements, "uploadS" : uploadTime, "uploaded" : bool(uploaded),
+        "downloadS" : downloadTime, "downloaded" : bool(downloaded)}
+
+def MeasureMemory(args, devices) -> dict:
+    # traced memory of the client while receiving live data for a long time
+    samples = []
+
+    with Simulator(devices, args.memory_rate) as simulator, Quiet(), Client(simulator.port, args.backend) as client:
+        time.sleep(args.warmup)
+        tracemalloc.start()
+        start = time.monotonic()
+
+        while True:
+            samples.append((time.monotonic() - start, tracemalloc.get_traced_memory()[0]))
+            if samples[-1][0] >= args.memory_duration:
+                break
+            time.sleep(min(args.memory_interval, args.memory_duration - samples[-1][0]))
+
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        frames = client.editor.frames
+
+    growth = samples[-1][1] - samples[0][1]
+    minutes = samples[-1][0] / 60
+    result = {"durationS" : samples[-1][0], "frames" : frames, "growthKb" : growth / 1024,
+        "growthKbPerMin" : growth / 1024 / minutes if minutes else 0.0, "peakKb" : peak / 1024,
+        "samples" : [{"timeS" : t, "kb" : size / 1024} for t, size in samples]}
+
+    print ("  {:5d} devices: {:.0f} s, growth {:.1f} kB ({:.1f} kB/min), peak {:.1f} kB".format(
+        devices, result["durationS"], result["growthKb"], result["growthKbPerMin"], result["peakKb"]))
+    return result
+
+def GetCommit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def GetMetrics(results) -> dict:
+    # the numbers compared between two runs, True if higher is better
+    metrics = {}
+    for devices, result in results["liveData"].items():
+        metrics["liveData " + devices + " maxSustained"] = (result["maxSustained"], True)
+    for devices, result in results["commandRtt"].items():
+        for key in ("p50Ms", "p99Ms"):
+            if key in result:
+                metrics["commandRtt " + devices + " " + key] = (result[key], False)
+    for result in results["grid"]:
+        metrics["grid " + str(result["elements"]) + " uploadS"] = (result["uploadS"], False)
+        metrics["grid " + str(result["elements"]) + " downloadS"] = (result["downloadS"], False)
+    for devices, result in results["memory"].items():
+        metrics["memory " + devices + " growthKbPerMin"] = (result["growthKbPerMin"], False)
+    return metrics
+
+def Compare(oldResults, newResults):
+    # print the change of every metric found in both runs
+    oldMetrics = GetMetrics(oldResults)
+    newMetrics = GetMetrics(newResults)
+
+    print ("compared with " + str(oldResults.get("commit")))
+    for name, (new, higherIsBetter) in newMetrics.items():
+        if name not in oldMetrics:
+            continue
+
+        old = oldMetrics[name][0]
+        change = (new - old) / old * 100 if old else 0.0
+        worse = change < 0 if higherIsBetter else change > 0
+        print ("  {:40s} {:12.3f} -> {:12.3f} {:+7.1f}%{}".format(name, old, new, change,
+            " worse" if worse and abs(change) > 10 else ""))
+    return
+
+def Main():
+    parser = argparse.ArgumentParser(description="Load of the client against a local simulated server")
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 100, 1000], help="numbers of simulated devices")
+    parser.add_argument("--rates", type=float, nargs="+", default=[1, 2, 5, 10, 20, 50, 100, 200, 500],
+        help="live data rates per device in Hz, raised until frames are missing")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per live data rate")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before measuring")
+    parser.add_argument("--commands", type=int, default=200, help="commands for the round trip time")
+    parser.add_argument("--rtt-rate", type=float, default=10.0, help="live data rate per device while measuring commands")
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=[100, 1000, 10000], help="grid elements to transfer")
+    parser.add_argument("--memory-duration", type=float, default=60.0, help="seconds of the memory run, 0 to skip")
+    parser.add_argument("--memory-interval", type=float, default=5.0, help="seconds between memory samples")
+    parser.add_argument("--memory-rate", type=float, default=10.0, help="live data rate per device of the memory run")
+    parser.add_argument("--backend", choices=("thread", "asyncio"), default="thread", help="network interface of the client")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results", "loadbenchmark.json"),
+        help="file for the results")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = {
+        "commit"     : GetCommit(),
+        "time"       : time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python"     : platform.python_version(),
+        "platform"   : platform.platform(),
+        "arguments"  : vars(args),
+        "liveData"   : {},
+        "commandRtt" : {},
+        "grid"       : [],
+        "memory"     : {}}
+
+    print ("live data")
+    for devices in args.devices:
+        results["liveData"][str(devices)] = MeasureLiveData(args, devices)
+
+    print ("command round trip time")
+    for devices in args.devices:
+        results["commandRtt"][str(devices)] = MeasureCommandRtt(args, devices)
+
+    print ("grid transfer")
+    for elements in args.grid_sizes:
+        results["grid"].append(MeasureGridTransfer(args, elements))
+
+    if args.memory_duration:
+        print ("memory")
+        for devices in args.devices:
+            results["memory"][str(devices)] = MeasureMemory(args, devices)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print ("results written to " + args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            Compare(json.load(f), results)
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.headers.header import *
+from network.receivebuffer import ReceiveBuffer
+
+# live data frame of a converter (header, device data header, payload)
+FRAME_LENGTH = 128
+
+def CreateStream(numberFrames):
+    # build the bytes of many consecutive live data frames
+    header = struct.pack("<BBHHH", PacketType.DEVICEDATA, DeviceType.CONVERTER, 1,
+        FRAME_LENGTH, 0)
+    frame = header + bytes(FRAME_LENGTH - len(header))
+    return frame * numberFrames
+
+def SendStream(sock, stream, chunkSize):
+    # send the stream in chunks of the given size and close the socket
+    view = memoryview(stream)
+    for start in range(0, len(stream), chunkSize):
+        sock.sendall(view[start:start + chunkSize])
+    sock.shutdown(socket.SHUT_WR)
+    return
+
+def RecvBytes(sock, length):
+    # receive path of the network interface before the receive buffer
+    recvData = bytearray()
+    while length > 0:
+        data = sock.recv(length)
+        if not data:
+            raise ConnectionError
+        length -= len(data)
+        recvData += data
+    return recvData
+
+def ReceiveOld(sock, numberFrames):
+    # read header and payload with separate calls and concatenate them
+    frames = 0
+    while frames < numberFrames:
+        header = RecvBytes(sock, Header.size)
+        length = Header.ParseBytes(header)[3]
+        payload = RecvBytes(sock, length - Header.size)
+        frame = header + payload
+        Header.ParseBytes(frame)
+        frames += 1
+    return frames
+
+def ReceiveNew(sock, numberFrames):
+    # receive into the preallocated buffer and drain all complete frames
+    receiveBuffer = ReceiveBuffer()
+    frames = 0
+    while frames < numberFrames:
+        if receiveBuffer.RecvFrom(sock) == 0:
+            break
+        for frame in receiveBuffer.GetFrames():
+            Header.ParseBytes(frame)
+            frames += 1
+    return frames
+
+def Run(receiveFunction, stream, numberFrames, chunkSize):
+    # measure the frames per second of one receive function
+    receiver, sender = socket.socketpair()
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    senderThread = threading.Thread(target=SendStream, args=(sender, stream, chunkSize))
+
+    start = time.perf_counter()
+    senderThread.start()
+    frames = receiveFunction(receiver, numberFrames)
+    duration = time.perf_counter() - start
+
+    senderThread.join()
+    receiver.close()
+    sender.close()
+    return frames / duration
+
+def Main():
+    parser = argparse.ArgumentParser(description="Frames per second of the receive path")
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--chunk", type=int, default=4096, help="bytes per send call")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    stream = CreateStream(args.frames)
+
+    for name, function in (("old (recv + concatenation)", ReceiveOld),
+        ("new (recv_into + memoryview)", ReceiveNew)):
+        results = [Run(function, stream, args.frames, args.chunk) for _ in range(args.repeat)]
+        print ("{:30s} {:12.0f} frames/s".format(name, max(results)))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import argparse
+import collections
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codecbenchmark import CreateDecodeFrames
+from network.packets.packetparser import PacketParser
+from network.trafficcapture import *
+
+def CreateCapture(filename, numberFrames, rate):
+    # synthetic capture of all decodable frames, received with a fixed rate
+    frames = [frame for name, frame in CreateDecodeFrames()]
+    recorder = TrafficRecorder(filename)
+    for i in range(numberFrames):
+        recorder.Record(CaptureDirection.RECEIVED, frames[i % len(frames)], int(i * 1e9 / rate))
+    recorder.Close()
+    return
+
+def Main():
+    parser = argparse.ArgumentParser(description="Replay a capture through the packet parser")
+    parser.add_argument("--capture", help="capture file, a synthetic one is created if missing")
+    parser.add_argument("--frames", type=int, default=100000, help="frames of the synthetic capture")
+    parser.add_argument("--rate", type=float, default=20000, help="frames/s of the synthetic capture")
+    parser.add_argument("--speed", type=float, action="append", help="replay speeds, 0 for maximum")
+    args = parser.parse_args()
+
+    filename = args.capture
+    if filename is None:
+        filename = os.path.join(tempfile.mkdtemp(), "synthetic.kesscap")
+        CreateCapture(filename, args.frames, args.rate)
+
+    packetTypes = collections.Counter()
+
+    def OnFrame(frame):
+        packetTypes[type(PacketParser.GetPacketFromBytes(frame)).__name__] += 1
+        return
+
+    for speed in args.speed or [0, 1]:
+        packetTypes.clear()
+        statistics = TrafficReplayer(filename).Replay(OnFrame, speed or None)
+
+        print ("speed {:>4s}: {:10.0f} frames/s, {:7.2f} MB/s, {:.2f} s, max lag {:.2f} ms, {} errors".format(
+            str(speed or "max"), statistics["framesPerS"], statistics["bytesPerS"] / 1e6,
+            statistics["duration"], statistics["maxLagMs"], statistics["errors"]))
+
+    print ("packets: " + str(dict(packetTypes)))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from devices.deviceroutingtable import DeviceRoutingTable
+
+# device type used for all fake devices
+DEVICE_TYPE = 1
+
+class FakeDevice:
+    # minimal device, only counts the packets it gets
+    def __init__(self, deviceID):
+        self.deviceType = DEVICE_TYPE
+        self.deviceID = deviceID
+        self.packets = 0
+
+    def HandleNewPacket(self, packet):
+        self.packets += 1
+        return
+
+def RouteLinear(deviceList, deviceType, deviceId, packet):
+    # routing of the editor before the routing table
+    for e in deviceList:
+        if e.deviceID == deviceId:
+            e.HandleNewPacket(packet)
+    return
+
+def RouteTable(routingTable, deviceType, deviceId, packet):
+    # routing with one lookup in the routing table
+    for e in routingTable.GetDevices(deviceType, deviceId):
+        e.HandleNewPacket(packet)
+    return
+
+def Run(routeFunction, target, ids, packet):
+    # measure the routed packets per second
+    start = time.perf_counter()
+    for id in ids:
+        routeFunction(target, DEVICE_TYPE, id, packet)
+    return len(ids) / (time.perf_counter() - start)
+
+def Main():
+    parser = argparse.ArgumentParser(description="Packets per second routed to devices")
+    parser.add_argument("--packets", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for numberDevices in (10, 100, 1000):
+        deviceList = [FakeDevice(i) for i in range(numberDevices)]
+        routingTable = DeviceRoutingTable()
+        for e in deviceList:
+            routingTable.Register(e.deviceType, e.deviceID, e)
+
+        # spread the packets over all devices
+        ids = [i % numberDevices for i in range(args.packets)]
+
+        linear = max(Run(RouteLinear, deviceList, ids, None) for _ in range(args.repeat))
+        table = max(Run(RouteTable, routingTable, ids, None) for _ in range(args.repeat))
+        print ("{:5d} devices: linear {:12.0f} packets/s, table {:12.0f} packets/s".format(
+            numberDevices, linear, table))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
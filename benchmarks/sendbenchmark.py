@@ -0,0 +1,106 @@
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.headers.header import *
+from network.sendscheduler import *
+from network.streamframer import StreamFramer
+
+# urgent frames carry this device id and their send time
+URGENT_ID = 0xFFFF
+
+def CreateFrame(deviceId, length, payload = b""):
+    header = struct.pack("<BBHHH", PacketType.COMMAND, DeviceType.SCIBREAKBREAKER, deviceId, length, 0)
+    return header + payload + bytes(length - len(header) - len(payload))
+
+def Reader(connection, rate, latencies, stop):
+    # receive with a limited rate, like a busy server
+    framer = StreamFramer()
+    chunk = 4096
+    while not stop.is_set():
+        try:
+            data = connection.recv(chunk)
+        except OSError:
+            break
+        if not data:
+            break
+
+        now = time.perf_counter()
+        for frame in framer.Feed(data):
+            if struct.unpack_from("<H", frame, 2)[0] == URGENT_ID:
+                latencies.append(now - struct.unpack_from("<d", frame, 8)[0])
+
+        time.sleep(len(data) / rate)
+    return
+
+def Run(bulkPriority, args):
+    # flood bulk frames and measure how long urgent frames take
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    client = socket.socket()
+    client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, args.sndbuf)
+    client.connect(server.getsockname())
+    client.settimeout(1)
+    connection, _ = server.accept()
+    connection.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.sndbuf)
+
+    latencies = []
+    stop = threading.Event()
+    reader = threading.Thread(target=Reader, args=(connection, args.rate, latencies, stop))
+    reader.start()
+
+    scheduler = SendScheduler(client)
+
+    def Flood():
+        bulk = CreateFrame(1, 1024)
+        while not stop.is_set():
+            scheduler.Put(bulk, bulkPriority, 0.1)
+    flood = threading.Thread(target=Flood)
+    flood.start()
+
+    for i in range(args.urgent):
+        time.sleep(args.period)
+        scheduler.Put(CreateFrame(URGENT_ID, 24, struct.pack("<d", time.perf_counter())), SendPriority.SAFETY)
+
+    time.sleep(1)
+    stop.set()
+    flood.join()
+    scheduler.Stop()
+    client.close()
+    reader.join()
+    connection.close()
+    server.close()
+
+    return sorted(latencies), scheduler.queue.GetStatistics()
+
+def Main():
+    parser = argparse.ArgumentParser(description="Latency of safety frames during a bulk transfer")
+    parser.add_argument("--urgent", type=int, default=100, help="number of safety frames")
+    parser.add_argument("--period", type=float, default=0.01, help="seconds between safety frames")
+    parser.add_argument("--rate", type=float, default=4e6, help="bytes/s the reader accepts")
+    parser.add_argument("--sndbuf", type=int, default=64 * 1024, help="socket buffer size")
+    args = parser.parse_args()
+
+    # with bulk frames in the safety queue, urgent frames wait behind them
+    for name, bulkPriority in (("fifo", SendPriority.SAFETY), ("prioritised", SendPriority.BULK)):
+        latencies, statistics = Run(bulkPriority, args)
+        if not latencies:
+            print (name + ": no safety frames received")
+            continue
+
+        print ("{:12s} received {:4d}, latency median {:7.2f} ms, p99 {:7.2f} ms, max {:7.2f} ms, {} batches".format(
+            name, len(latencies), latencies[len(latencies) // 2] * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000, latencies[-1] * 1000, statistics["batches"]))
+
+    return
+
+if __name__ == "__main__":
+    Main()
\ No newline at end of file
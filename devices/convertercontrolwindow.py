@@ -7,6 +7,7 @@ from graphical.canvastextclass import *
 from graphical.canvascontrolswitch import *
 
 from generic.genericconfignotebook import *
+from generic.changefilter import *
 
 from network.headers.convertercommand import *
 from network.payloads.converterrespond import *
@@ -44,6 +45,9 @@ class ConverterControlWindow(tk.Toplevel):
         self.scopeManager = scopeManager
         self.config = config
         self.wm_protocol('WM_DELETE_WINDOW', self.OnSubwindowDestroyCallback)
+        
+        # widgets are only changed if their value changed
+        self.changeFilter = ChangeFilter(widgetStatistics)
         self.title(self.converterDevice.deviceName)
         
         self.canvas = tk.Canvas(self, width=800, height=800)
@@ -87,7 +91,9 @@ class ConverterControlWindow(tk.Toplevel):
         # update generic values
         try:
             # operating mode
-            self.generalNotebook.elementDict["General:opmode"]['text'] = ConverterModeNames.names[Data.statusDataSet.mode]
+            opMode = ConverterModeNames.names[Data.statusDataSet.mode]
+            if self.changeFilter.HasChanged("General:opmode", opMode):
+                self.generalNotebook.elementDict["General:opmode"]['text'] = opMode
             
             # power
             power = CalculatePower(v1, c1, self.converterDevice.port1Type, v2, c2, self.converterDevice.port2Type) / 1000
@@ -95,7 +101,9 @@ class ConverterControlWindow(tk.Toplevel):
             print("Power value: " + str(Data.staticDataSet.power))
             maxPower = int(ParsePowerValue(Data.staticDataSet.power) / 1000)
             percent = int(abs(power / maxPower) * 100)
-            self.generalNotebook.elementDict["General:power"]['text'] = str(round(power, 2)) + " kW (" + str(percent) + " %)"
+            powerText = str(round(power, 2)) + " kW (" + str(percent) + " %)"
+            if self.changeFilter.HasChanged("General:power", powerText):
+                self.generalNotebook.elementDict["General:power"]['text'] = powerText
             
             if power > 0:
                 if self.converterDevice.graphicalElementHandler.rotation in [0, 270]:
@@ -116,37 +124,45 @@ class ConverterControlWindow(tk.Toplevel):
             print (e)
         
         # update voltage setpoints
-        self.voltageNotebook.elementDict["Voltage Control Side 1:voltage"].SetText(str(Data.voltageControl1Data.voltage))
-        self.voltageNotebook.elementDict["Voltage Control Side 2:voltage"].SetText(str(Data.voltageControl2Data.voltage))
+        if self.changeFilter.HasChanged("Voltage Control Side 1:voltage", Data.voltageControl1Data.voltage):
+            self.voltageNotebook.elementDict["Voltage Control Side 1:voltage"].SetText(str(Data.voltageControl1Data.voltage))
+        
+        if self.changeFilter.HasChanged("Voltage Control Side 2:voltage", Data.voltageControl2Data.voltage):
+            self.voltageNotebook.elementDict["Voltage Control Side 2:voltage"].SetText(str(Data.voltageControl2Data.voltage))
         
         # update power control
-        self.powerNotebook.elementDict["Power:power"].SetText(str(Data.powerControlData.power))
+        if self.changeFilter.HasChanged("Power:power", Data.powerControlData.power):
+            self.powerNotebook.elementDict["Power:power"].SetText(str(Data.powerControlData.power))
         
-        # update status, warnings and errors
+        # update status, warnings and errors, the boxes are only filled again
+        # if a bit changed
         try:
             status = Data.statusDataSet.state
-            textbox = self.statusNotebook.elementDict["Status:status"]
-            textbox.delete(1.0, tk.END)
-            for i in range(16):
-                if status & (1 << i):
-                    # add text to box
-                    textbox.insert(tk.END, ConverterStatusNames.names[i])
+            if self.changeFilter.HasChanged("Status:status", status):
+                textbox = self.statusNotebook.elementDict["Status:status"]
+                textbox.delete(1.0, tk.END)
+                for i in range(16):
+                    if status & (1 << i):
+                        # add text to box
+                        textbox.insert(tk.END, ConverterStatusNames.names[i])
             
             warnings = Data.statusDataSet.warnings
-            textbox = self.warningsNotebook.elementDict["Warnings:warnings"]
-            textbox.delete(1.0, tk.END)
-            for i in range(16):
-                if warnings & (1 << i):
-                    # add text to box
-                    textbox.insert(tk.END, ConverterWarningMessages.Messages[i])
+            if self.changeFilter.HasChanged("Warnings:warnings", warnings):
+                textbox = self.warningsNotebook.elementDict["Warnings:warnings"]
+                textbox.delete(1.0, tk.END)
+                for i in range(16):
+                    if warnings & (1 << i):
+                        # add text to box
+                        textbox.insert(tk.END, ConverterWarningMessages.Messages[i])
             
             errors = Data.statusDataSet.errors
-            textbox = self.errorsNotebook.elementDict["Errors:errors"]
-            textbox.delete(1.0, tk.END)
-            for i in range(16):
-                if errors & (1 << i):
-                    # add text to box
-                    textbox.insert(tk.END, ConverterErrorMessages.Messages[i])
+            if self.changeFilter.HasChanged("Errors:errors", errors):
+                textbox = self.errorsNotebook.elementDict["Errors:errors"]
+                textbox.delete(1.0, tk.END)
+                for i in range(16):
+                    if errors & (1 << i):
+                        # add text to box
+                        textbox.insert(tk.END, ConverterErrorMessages.Messages[i])
             
         except Exception as e:
             print (e)
@@ -350,8 +366,9 @@ class ConverterControlWindow(tk.Toplevel):
         mode = dropDown.get()
         print ("Drop down mode is " + str(mode))
         if mode == "Voltage Control":
-            if self._UpdateVoltageControlParameters(side):
-                self.converterDevice.SendPrechargeCommand(side, mode="voltage")
+            voltage = self._GetVoltageControlSetpoint(side)
+            if voltage is not None:
+                self.converterDevice.SendPrechargeCommand(side, mode="voltage", voltage=voltage)
         
         elif mode == "Droop Control":
             if self._UpdateDroopControlParameters(side):
@@ -361,8 +378,9 @@ class ConverterControlWindow(tk.Toplevel):
     def _OnVoltageControl(self, side):
         print ("Voltage control side " + str(side))
         
-        if self._UpdateVoltageControlParameters(side):
-            self.converterDevice.SendVoltageControlCommand(side)
+        voltage = self._GetVoltageControlSetpoint(side)
+        if voltage is not None:
+            self.converterDevice.SendVoltageControlCommand(side, voltage=voltage)
         
         if side == 1:
             self.voltageNotebook.elementDict["Voltage Control Side 1:voltage"].ResetChanged()
@@ -390,9 +408,8 @@ class ConverterControlWindow(tk.Toplevel):
             print (e)
             return
         
-        # set power
-        if self.converterDevice.SendPowerControlParameter(pValue):
-            self.converterDevice.SendPowerControlCommand()
+        # set power and change the mode
+        self.converterDevice.SendPowerControlCommand(pValue)
         
         return
     
@@ -403,31 +420,30 @@ class ConverterControlWindow(tk.Toplevel):
         
         return
     
-    def _UpdateVoltageControlParameters(self, side):
+    def _GetVoltageControlSetpoint(self, side):
         voltageEntry = None
         if side == 1:
-            # get voltage and update parameters for converter
+            # get voltage entry of the side
             voltageEntry = self.voltageNotebook.GetElement("Voltage Control Side 1:voltage")
         
         elif side == 2:
-            # get voltage and update parameters for converter
+            # get voltage entry of the side
             voltageEntry = self.voltageNotebook.GetElement("Voltage Control Side 2:voltage")
         
         else:
             print ("Cannot get a voltage entry to update parameters from")
-            return False
+            return None
         
         try:
             voltage = int(voltageEntry.get())
             if voltage < 0:
                 print ("Broken voltage in voltage setpoint")
-                return False
+                return None
         except Exception as e:
             print (e)
-            return False
+            return None
         
-        print ("Send voltage control parameters")
-        return self.converterDevice.SendVoltageControlParameters(side, voltage)
+        return voltage
     
     # function to append a line
     def _AppendLineElement(self, key, config):
@@ -449,7 +465,7 @@ class ConverterControlWindow(tk.Toplevel):
     
     def _AppendTextElement(self, key, config):
         # create a new text
-        text = CanvasText(self.canvas, 400, 400, config, 0, scopeManager = self.scopeManager, name = self.converterDevice.deviceName + "-" + key)
+        text = CanvasText(self.canvas, 400, 400, config, 0, scopeManager = self.scopeManager, scopeDevice = self.converterDevice)
         
         self.graphicalElements[key] = text
         
@@ -9,6 +9,20 @@ from network.packets.converterrespond import *
 from network.payloads.converterrespond import *
 
 class ConverterDevice(GridDevice):
+    scopeFields = {
+        "Voltage P1"         : "voltageMeasurement.voltageP1",
+        "Voltage M1"         : "voltageMeasurement.voltageM1",
+        "Voltage P2"         : "voltageMeasurement.voltageP2",
+        "Voltage M2"         : "voltageMeasurement.voltageM2",
+        "Current P1"         : "currentMeasurement.currentP1",
+        "Current M1"         : "currentMeasurement.currentM1",
+        "Current P2"         : "currentMeasurement.currentP2",
+        "Current M2"         : "currentMeasurement.currentM2",
+        "Mode"               : "statusDataSet.mode",
+        "Voltage Setpoint 1" : "voltageControl1Data.voltage",
+        "Voltage Setpoint 2" : "voltageControl2Data.voltage",
+        "Power Setpoint"     : "powerControlData.power"}
+    
     def __init__(self, editor, editorPage, networkInterface, scopeManager):
         # init parent
         super().__init__(editor, editorPage, networkInterface, scopeManager)
@@ -35,19 +49,8 @@ class ConverterDevice(GridDevice):
     def HandleNewPacket(self, packet):
         # new packet for converter
         if isinstance(packet, ConverterLiveDataPacket):
-            # extract data
-            # adjust name tag
-            if packet.payload.status & ConverterStatusBits.ONLINE:
-                self.graphicalElementHandler.graphicalElementsDict["Name"].SetText(self.deviceName)
-            else:
-                self.graphicalElementHandler.graphicalElementsDict["Name"].SetText(self.deviceName + " (offline)")
-            
-            # forward the packet to the control window
-            if self.converterControlWindow:
-                try:
-                    self.converterControlWindow.Update(packet.payload)
-                except:
-                    pass
+            # the screen only shows the latest frame
+            self.PostLiveData(packet.payload.liveDataBytes, packet.payload)
             
         else:
             # notify packet distributor
@@ -56,55 +59,54 @@ class ConverterDevice(GridDevice):
         
         return
     
-    def SendLiveDataCommand(self, onOff):
+    def _ShowLiveData(self, payload):
+        # adjust name tag
+        if payload.status & ConverterStatusBits.ONLINE:
+            self.graphicalElementHandler.graphicalElementsDict["Name"].SetText(self.deviceName)
+        else:
+            self.graphicalElementHandler.graphicalElementsDict["Name"].SetText(self.deviceName + " (offline)")
+        
+        # forward the data to the control window
+        if self.converterControlWindow:
+            try:
+                self.converterControlWindow.Update(payload)
+            except:
+                pass
+        
+        return
+    
+    # all send functions return at once, the optional callback is called on the
+    # Tk loop with the respond or None when the command failed
+    def SendLiveDataCommand(self, onOff, callback = None):
+        # remember the subscription for a reconnect
+        self.liveDataOn = onOff
+        
         # create packets
         if onOff:
-            id, packet = ConverterLiveDataOnPacket.FromConfig(self.deviceID)
+            id, packet = self.GetLiveDataOnCommand()
         else:
             id, packet = ConverterLiveDataOffPacket.FromConfig(self.deviceID)
         
         # send
-        result = self._SendData(id, packet)
-        if not result:
-            print ("Cannot turn on/off live data for converter")
-            return False
-        
-        return True
+        return self._SendCommands([(id, packet)], callback, "Cannot turn on/off live data for converter")
     
-    def SendOffCommand(self):
-        # send an off command
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, ConverterModes.MODE_OFF)
-        
-        # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+    def GetLiveDataOnCommand(self):
+        return ConverterLiveDataOnPacket.FromConfig(self.deviceID)
     
-    def SendIdleCommand(self):
+    def SendOffCommand(self, callback = None):
         # send an off command
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, ConverterModes.MODE_IDLE)
-        
-        # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendCommands([self._CreateModePacket(ConverterModes.MODE_OFF)], callback,
+            priority=SendPriority.SAFETY)
     
-    def SendResetCommand(self):
-        # send an off command
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, ConverterModes.MODE_RESET)
-        
-        # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+    def SendIdleCommand(self, callback = None):
+        # send an idle command
+        return self._SendCommands([self._CreateModePacket(ConverterModes.MODE_IDLE)], callback)
     
-    def SendPrechargeCommand(self, side, mode):
+    def SendResetCommand(self, callback = None):
+        # send a reset command
+        return self._SendCommands([self._CreateModePacket(ConverterModes.MODE_RESET)], callback)
+    
+    def SendPrechargeCommand(self, side, mode, voltage = None, callback = None):
         # update the mode config field
         converterMode = 0
         opMode = 0
@@ -122,31 +124,24 @@ class ConverterDevice(GridDevice):
             else:
                 converterMode = ConverterModes.MODE_DROOP_CONTROL_2
         
-        data = [converterMode, 0,0,0]
+        commands = []
         
-        # create update data packet
-        print ("Sending precharge setpoints")
-        id, updatePacket = ConverterUpdateDataPacket.FromConfig(self.deviceID, opMode, data)
+        # voltage control setpoints for the mode following the precharge
+        if voltage is not None:
+            commands.append(self._CreateVoltageControlParameters(side, voltage))
         
-        # send packet
-        result = self._SendData(id, updatePacket)
-        if not result:
-            print ("Problem with updating the precharge setpoints")
-            return False
+        # create update data packet with the precharge setpoints
+        data = [converterMode, 0,0,0]
+        commands.append(ConverterUpdateDataPacket.FromConfig(self.deviceID, opMode, data))
         
         # change the mode
-        print ("Sending precharge command")
-        id, modePacket = ConverterSetModePacket.FromConfig(self.deviceID, opMode)
+        commands.append(self._CreateModePacket(opMode))
         
-        # send packet
-        result = self._SendData(id, modePacket)
-        if not result:
-            print ("Problem sending precharge command")
-            return False
-        
-        return True
+        # send all packets one after another
+        print ("Sending precharge command")
+        return self._SendCommands(commands, callback, "Problem sending precharge command")
     
-    def SendVoltageControlCommand(self, side):
+    def SendVoltageControlCommand(self, side, voltage = None, callback = None):
         # determine op mode
         opMode = 0
         if side == 1:
@@ -154,17 +149,17 @@ class ConverterDevice(GridDevice):
         else:
             opMode = ConverterModes.MODE_VOLTAGE_CONTROL_2
         
-        # create packet
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, opMode)
+        # update the setpoints first if a voltage is given
+        commands = []
+        if voltage is not None:
+            commands.append(self._CreateVoltageControlParameters(side, voltage))
         
-        # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
+        commands.append(self._CreateModePacket(opMode))
         
-        return True
+        # send packets
+        return self._SendCommands(commands, callback)
     
-    def SendDroopControlCommand(self, side):
+    def SendDroopControlCommand(self, side, callback = None):
         # determine op mode
         opMode = 0
         if side == 1:
@@ -172,28 +167,21 @@ class ConverterDevice(GridDevice):
         else:
             opMode = ConverterModes.MODE_DROOP_CONTROL_2
         
-        # create packet
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, opMode)
-        
         # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendCommands([self._CreateModePacket(opMode)], callback)
     
-    def SendPowerControlCommand(self):
-        # create packet
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, ConverterModes.MODE_POWER_CONTROL)
+    def SendPowerControlCommand(self, value = None, callback = None):
+        # update the setpoint first if a value is given
+        commands = []
+        if value is not None:
+            commands.append(self._CreatePowerControlParameter(value))
         
-        # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
+        commands.append(self._CreateModePacket(ConverterModes.MODE_POWER_CONTROL))
         
-        return True
+        # send packets
+        return self._SendCommands(commands, callback)
     
-    def SendDischargeCommand(self, side):
+    def SendDischargeCommand(self, side, callback = None):
         # determine op mode
         opMode = 0
         if side == 1:
@@ -201,46 +189,14 @@ class ConverterDevice(GridDevice):
         else:
             opMode = ConverterModes.MODE_DISCHARGE_2
         
-        # create packet
-        id, packet = ConverterSetModePacket.FromConfig(self.deviceID, opMode)
-        
         # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendCommands([self._CreateModePacket(opMode)], callback)
     
-    def SendVoltageControlParameters(self, side, voltage):
-        # determine parameter set
-        pSet = 0
-        if side == 1:
-            pSet = ConverterModes.MODE_VOLTAGE_CONTROL_1
-        else:
-            pSet = ConverterModes.MODE_VOLTAGE_CONTROL_2
-        
-        # setup data
-        if voltage < 0:
-            voltage = 0
-        
-        if voltage > 6000:
-            voltage = 6000
-        
-        data = [voltage, 0,0,0]
-        
-        # create update packet
-        id, packet = ConverterUpdateDataPacket.FromConfig(self.deviceID, pSet, data)
-        
+    def SendVoltageControlParameters(self, side, voltage, callback = None):
         # send packet
-        print ("Voltage control setpoint ID is " + str(id))
-        result = self._SendData(id, packet)
-        if not result:
-            print ("Broken voltage control setpoints")
-            return False
-        
-        return True
+        return self._SendCommands([self._CreateVoltageControlParameters(side, voltage)], callback, "Broken voltage control setpoints")
     
-    def SendDroopControlParameters(self, side, p1, p2, p3, p4):
+    def SendDroopControlParameters(self, side, p1, p2, p3, p4, callback = None):
         # determine parameter set
         pSet = 0
         if side == 1:
@@ -255,24 +211,11 @@ class ConverterDevice(GridDevice):
         id, packet = ConverterUpdateDataPacket.FromConfig(self.deviceID, pSet, data)
         
         # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendCommands([(id, packet)], callback)
     
-    def SendPowerControlParameter(self, value):
-        # setup data
-        data = [value, 0,0,0]
-        
-        id, packet = ConverterUpdateDataPacket.FromConfig(self.deviceID, ConverterModes.MODE_POWER_CONTROL, data)
-        
+    def SendPowerControlParameter(self, value, callback = None):
         # send packet
-        result = self._SendData(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendCommands([self._CreatePowerControlParameter(value)], callback)
     
     def CreateNewConverter(self, posX, posY):
         # create a new converter from a generic config file
@@ -280,6 +223,8 @@ class ConverterDevice(GridDevice):
         
         self.deviceType = DeviceType.CONVERTER
         
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        
         return
     
     def CreateNewConverterFromFile(self, config, gridFile):
@@ -295,6 +240,8 @@ class ConverterDevice(GridDevice):
         self.deviceID = config["deviceID"]
         self.deviceConfig = config["deviceConfig"]
         
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        
         # get connection types
         self.port1Type = self.graphicalElementHandler.connectionList[0].type
         self.port2Type = self.graphicalElementHandler.connectionList[1].type
@@ -423,6 +370,7 @@ class ConverterDevice(GridDevice):
             if not self.converterControlWindow:
                 config = {"name" : self.deviceName, "ip" : self.deviceIP, "port" : self.devicePort}
                 self.converterControlWindow = ConverterControlWindow(self.editor.window, self, config, self.scopeManager)
+                self.ShowLastLiveData()
             else:
                 self.converterControlWindow.lift()
         
@@ -458,11 +406,32 @@ class ConverterDevice(GridDevice):
         
         return
     
-    def _SendData(self, id, packet):
-        # notify packet distributor and send packet
-        self.packetDistributor.RegisterTransfer(id)
+    def _CreateModePacket(self, opMode):
+        # create a set mode packet
+        return ConverterSetModePacket.FromConfig(self.deviceID, opMode)
+    
+    def _CreateVoltageControlParameters(self, side, voltage):
+        # determine parameter set
+        pSet = 0
+        if side == 1:
+            pSet = ConverterModes.MODE_VOLTAGE_CONTROL_1
+        else:
+            pSet = ConverterModes.MODE_VOLTAGE_CONTROL_2
+        
+        # setup data
+        if voltage < 0:
+            voltage = 0
+        
+        if voltage > 6000:
+            voltage = 6000
+        
+        data = [voltage, 0,0,0]
         
-        self.networkInterface.SendData(packet.GetBytes())
+        # create update packet
+        return ConverterUpdateDataPacket.FromConfig(self.deviceID, pSet, data)
+    
+    def _CreatePowerControlParameter(self, value):
+        # setup data
+        data = [value, 0,0,0]
         
-        # wait for return
-        return self.packetDistributor.WaitForTransferComplete(id)
\ No newline at end of file
+        return ConverterUpdateDataPacket.FromConfig(self.deviceID, ConverterModes.MODE_POWER_CONTROL, data)
\ No newline at end of file
@@ -0,0 +1,54 @@
+import threading
+
+# table for finding the devices addressed by a packet with one lookup
+class DeviceRoutingTable:
+    def __init__(self):
+        # (deviceType, deviceId) -> tuple of devices, entries are replaced as a
+        # whole, so the receive thread can look up devices without the lock
+        self.routes = dict()
+        
+        # device -> (deviceType, deviceId) it is registered with
+        self.deviceKeys = dict()
+        
+        self.lock = threading.Lock()
+    
+    def Register(self, deviceType, deviceId, device):
+        # (re)register a device with its type and id
+        key = (deviceType, deviceId)
+        
+        with self.lock:
+            oldKey = self.deviceKeys.get(device, None)
+            if oldKey == key:
+                return
+            
+            if oldKey is not None:
+                self._RemoveRoute(oldKey, device)
+            
+            self.routes[key] = self.routes.get(key, ()) + (device,)
+            self.deviceKeys[device] = key
+        
+        return
+    
+    def Remove(self, device):
+        # remove a device from the table
+        with self.lock:
+            key = self.deviceKeys.pop(device, None)
+            if key is not None:
+                self._RemoveRoute(key, device)
+        
+        return
+    
+    def GetDevices(self, deviceType, deviceId):
+        # get all devices registered with type and id
+        return self.routes.get((deviceType, deviceId), ())
+    
+    def _RemoveRoute(self, key, device):
+        # remove a device from the entry of a key
+        devices = tuple(d for d in self.routes.get(key, ()) if d is not device)
+        
+        if devices:
+            self.routes[key] = devices
+        else:
+            self.routes.pop(key, None)
+        
+        return
\ No newline at end of file
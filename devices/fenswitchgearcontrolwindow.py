@@ -7,6 +7,7 @@ from graphical.canvastextclass import *
 from graphical.canvascontrolswitch import *
 
 from generic.genericconfignotebook import *
+from generic.changefilter import *
 
 # this creates a subwindow for controlling a switchgear
 class SwitchgearControlWindow(tk.Toplevel):
@@ -16,6 +17,9 @@ class SwitchgearControlWindow(tk.Toplevel):
         self.switchgearDevice = switchgearDevice
         self.config = config
         self.wm_protocol('WM_DELETE_WINDOW', self.OnSubwindowDestroyCallback)
+        
+        # widgets are only changed if their value changed
+        self.changeFilter = ChangeFilter(widgetStatistics)
         self.title(self.switchgearDevice.deviceName)
         
         self.canvas = tk.Canvas(self, width=800, height=800)
@@ -47,23 +51,21 @@ class SwitchgearControlWindow(tk.Toplevel):
         self.graphicalElements["Switch_3_Current"].SetText(str(c3) + " A")
         self.graphicalElements["Switch_4_Current"].SetText(str(c4) + " A")
         
-        if online:
-            t = self.notebook.GetElement("General:status")
-            if t:
-                t["text"] = "online"
-        else:
+        if self.changeFilter.HasChanged("General:status", online):
             t = self.notebook.GetElement("General:status")
             if t:
-                t["text"] = "offline"
-        
-        for i in range(5):
-            # get switch
-            tag = "Switch_" + str(i + 1)
-            sw = self.graphicalElements[tag]
-            if closedSwitches & (0x1 << i):
-                sw.Close(True)
-            else:
-                sw.Close(False)
+                t["text"] = "online" if online else "offline"
+        
+        # the switches are only redrawn if one of them moved
+        if self.changeFilter.HasChanged("closedSwitches", closedSwitches):
+            for i in range(5):
+                # get switch
+                tag = "Switch_" + str(i + 1)
+                sw = self.graphicalElements[tag]
+                if closedSwitches & (0x1 << i):
+                    sw.Close(True)
+                else:
+                    sw.Close(False)
         
         return
     
@@ -167,7 +169,7 @@ class SwitchgearControlWindow(tk.Toplevel):
     
     def _AppendTextElement(self, key, config):
         # create a new text
-        text = CanvasText(self.canvas, 400, 400, config, 0)
+        text = CanvasText(self.canvas, 400, 400, config, 0, scopeManager = self.switchgearDevice.scopeManager, scopeDevice = self.switchgearDevice)
         
         self.graphicalElements[key] = text
         
@@ -7,6 +7,16 @@ from network.packets.fenswitchgearrespond import *
 from network.payloads.fenswitchgearrespond import *
 
 class FENSwitchgearDevice(GridDevice):
+    # the currents are sent with an offset of 1250
+    scopeFields = {
+        "Voltage P"       : "voltageP",
+        "Voltage M"       : "voltageM",
+        "Current 1"       : lambda payload: payload.current1 - 1250,
+        "Current 2"       : lambda payload: payload.current2 - 1250,
+        "Current 3"       : lambda payload: payload.current3 - 1250,
+        "Current 4"       : lambda payload: payload.current4 - 1250,
+        "Closed Switches" : "closedSwitches"}
+    
     def __init__(self, editor, editorPage, networkInterface, scopeManager):
         # call grid device init
         super().__init__(editor, editorPage, networkInterface, scopeManager)
@@ -34,7 +44,7 @@ class FENSwitchgearDevice(GridDevice):
         self.deviceType = DeviceType.FENSWITCHGEAR
         #self.deviceID = self.editor.GetNewDeviceID()
         
-        #self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
         
         return
     
@@ -51,7 +61,7 @@ class FENSwitchgearDevice(GridDevice):
         self.deviceType = DeviceType.FENSWITCHGEAR
         self.deviceID = config["deviceID"]
         
-        #self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
         
         return
     
@@ -127,11 +137,9 @@ class FENSwitchgearDevice(GridDevice):
             if packet.payload.deviceStatus & FENSwitchgearStatus.ONLINE:
                 online = True
             
-            if self.fenSwitchgearControlWindow:
-                try:
-                    self.fenSwitchgearControlWindow.UpdateData((up,um, c1,c2,c3,c4), online, closedSwitches)
-                except:
-                    pass
+            # the screen only shows the latest frame
+            data = (up,um, c1,c2,c3,c4)
+            self.PostLiveData((data, online, closedSwitches), data, online, closedSwitches)
         else:
             # notify packet distributor
             id = packet.header.commandId
@@ -139,6 +147,15 @@ class FENSwitchgearDevice(GridDevice):
         
         return
     
+    def _ShowLiveData(self, data, online, closedSwitches):
+        if self.fenSwitchgearControlWindow:
+            try:
+                self.fenSwitchgearControlWindow.UpdateData(data, online, closedSwitches)
+            except:
+                pass
+        
+        return
+    
     # function for creating a dictionary of the device configuration
     def GenerateSaveToFileData(self, gridFile):
         # create empty dictionary
@@ -177,8 +194,9 @@ class FENSwitchgearDevice(GridDevice):
         
         return deviceConfig
     
-    # function for setting a switch
-    def SendSwitchCommand(self, switch, closed):
+    # function for setting a switch, returns at once and calls the optional
+    # callback on the Tk loop with the respond or None
+    def SendSwitchCommand(self, switch, closed, callback = None):
         switchMask = 0x1 << (switch - 1)
         if closed:
             # create a close switch packet
@@ -188,35 +206,25 @@ class FENSwitchgearDevice(GridDevice):
             id, packet = FENSwitchgearResetSwitchPacket.FromConfig(self.deviceID, switchMask)
             print ("Opening switch " + str(switch))
         
-        result = self._SendData(id, packet)
-        
-        if not result:
-            print ("Timeout")
-        
-        return
+        return self._SendCommands([(id, packet)], callback, priority=SendPriority.SAFETY)
     
-    def SendLiveDataCommand(self, onOff):
+    def SendLiveDataCommand(self, onOff, callback = None):
+        # remember the subscription for a reconnect
+        self.liveDataOn = onOff
+        
         if onOff:
             # turn on live data
-            id, packet = FENSwitchgearLiveDataOnPacket.FromConfig(self.deviceID)
-            
-            result = self._SendData(id, packet)
-            
-            if not result:
-                print ("Timeout")
-            
-            print ("Live data turned on")
+            id, packet = self.GetLiveDataOnCommand()
+            print ("Turning on live data")
         else:
-            # turn on live data
+            # turn off live data
             id, packet = FENSwitchgearLiveDataOffPacket.FromConfig(self.deviceID)
-            
-            result = self._SendData(id, packet)
-            
-            if not result:
-                print ("Timeout")
-            
-            print ("Live data turned off")
-        return
+            print ("Turning off live data")
+        
+        return self._SendCommands([(id, packet)], callback)
+    
+    def GetLiveDataOnCommand(self):
+        return FENSwitchgearLiveDataOnPacket.FromConfig(self.deviceID)
     
     # function to show either configuration window or control window
     def ShowControlConfigWindow(self, mode):
@@ -238,6 +246,7 @@ class FENSwitchgearDevice(GridDevice):
             if not self.fenSwitchgearControlWindow:
                 config = {"name" : self.deviceName, "ip" : self.deviceIP, "port" : self.devicePort}
                 self.fenSwitchgearControlWindow = SwitchgearControlWindow(self.editor.window, self, config)
+                self.ShowLastLiveData()
             else:
                 self.fenSwitchgearControlWindow.lift()
         
@@ -250,13 +259,4 @@ class FENSwitchgearDevice(GridDevice):
         self.deviceIP = config["Network IP"]
         self.devicePort = config["Network Port"]
         
-        return
-    
-    def _SendData(self, id, packet):
-        # notify packet distributor and send packet
-        self.packetDistributor.RegisterTransfer(id)
-        
-        self.networkInterface.SendData(packet.GetBytes())
-        
-        # wait for return
-        return self.packetDistributor.WaitForTransferComplete(id)
\ No newline at end of file
+        return
\ No newline at end of file
@@ -4,11 +4,17 @@ from graphical.graphicalelementhandlerclass import *
 
 from network.headers.header import DeviceType
 from network.packetdistributor import *
+from network.commandsequence import CommandSequence
+from network.sendscheduler import SendPriority
 
 import json
 
 # base class for every grid device
 class GridDevice:
+    # live data fields, which can be shown in a scope, by name. A field is the
+    # attribute path in the live data payload or a function of the payload.
+    scopeFields = {}
+    
     def __init__(self, editor, editorPage, networkInterface, scopeManager):
         # every device has a graphical representation
         self.editor = editor
@@ -26,10 +32,19 @@ class GridDevice:
         
         self.deviceType = DeviceType.NONE
         self.deviceID = -1
+        
+        # live data is restored after the server connection was lost
+        self.liveDataOn = False
+        
+        # arguments of the last shown live data, a new control window starts
+        # with them
+        self.lastLiveData = None
     
     # function to delete a grid device
     def Delete(self):
-        # this is type specific
+        # the rest is type specific
+        self.editor.liveDataFilter.Forget(self)
+        self.scopeManager.RemoveDevice(self)
         return
     
     # function to create a blank device from a type definition file
@@ -84,6 +99,28 @@ class GridDevice:
         # this is type specific
         return
     
+    # function to show live data with the next frame on the Tk loop. Frames
+    # with the same value as the last one don't change anything on the screen
+    # and are skipped.
+    def PostLiveData(self, value, *args):
+        self.lastLiveData = args
+        
+        if self.editor.liveDataFilter.HasChanged(self, value):
+            self.editor.uiUpdateDispatcher.Post(self, self._ShowLiveData, *args)
+        
+        return
+    
+    # function to show the last live data, e.g. in a new control window
+    def ShowLastLiveData(self):
+        if self.lastLiveData is not None:
+            self._ShowLiveData(*self.lastLiveData)
+        
+        return
+    
+    def _ShowLiveData(self, *args):
+        # this is type specific
+        return
+    
     # function to save the device into a grid
     def GenerateSaveToFileData(self):
         # this is type specific
@@ -92,4 +129,54 @@ class GridDevice:
     # function to show the configuration window of the device
     def ShowControlConfigWindow(self):
         # this is type specific
+        return
+    
+    # function to create the (id, packet) command turning on live data
+    def GetLiveDataOnCommand(self):
+        # this is type specific, None if the device has no live data
+        return None
+    
+    # function to register the live data command of a subscribed device after
+    # a reconnect, the editor sends the bytes of all devices at once
+    def CreateLiveDataRestore(self):
+        if not self.liveDataOn:
+            return None
+        
+        command = self.GetLiveDataOnCommand()
+        if command is None:
+            return None
+        
+        id, packet = command
+        handle = self.packetDistributor.RegisterTransfer(id)
+        handle.add_done_callback(lambda h: self.editor.tkBridge.Post(self._OnLiveDataRestored, h))
+        
+        return packet.GetBytes()
+    
+    def _OnLiveDataRestored(self, handle):
+        # report devices, which did not respond
+        if handle.cancelled() or handle.exception() is not None:
+            print (self.deviceName + ": Cannot restore live data")
+        return
+    
+    # function to send a list of (id, packet) commands without waiting, the
+    # callback is called on the Tk loop with the respond of the last command
+    # or None if a command failed. Safety commands pass all other frames.
+    def _SendCommands(self, commands, callback = None, errorMessage = "Timeout", priority = SendPriority.CONTROL):
+        future = CommandSequence(self.packetDistributor, self.networkInterface, commands, priority).Start()
+        future.add_done_callback(lambda f: self.editor.tkBridge.Post(self._OnCommandsDone, f, callback, errorMessage))
+        
+        return future
+    
+    def _OnCommandsDone(self, future, callback, errorMessage):
+        # get the respond of the last command, cancelled commands are no error
+        respond = None
+        if not future.cancelled():
+            respond = future.result()
+            
+            if not respond:
+                print (self.deviceName + ": " + errorMessage)
+        
+        if callback:
+            callback(respond)
+        
         return
\ No newline at end of file
@@ -7,6 +7,7 @@ from graphical.canvastextclass import *
 from graphical.canvascontrolswitch import *
 
 from generic.genericconfignotebook import *
+from generic.changefilter import *
 
 # this creates a subwindow for controlling a breaker
 class SciBreakBreakerControlWindow(tk.Toplevel):
@@ -16,6 +17,9 @@ class SciBreakBreakerControlWindow(tk.Toplevel):
         self.breakerDevice = breakerDevice
         self.config = config
         self.wm_protocol('WM_DELETE_WINDOW', self.OnSubwindowDestroyCallback)
+        
+        # widgets are only changed if their value changed
+        self.changeFilter = ChangeFilter(widgetStatistics)
         self.title(self.breakerDevice.deviceName)
         
         self.canvas = tk.Canvas(self, width=800, height=800)
@@ -48,31 +52,24 @@ class SciBreakBreakerControlWindow(tk.Toplevel):
             self.graphicalElements["currentBot"].SetText("---" + " A")
         
         # online or not
-        if online:
-            t = self.notebook.GetElement("General:status")
-            if t:
-                t["text"] = "online"
-        else:
+        if self.changeFilter.HasChanged("General:status", online):
             t = self.notebook.GetElement("General:status")
             if t:
-                t["text"] = "offline"
+                t["text"] = "online" if online else "offline"
         
         # setpoints of breakers
-        self.tripLevelNotebook.GetElement("Trip Level:setpoint_top")["text"] = str(data.tripLevelTop)
-        self.tripLevelNotebook.GetElement("Trip Level:setpoint_bot")["text"] = str(data.tripLevelBot)
+        if self.changeFilter.HasChanged("Trip Level:setpoint_top", data.tripLevelTop):
+            self.tripLevelNotebook.GetElement("Trip Level:setpoint_top")["text"] = str(data.tripLevelTop)
+        
+        if self.changeFilter.HasChanged("Trip Level:setpoint_bot", data.tripLevelBot):
+            self.tripLevelNotebook.GetElement("Trip Level:setpoint_bot")["text"] = str(data.tripLevelBot)
         
         # switch representation
-        sw = self.graphicalElements["switchTop"]
-        if closed[0]:
-            sw.Close(True)
-        else:
-            sw.Close(False)
+        if self.changeFilter.HasChanged("switchTop", closed[0]):
+            self.graphicalElements["switchTop"].Close(closed[0])
         
-        sw = self.graphicalElements["switchBot"]
-        if closed[1]:
-            sw.Close(True)
-        else:
-            sw.Close(False)
+        if self.changeFilter.HasChanged("switchBot", closed[1]):
+            self.graphicalElements["switchBot"].Close(closed[1])
         
         # rest of status bits
         status = data.status
@@ -226,7 +223,7 @@ class SciBreakBreakerControlWindow(tk.Toplevel):
     
     def _AppendTextElement(self, key, config):
         # create a new text
-        text = CanvasText(self.canvas, 400, 400, config, 0)
+        text = CanvasText(self.canvas, 400, 400, config, 0, scopeManager = self.breakerDevice.scopeManager, scopeDevice = self.breakerDevice)
         
         self.graphicalElements[key] = text
         
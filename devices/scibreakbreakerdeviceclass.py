@@ -7,6 +7,14 @@ from network.packets.scibreakbreakerrespond import *
 from network.payloads.scibreakbreakerrespond import *
 
 class SciBreakBreakerDevice(GridDevice):
+    scopeFields = {
+        "Voltage Top"       : "voltageTop",
+        "Voltage Bottom"    : "voltageBot",
+        "Current Top"       : "currentTop",
+        "Current Bottom"    : "currentBot",
+        "Trip Level Top"    : "tripLevelTop",
+        "Trip Level Bottom" : "tripLevelBot"}
+    
     def __init__(self, editor, editorPage, networkInterface, scopeManager):
         # call grid device init
         super().__init__(editor, editorPage, networkInterface, scopeManager)
@@ -34,7 +42,7 @@ class SciBreakBreakerDevice(GridDevice):
         self.deviceType = DeviceType.SCIBREAKBREAKER
         #self.deviceID = self.editor.GetNewDeviceID()
         
-        #self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
         
         return
     
@@ -51,7 +59,7 @@ class SciBreakBreakerDevice(GridDevice):
         self.deviceType = DeviceType.SCIBREAKBREAKER
         self.deviceID = config["deviceID"]
         
-        #self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
         
         return
     
@@ -127,9 +135,8 @@ class SciBreakBreakerDevice(GridDevice):
             else:
                 self.closedBot = True
             
-            # update data in control window if needed
-            if self.sciBreakBreakerControlWindow:
-                self.sciBreakBreakerControlWindow.UpdateData(packet.payload, self.online, [self.closedTop, self.closedBot])
+            # the control window only shows the latest frame
+            self.PostLiveData(packet.payload, packet.payload, self.online, [self.closedTop, self.closedBot])
         else:
             # notify packet distributor
             id = packet.header.commandId
@@ -137,6 +144,12 @@ class SciBreakBreakerDevice(GridDevice):
         
         return
     
+    def _ShowLiveData(self, data, online, closed):
+        if self.sciBreakBreakerControlWindow:
+            self.sciBreakBreakerControlWindow.UpdateData(data, online, closed)
+        
+        return
+    
     # function for creating a dictionary of the device configuration
     def GenerateSaveToFileData(self, gridFile):
         # create empty dictionary
@@ -175,32 +188,28 @@ class SciBreakBreakerDevice(GridDevice):
         
         return deviceConfig
     
-    # live data command
-    def SendLiveDataCommand(self, onOff):
+    # all send functions return at once, the optional callback is called on the
+    # Tk loop with the respond or None when the command failed
+    def SendLiveDataCommand(self, onOff, callback = None):
+        # remember the subscription for a reconnect
+        self.liveDataOn = onOff
+        
         if onOff:
             # turn on live data
-            id, packet = SciBreakBreakerLiveDataOnPacket.FromConfig(self.deviceID)
-            
-            result = self._SendData(id, packet)
-            
-            if not result:
-                print ("Timeout")
-            
-            print ("Live data turned on")
+            id, packet = self.GetLiveDataOnCommand()
+            print ("Turning on live data")
         else:
-            # turn on live data
+            # turn off live data
             id, packet = SciBreakBreakerLiveDataOffPacket.FromConfig(self.deviceID)
-            
-            result = self._SendData(id, packet)
-            
-            if not result:
-                print ("Timeout")
-            
-            print ("Live data turned off")
-        return
+            print ("Turning off live data")
+        
+        return self._SendCommands([(id, packet)], callback)
+    
+    def GetLiveDataOnCommand(self):
+        return SciBreakBreakerLiveDataOnPacket.FromConfig(self.deviceID)
     
     # function for closing the breaker
-    def SendSwitchCommand(self, closed):
+    def SendSwitchCommand(self, closed, callback = None):
         # send command here
         if closed:
             # send close command
@@ -209,37 +218,22 @@ class SciBreakBreakerDevice(GridDevice):
             # send open command
             id, packet = SciBreakBreakerOpenPacket.FromConfig(self.deviceID)
         
-        result = self._SendData(id, packet)
-        
-        if not result:
-            print ("Timeout")
-        
-        return
+        return self._SendCommands([(id, packet)], callback, priority=SendPriority.SAFETY)
     
-    def SendTurnOnCommand(self, on):
+    def SendTurnOnCommand(self, on, callback = None):
         # send command here
         if on:
             id, packet = SciBreakBreakerTurnOnPacket.FromConfig(self.deviceID)
         else:
             id, packet = SciBreakBreakerTurnOffPacket.FromConfig(self.deviceID)
         
-        result = self._SendData(id, packet)
-        
-        if not result:
-            print ("Timeout")
-        
-        return
+        return self._SendCommands([(id, packet)], callback)
     
-    def SendSetTripLevelCommand(self, level):
+    def SendSetTripLevelCommand(self, level, callback = None):
         # create packet
         id, packet = SciBreakBreakerSetTripLevelPacket.FromConfig(self.deviceID, [level, 0,0,0])
         
-        result = self._SendData(id, packet)
-        
-        if not result:
-            print ("Timeout")
-        
-        return
+        return self._SendCommands([(id, packet)], callback)
     
     # function to show either configuration window or control window
     def ShowControlConfigWindow(self, mode):
@@ -261,6 +255,7 @@ class SciBreakBreakerDevice(GridDevice):
             if not self.sciBreakBreakerControlWindow:
                 config = {"name" : self.deviceName, "ip" : self.deviceIP, "port" : self.devicePort}
                 self.sciBreakBreakerControlWindow = SciBreakBreakerControlWindow(self.editor.window, self, config)
+                self.ShowLastLiveData()
             else:
                 self.sciBreakBreakerControlWindow.lift()
         
@@ -275,13 +270,4 @@ class SciBreakBreakerDevice(GridDevice):
         
         self.graphicalElementHandler.graphicalElementsDict["Name"].SetText(self.deviceName)
         
-        return
-    
-    def _SendData(self, id, packet):
-        # notify packet distributor and send packet
-        self.packetDistributor.RegisterTransfer(id)
-        
-        self.networkInterface.SendData(packet.GetBytes())
-        
-        # wait for return
-        return self.packetDistributor.WaitForTransferComplete(id)
\ No newline at end of file
+        return
\ No newline at end of file
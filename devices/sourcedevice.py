@@ -29,6 +29,8 @@ class GridSource(GridDevice):
         
         self.deviceType = DeviceType.SOURCE
         
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        
         return
     
     def CreateNewSourceFromFile(self, config, gridFile):
@@ -41,6 +43,8 @@ class GridSource(GridDevice):
         self.deviceType = DeviceType.SOURCE
         self.deviceID = config["deviceID"]
         
+        self.editor.RegisterDeviceID(self.deviceType, self.deviceID, self)
+        
         # get connection types
         self.portType = self.graphicalElementHandler.connectionList[0].type
         
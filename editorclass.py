@@ -1,3 +1,5 @@
+import threading
+import time
 import tkinter as tk
 import tkinter.messagebox
 import tkinter.filedialog
@@ -12,22 +14,50 @@ from devices.converterdevice import *
 from devices.sourcedevice import *
 from devices.scibreakbreakerdeviceclass import *
 from network.networkinterface import *
+from network.asyncnetworkinterface import AsyncNetworkInterface
+from network.eventloop import EventLoopThread
+from network.trafficcapture import TrafficReplayer
 from file.filedata import *
 
 from network.headers.header import DeviceType
 from network.packets.fenswitchgearrespond import *
 from auxillary.windowsizetracker import *
 from scope.scopemanager import *
+from generic.tkbridge import *
+from generic.uiupdatedispatcher import *
+from generic.changefilter import *
+from history.timeseriesstore import *
+from history.historian import *
+from devices.deviceroutingtable import *
 
 from servermanager import *
 
 class EditorMain:
-    def __init__(self):
+    def __init__(self, eventLoopBackend = False, uiFrameRate = 20, historySamples = 6000):
         # first create the main window
         self.window = tk.Tk()
         self.window.title("PGS Grid Editor - New File")
         self.window.protocol("WM_DELETE_WINDOW", self.OnExit)
         
+        # calls from network threads are handed over to the Tk loop
+        self.tkBridge = TkBridge(self.window)
+        
+        # live data is shown at most with this frame rate, only the latest
+        # data of every device is drawn
+        self.uiUpdateDispatcher = UiUpdateDispatcher(self.window, uiFrameRate)
+        
+        # live data equal to the last frame of a device is not drawn again
+        self.liveDataFilter = ChangeFilter()
+        
+        # history of the live data of all devices, only with numpy installed.
+        # The live data is timestamped with the monotonic clock, the history
+        # keeps the wall clock time.
+        self.timeSeriesStore = TimeSeriesStore(historySamples) if TimeSeriesStore.IsAvailable() else None
+        self.wallClockOffset = time.time() - time.monotonic()
+        
+        # the historian writes the live data to disk while it is started
+        self.historian = None
+        
         # create icon
         self.icon = ImageTk.PhotoImage(file = "icon.png")
         #self.window.wm_iconphoto(False, self.icon)
@@ -44,14 +74,25 @@ class EditorMain:
         self.infoLabel = tk.Label(self.window, text="Not connected")
         self.infoLabel.grid(row=1, column=0)
         
+        # optionally, server connection, scope stream and timers share one
+        # event loop instead of running threads of their own
+        self.eventLoop = EventLoopThread() if eventLoopBackend else None
+        
         # network handler class
-        self.networkInterface = NetworkInterface(self)
+        if self.eventLoop is not None:
+            self.networkInterface = AsyncNetworkInterface(self, self.eventLoop)
+        else:
+            self.networkInterface = NetworkInterface(self)
         
         # server handler
         self.serverManager = ServerManager(self, self.networkInterface)
         
         # scope handler
-        self.scopeManager = ScopeManager(self.window)
+        self.scopeManager = ScopeManager(self.window, self.eventLoop)
+        
+        # live data goes to the scope and the history as it is received,
+        # every frame
+        self.networkInterface.AddLiveDataListener(self.OnLiveDataReceived)
         
         # file data class
         self.fileData = GridFile(self, self.editorPage, self.networkInterface, self.scopeManager)
@@ -85,6 +126,13 @@ class EditorMain:
         self.networkMenu.add_command(label="Upload File to Server", command=self.OnUploadToServer, state="disabled")
         self.networkMenu.add_command(label="Download File from Server", command=self.OnDownloadFromServer, state="disabled")
         self.networkMenu.add_command(label="Disconnect from Server", command=self.OnDisconnectFromServer, state="disabled")
+        self.networkMenu.add_separator()
+        self.networkMenu.add_command(label="Start Recording...", command=self.OnStartRecording)
+        self.networkMenu.add_command(label="Stop Recording", command=self.OnStopRecording)
+        self.networkMenu.add_command(label="Replay Capture...", command=self.OnReplayCapture)
+        self.networkMenu.add_separator()
+        self.networkMenu.add_command(label="Start History...", command=self.OnStartHistory)
+        self.networkMenu.add_command(label="Stop History", command=self.OnStopHistory)
         
         # grid menu
         self.gridMenu =tk.Menu(self.menu)
@@ -103,8 +151,9 @@ class EditorMain:
         self.recentUpload = False
         self.recentDownload = False
         
-        # list of devices
+        # list of devices and table for routing packets to them
         self.deviceList = []
+        self.deviceRoutingTable = DeviceRoutingTable()
         
         # just generate some basic stuff
         p1 = Point(self.editorPage, 100, 100, 'none')
@@ -113,6 +162,12 @@ class EditorMain:
         
         p1.ConnectSegment(s1)
         p2.ConnectSegment(s1)
+        
+        # time out commands nobody is waiting for
+        self.window.after(100, self._ExpireTransfers)
+        
+        # show the round trip times of the server link
+        self.window.after(1000, self._UpdateLinkStatus)
     
     # add a device
     def AppendDevice(self, device):
@@ -120,22 +175,30 @@ class EditorMain:
             print ("Adding device with id " + str(len(self.deviceList)))
             device.deviceID = len(self.deviceList)
             self.deviceList.append(device)
+            self.RegisterDeviceID(device.deviceType, device.deviceID, device)
         return
     
     # remove a device
     def RemoveDevice(self, device):
         try:
             self.deviceList.remove(device)
+            self.deviceRoutingTable.Remove(device)
             # reset device IDs
             counter = 0
             for e in self.deviceList:
                 e.deviceID = counter
+                self.RegisterDeviceID(e.deviceType, e.deviceID, e)
                 counter += 1
         except:
             pass
         
         return
     
+    # register type and id of a device, call this whenever one of them changes
+    def RegisterDeviceID(self, deviceType, deviceID, device):
+        self.deviceRoutingTable.Register(deviceType, deviceID, device)
+        return
+    
     # set the connection status
     def ChangedNetworkStatus(self):
         # change menu according to status
@@ -149,6 +212,23 @@ class EditorMain:
         
         return
     
+    def ServerReconnected(self):
+        # the connection was restored after it was lost, check the grid and
+        # turn on live data of all subscribed devices in one burst
+        self.serverManager.RecheckGridVersion()
+        
+        commands = []
+        for e in self.deviceList:
+            data = e.CreateLiveDataRestore()
+            if data is not None:
+                commands.append(data)
+        
+        if commands:
+            print ("Restoring live data of " + str(len(commands)) + " devices")
+            self.networkInterface.SendData(b"".join(commands))
+        
+        return
+    
     def GridNotUpToDate(self):
         # if the grid was recently uploaded, return true to notify server manager that this was intended
         if self.recentUpload:
@@ -161,17 +241,31 @@ class EditorMain:
         
         return False
     
+    # callback for every live data packet, called on the receiving thread
+    # with the monotonic time of its arrival
+    def OnLiveDataReceived(self, packet, receiveTime):
+        if self.timeSeriesStore is not None:
+            self.timeSeriesStore.Append(packet.header.deviceType, packet.header.deviceId, packet.payload,
+                receiveTime + self.wallClockOffset)
+        
+        historian = self.historian
+        if historian is not None:
+            historian.Append(packet.header.deviceType, packet.header.deviceId, packet.payload,
+                receiveTime + self.wallClockOffset)
+        
+        for e in self.deviceRoutingTable.GetDevices(packet.header.deviceType, packet.header.deviceId):
+            self.scopeManager.PushLiveData(e, packet.payload, receiveTime)
+        
+        return
+    
     # callback for a new incoming normal packet
     def NewPacket(self, packet):
         if packet.header.deviceType == DeviceType.SERVER:
             self.serverManager.NewPacket(packet)
         else:
-            # forward packet to device with specific id
-            id = packet.header.deviceId
-            
-            for e in self.deviceList:
-                if e.deviceID == id:
-                    e.HandleNewPacket(packet)
+            # forward packet to device with specific type and id
+            for e in self.deviceRoutingTable.GetDevices(packet.header.deviceType, packet.header.deviceId):
+                e.HandleNewPacket(packet)
         
         return
     
@@ -259,8 +353,21 @@ class EditorMain:
                 else:
                     self.OnSaveAs()
         
+        # the capture file is closed completely
+        self.networkInterface.StopRecording()
+        
+        # the history is written completely
+        self.OnStopHistory()
+        
+        if self.timeSeriesStore is not None:
+            self.timeSeriesStore.Close()
+        
         self.window.destroy()
         
+        # the event loop stops at once, its tasks don't wait for timers
+        if self.eventLoop is not None:
+            self.eventLoop.Stop()
+        
         return
     
     def OnNewFENSwitchgear(self):
@@ -330,20 +437,89 @@ class EditorMain:
         self.serverManager.Reset()
         return
     
-    def OnStartGrid(self):
-        # try to start the grid
-        result = self.serverManager.StartGrid()
-        if not result:
+    def OnStartRecording(self):
+        # record all frames of the server connection to a capture file
+        filename = tkinter.filedialog.asksaveasfilename(defaultextension=".kesscap")
+        
+        if not filename:
             return
         
-        # change menu
-        self.ChangeGridOptions()
+        self.networkInterface.StartRecording(filename)
+        return
+    
+    def OnStopRecording(self):
+        self.networkInterface.StopRecording()
+        return
+    
+    def OnStartHistory(self):
+        # write the live data of all devices to a history directory
+        directory = tkinter.filedialog.askdirectory()
+        
+        if not directory:
+            return
+        
+        self.OnStopHistory()
+        self.historian = Historian(directory)
+        return
+    
+    def OnStopHistory(self):
+        historian = self.historian
+        self.historian = None
+        
+        if historian is not None:
+            historian.Close()
+        
+        return
+    
+    def OnReplayCapture(self):
+        # feed a recorded capture through the parser as if it came from the server
+        filename = tkinter.filedialog.askopenfilename()
+        
+        if not filename:
+            return
+        
+        # ask for the replay speed
+        speeds = {"1x" : 1.0, "2x" : 2.0, "10x" : 10.0, "Maximum" : None}
+        replayConfig = {}
+        
+        config = {}
+        config["Speed"] = GenericDropDownConfig(init="1x", values=list(speeds)).GetConfig()
+        
+        configWindow = GenericConfigurationWindow(self.window, config, replayConfig.update)
+        configWindow.title("Replay Capture")
+        configWindow.wait_window()
+        
+        # the window was cancelled
+        if "Speed" not in replayConfig:
+            return
+        
+        # the replay runs in the background like the receive thread
+        replayer = TrafficReplayer(filename)
+        threading.Thread(target=self._ReplayThreadFunction, args=(replayer, speeds[replayConfig["Speed"]]), daemon=True).start()
         
         return
     
+    def _ReplayThreadFunction(self, replayer, speed):
+        try:
+            statistics = replayer.Replay(self.networkInterface.ReplayFrame, speed)
+        except Exception as e:
+            print ("Exception for replaying capture: " + str(e))
+            return
+        
+        print ("Replay finished: " + str(statistics))
+        return
+    
+    def OnStartGrid(self):
+        # try to start the grid, the menu changes when the server responds
+        self.serverManager.StartGrid(self._OnGridCommandDone)
+        return
+    
     def OnStopGrid(self):
-        # try to stop the grid
-        result = self.serverManager.StopGrid()
+        # try to stop the grid, the menu changes when the server responds
+        self.serverManager.StopGrid(self._OnGridCommandDone)
+        return
+    
+    def _OnGridCommandDone(self, result):
         if not result:
             return
         
@@ -352,6 +528,41 @@ class EditorMain:
         
         return
     
+    def _ExpireTransfers(self):
+        # check the deadlines of all commands sent without waiting
+        self.serverManager.packetDistributor.ExpireTransfers()
+        for e in self.deviceList:
+            e.packetDistributor.ExpireTransfers()
+        
+        self.window.after(100, self._ExpireTransfers)
+        return
+    
+    def _UpdateLinkStatus(self):
+        # refresh the status bar while connected
+        if self.networkInterface.IsConnected():
+            self.infoLabel["text"] = self._GetConnectionText()
+        
+        self.window.after(1000, self._UpdateLinkStatus)
+        return
+    
+    def _GetConnectionText(self):
+        # address and link quality of the server connection
+        text = ("Connected to: " + self.networkInterface.ip + " | " + str(self.networkInterface.port) +
+            " | " + self.networkInterface.livenessMonitor.GetStatusText())
+        
+        # live data the handlers could not keep up with
+        dispatchText = self.networkInterface.packetDispatcher.GetStatusText()
+        if dispatchText:
+            text += " | " + dispatchText
+        
+        # updates skipped, because nothing changed
+        frames = self.liveDataFilter.statistics.skippedUpdates
+        widgets = widgetStatistics.skippedUpdates
+        if frames or widgets:
+            text += " | unchanged frames: " + str(frames) + " | unchanged widgets: " + str(widgets)
+        
+        return text
+    
     def OnWindowResize(self, width, height):
         # notify editor page to change
         self.editorPage.CanvasResize(width - 4, height - 25)
@@ -374,6 +585,11 @@ class EditorMain:
             
             self.infoLabel["text"] = "Not connected to server"
             
+            # a lost connection can be given up while reconnecting
+            if self.networkInterface.interfaceStatus == "reconnecting":
+                self.infoLabel["text"] = "Reconnecting to: " + self.networkInterface.ip + " | " + str(self.networkInterface.port)
+                allowDisconnect = "normal"
+            
             # change to editor mode
             self.editorPage.ChangeToViewMode()
             
@@ -412,7 +628,7 @@ class EditorMain:
                     # only allow upload
                     allowUpload = "normal"
             
-            self.infoLabel["text"] = "Connected to: " + self.networkInterface.ip + " | " + str(self.networkInterface.port)
+            self.infoLabel["text"] = self._GetConnectionText()
             allowDisconnect = "normal"
         
         # set the states
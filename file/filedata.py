@@ -1,4 +1,6 @@
 import json
+import random
+from collections import deque
 from graphical.pointclass import *
 from graphical.segmentclass import *
 
@@ -11,6 +13,7 @@ from devices.scibreakbreakerdeviceclass import *
 
 from network.packets.gridconfig import *
 from network.packetdistributor import *
+from network.sendscheduler import SendPriority
 from network.packets.genericrespond import GenericRespondPacket
 from network.packets.gridconfigrespond import GridConfigSizeRespondPacket
 from network.packets.gridconfigrespond import GridGetConfigRespondPacket
@@ -32,6 +35,12 @@ class GridFile:
         # command distributor
         self.packetDistributor = PacketDistributor()
         
+        # number of grid configuration parts in flight during an upload and
+        # number of retransmissions per part, a window of 1 sends one part
+        # after another
+        self.uploadWindowSize = 8
+        self.uploadRetries = 3
+        
         # lists for points, segments and elements
         self.nodeList = []
         self.pointList = []
@@ -260,24 +269,70 @@ class GridFile:
         id, packetList = GridConfigPacket.FromConfig(self.gridConfigurationList, version)
         #print (packetList)
         
-        percentPerPacket = 50 / len(packetList)
-        counter = 1
-        
+        # give every part its own command id, so responses can be matched to
+        # the parts while several of them are in flight
+        commandIds = set()
         for p in packetList:
-            # set progress
-            progressWindow.SetProgress(percentPerPacket * (counter - 1) + 30, "Uploading " + str(counter) + "/" + str(len(packetList)) + " ...")
-            
-            # send every packet and wait for respond
-            result = self._SendPacket(id, p)
+            while p.header.commandId in commandIds:
+                p.header.commandId = random.randint(0, 2 ** 32 - 1)
+            commandIds.add(p.header.commandId)
         
+        percentPerPacket = 50 / len(packetList)
+        windowSize = max(1, self.uploadWindowSize)
+        
+        # parts waiting to be sent and parts waiting for a respond
+        pendingParts = deque(range(len(packetList)))
+        partsInFlight = deque()
+        attempts = [0] * len(packetList)
+        handles = [None] * len(packetList)
+        acknowledged = 0
+        
+        while pendingParts or partsInFlight:
+            # fill up the window
+            while pendingParts and len(partsInFlight) < windowSize:
+                index = pendingParts.popleft()
+                p = packetList[index]
+                
+                handles[index] = self.packetDistributor.RegisterTransfer(p.header.commandId)
+                attempts[index] += 1
+                partsInFlight.append(index)
+                
+                # waiting for a respond is pointless if the part wasn't sent
+                if not self.networkInterface.SendData(p.GetBytes(), SendPriority.BULK):
+                    print ("Sending part " + str(index + 1) + " failed, giving up")
+                    self._CancelTransfers(handles, partsInFlight)
+                    return False
+            
+            # wait for the respond to the oldest part, responses to younger
+            # parts are kept by the distributor in the meantime
+            index = partsInFlight.popleft()
+            result = self.packetDistributor.WaitForTransferComplete(handles[index])
+            
             if not result:
-                return False
-        
+                # without a connection no retransmission will get through
+                if not self.networkInterface.IsConnected():
+                    print ("Connection lost at part " + str(index + 1) + ", giving up")
+                    self._CancelTransfers(handles, partsInFlight)
+                    return False
+                
+                # retransmit only the part which timed out
+                if attempts[index] > self.uploadRetries:
+                    print ("No respond for part " + str(index + 1) + ", giving up")
+                    self._CancelTransfers(handles, partsInFlight)
+                    return False
+                
+                print ("No respond for part " + str(index + 1) + ", retransmitting")
+                pendingParts.appendleft(index)
+                continue
+            
             if not isinstance(result, GenericRespondPacket):
                 print ("Receiving bad packet as respond")
+                self._CancelTransfers(handles, partsInFlight)
                 return False
             
-            counter += 1
+            # set progress
+            acknowledged += 1
+            progressWindow.SetProgress(percentPerPacket * acknowledged + 30, "Uploading " + str(acknowledged) + "/" + str(len(packetList)) + " ...")
         
         return True
     
@@ -323,11 +378,11 @@ class GridFile:
         # ask server for configuration
         id, packet = GridGetConfigPacket.FromConfig()
         
-        self.packetDistributor.RegisterMultipleTransfers(id)
+        handle = self.packetDistributor.RegisterMultipleTransfers(id)
         
         self.networkInterface.SendData(packet.GetBytes())
         
-        result = self.packetDistributor.WaitForMultipleTransfersComplete(id, num)
+        result = self.packetDistributor.WaitForMultipleTransfersComplete(handle, num)
         print (result)
         
         # check length of packets received
@@ -382,15 +437,22 @@ class GridFile:
     
     def _SendPacket(self, id, packet):
         # send a packet and wait for a respond
-        self.packetDistributor.RegisterTransfer(id)
+        handle = self.packetDistributor.RegisterTransfer(id)
         print (packet.GetBytes().hex())
         self.networkInterface.SendData(packet.GetBytes())
         
         # wait for server to respond
-        result = self.packetDistributor.WaitForTransferComplete(id)
+        result = self.packetDistributor.WaitForTransferComplete(handle)
         
         return result
     
+    def _CancelTransfers(self, handles, indices):
+        # cancel the transfers of all given parts
+        for index in indices:
+            self.packetDistributor.Cancel(handles[index])
+        
+        return
+    
     def _UploadDataToServer(self, progressWindow):
         # setup progressWindow
         progressWindow.SetProgress(0, "Creating configuration from file...")
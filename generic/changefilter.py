@@ -0,0 +1,42 @@
+# counters of updates, which were passed on or skipped as unchanged. Several
+# filters can share one instance.
+class ChangeStatistics:
+    def __init__(self):
+        self.changedUpdates = 0
+        self.skippedUpdates = 0
+
+    def Count(self, changed):
+        if changed:
+            self.changedUpdates += 1
+        else:
+            self.skippedUpdates += 1
+
+        return
+
+    def GetStatistics(self):
+        return {"changed" : self.changedUpdates, "skipped" : self.skippedUpdates}
+
+# class for skipping updates, which wouldn't change anything. The last value of
+# every key is stored and compared to the new one.
+class ChangeFilter:
+    def __init__(self, statistics = None):
+        self.lastValues = {}
+        self.statistics = statistics if statistics is not None else ChangeStatistics()
+
+    def HasChanged(self, key, value):
+        # True if the value differs from the last one of the key, the value is
+        # stored in this case
+        changed = key not in self.lastValues or self.lastValues[key] != value
+        if changed:
+            self.lastValues[key] = value
+
+        self.statistics.Count(changed)
+        return changed
+
+    def Forget(self, key):
+        # the next value of the key counts as changed
+        self.lastValues.pop(key, None)
+        return
+
+# statistics of all widgets of the control windows
+widgetStatistics = ChangeStatistics()
\ No newline at end of file
@@ -0,0 +1,32 @@
+import queue
+
+# class for handing over function calls from other threads to the Tk loop
+class TkBridge:
+    def __init__(self, window, interval = 20):
+        # store parameters
+        self.window = window
+        self.interval = interval
+        
+        # queue of posted function calls
+        self.callQueue = queue.SimpleQueue()
+        
+        # start polling the queue
+        self.window.after(self.interval, self._Poll)
+    
+    def Post(self, function, *args):
+        # call a function on the Tk loop, this may be called from any thread
+        self.callQueue.put((function, args))
+        return
+    
+    def _Poll(self):
+        # only run the calls posted so far, new ones wait for the next poll
+        for _ in range(self.callQueue.qsize()):
+            function, args = self.callQueue.get_nowait()
+            
+            try:
+                function(*args)
+            except Exception as e:
+                print ("Exception in posted call: " + str(e))
+        
+        self.window.after(self.interval, self._Poll)
+        return
\ No newline at end of file
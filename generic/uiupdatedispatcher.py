@@ -0,0 +1,55 @@
+import threading
+
+# class for showing live data on the Tk loop at a limited frame rate. Only the
+# latest update of every key is kept, older ones are replaced before they are
+# drawn.
+class UiUpdateDispatcher:
+    def __init__(self, window, frameRate = 20):
+        # store parameters
+        self.window = window
+        self.SetFrameRate(frameRate)
+        
+        # latest update by key, guarded by the lock
+        self.lock = threading.Lock()
+        self.pendingUpdates = {}
+        
+        # statistics
+        self.postedUpdates = 0
+        self.appliedUpdates = 0
+        
+        # start applying the updates
+        self.window.after(self.interval, self._Apply)
+    
+    def SetFrameRate(self, frameRate):
+        # the interval is taken over with the next frame
+        self.interval = max(int(1000 / frameRate), 1)
+        return
+    
+    def Post(self, key, function, *args):
+        # call a function on the Tk loop with the next frame, this may be
+        # called from any thread. A waiting call with the same key is replaced.
+        with self.lock:
+            self.pendingUpdates[key] = (function, args)
+            self.postedUpdates += 1
+        
+        return
+    
+    def GetStatistics(self):
+        with self.lock:
+            return {"posted" : self.postedUpdates, "applied" : self.appliedUpdates, "pending" : len(self.pendingUpdates)}
+    
+    def _Apply(self):
+        # take all waiting updates, new ones wait for the next frame
+        with self.lock:
+            updates = self.pendingUpdates
+            self.pendingUpdates = {}
+            self.appliedUpdates += len(updates)
+        
+        for function, args in updates.values():
+            try:
+                function(*args)
+            except Exception as e:
+                print ("Exception in ui update: " + str(e))
+        
+        self.window.after(self.interval, self._Apply)
+        return
\ No newline at end of file
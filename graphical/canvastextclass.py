@@ -1,7 +1,8 @@
 from graphical.canvaselementclass import *
+from generic.changefilter import widgetStatistics
 
 class CanvasText(CanvasElement):
-    def __init__(self, canvas, baseX, baseY, config, rotation, scopeManager = None, name = ""):
+    def __init__(self, canvas, baseX, baseY, config, rotation, scopeManager = None, scopeDevice = None):
         # call element init
         super().__init__(canvas, baseX, baseY)
         
@@ -13,8 +14,9 @@ class CanvasText(CanvasElement):
         self.textFont = config["font"]
         self.rotation = config["rotation"]
         
+        # the live data fields of the device can be shown in a scope
         self.scopeManager = scopeManager
-        self.name = name
+        self.scopeDevice = scopeDevice
         self.value = 0
         
         # text element
@@ -26,7 +28,7 @@ class CanvasText(CanvasElement):
             self.RotateCW()
         
         # add a callback if this can be watched inside a scope
-        if self.scopeManager:
+        if self.scopeManager and self.scopeDevice:
             self.canvas.tag_bind(self.canvasText, "<Double-1>", self._OnScopeConfig)
     
     def Update(self):
@@ -35,14 +37,19 @@ class CanvasText(CanvasElement):
         self.canvas.itemconfig(self.canvasText, text=self.text, font = (self.textFont, self.textSize), angle = self.rotation)
     
     def SetText(self, text):
-        self.text = text
-        self.Update()
+        # the same text is not drawn again
+        changed = text != self.text
+        widgetStatistics.Count(changed)
+        
+        if changed:
+            self.text = text
+            self.Update()
+        
         return
     
     def SetValueUnit(self, value, unit):
-        self.text = str(value) + " " + unit
         self.value = value
-        self.Update()
+        self.SetText(str(value) + " " + unit)
         return
     
     def GetValue(self):
@@ -119,4 +126,4 @@ class CanvasText(CanvasElement):
     def _OnScopeConfig(self, event):
         # call scope manager
         if self.scopeManager:
-            self.scopeManager.OpenConfigWindow(self, self.name)
\ No newline at end of file
+            self.scopeManager.OpenConfigWindow(self.scopeDevice)
\ No newline at end of file
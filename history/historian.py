@@ -0,0 +1,509 @@
+import json
+import os
+import threading
+import time
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    # recording works without numpy, only the queries need it
+    np = None
+
+from network.headers.header import DeviceType
+from history.timeseriesstore import liveDataFields
+
+# a history directory has a directory per device, e.g. "converter-3". Every
+# device directory has an index and numbered chunk directories, which hold one
+# append-only file per column: the timestamps in seconds as float64 and every
+# field with its own type.
+INDEX_FILE = "index.json"
+TIME_COLUMN = "time.f64"
+
+# numpy type of a field -> typecode of the array module, suffix of the file
+columnTypes = {
+    "int32"   : ("i", ".i32"),
+    "int64"   : ("q", ".i64"),
+    "float64" : ("d", ".f64")}
+
+def GetDeviceDirectory(deviceType, deviceId) -> str:
+    return "{}-{}".format(DeviceType(deviceType).name.lower(), deviceId)
+
+def ParseDeviceDirectory(name):
+    # (deviceType, deviceId) of a device directory, None for other names
+    typeName, _, deviceId = name.rpartition("-")
+    if typeName.upper() not in DeviceType.__members__ or not deviceId.isdigit():
+        return None
+
+    return DeviceType[typeName.upper()], int(deviceId)
+
+def DecodeSamples(fields, samples):
+    # the columns of a batch of (timestamp, payload), filled sample by sample.
+    # A payload with a field that can't be read or doesn't fit its type is
+    # left out. Returns the times, the columns, the number of payloads left
+    # out and the last error.
+    times = array("d")
+    columns = [array(columnTypes[field.dtype][0]) for field in fields.values()]
+    bad = 0
+    error = None
+    for timestamp, payload in samples:
+        try:
+            values = [field.getter(payload) for field in fields.values()]
+            for column, value in zip(columns, values):
+                column.append(value)
+        except Exception as e:
+            for column in columns:
+                if len(column) > len(times):
+                    column.pop()
+
+            bad += 1
+            error = e
+            continue
+
+        times.append(timestamp)
+
+    return times, columns, bad, error
+
+def GetColumnFile(fieldName, dtype) -> str:
+    return fieldName + columnTypes[dtype][1]
+
+class ChunkWriter:
+    # the open chunk of a device. The column files are only opened while a
+    # batch is written, so the number of devices isn't limited by the number
+    # of open files.
+    def __init__(self, path, name, fieldTypes):
+        self.name = name
+        self.path = os.path.join(path, name)
+        self.start = None
+        self.end = None
+        self.samples = 0
+        self.size = 0
+
+        self.columns = [(os.path.join(self.path, TIME_COLUMN), 8)]
+        self.columns += [(os.path.join(self.path, GetColumnFile(fieldName, dtype)), array(columnTypes[dtype][0]).itemsize)
+            for fieldName, dtype in fieldTypes.items()]
+
+    def Write(self, times, columns):
+        # append a batch, the times and every field as an array. The range of
+        # the chunk only changes once all columns were written.
+        os.makedirs(self.path, exist_ok=True)
+
+        try:
+            for (filename, _), data in zip(self.columns, [times] + columns):
+                with open(filename, "ab") as f:
+                    f.write(data.tobytes())
+        except Exception:
+            # the columns are cut back to the samples written before, so they
+            # stay aligned when the batch is written again
+            for filename, itemSize in self.columns:
+                try:
+                    if os.path.exists(filename):
+                        os.truncate(filename, self.samples * itemSize)
+                except OSError:
+                    pass
+            raise
+
+        if self.start is None:
+            self.start = times[0]
+
+        self.end = times[-1]
+        self.samples += len(times)
+        self.size += len(times) * sum(itemSize for _, itemSize in self.columns)
+        return
+
+    def GetIndexEntry(self) -> dict:
+        return {"name" : self.name, "start" : self.start, "end" : self.end, "samples" : self.samples}
+
+class DeviceHistory:
+    # writer of the chunks of one device. Appending only queues the payload,
+    # the fields are taken from it and written on the writer thread. At most
+    # maxPendingSamples payloads wait, the oldest are dropped.
+    def __init__(self, path, fields, maxPendingSamples):
+        self.path = path
+        self.fields = fields
+        self.fieldTypes = {name : field.dtype for name, field in fields.items()}
+        self.maxPendingSamples = maxPendingSamples
+
+        # (timestamp, payload) waiting for the writer thread and the batch it
+        # is writing
+        self.pending = deque(maxlen=maxPendingSamples)
+        self.writing = []
+        self.lastTime = float("-inf")
+
+        # the directory and the index are loaded by the writer thread
+        self.chunks = None
+        self.chunk = None
+
+        # statistics
+        self.droppedSamples = 0
+        self.badSamples = 0
+
+    def Append(self, timestamp, payload):
+        # called with the lock of the historian held
+        self.lastTime = max(timestamp, self.lastTime)
+
+        # the full deque drops the oldest one
+        if len(self.pending) == self.maxPendingSamples:
+            self.droppedSamples += 1
+
+        self.pending.append((self.lastTime, payload))
+        return
+
+    def TakePending(self) -> list:
+        # called with the lock of the historian held, the samples stay in
+        # writing until WriteDone or RestorePending
+        self.writing = list(self.pending)
+        self.pending.clear()
+        return self.writing
+
+    def GetUnwritten(self) -> list:
+        # samples not written yet, oldest first. Called with the lock of the
+        # historian held.
+        return self.writing + list(self.pending)
+
+    def WriteDone(self):
+        # called with the lock of the historian held
+        self.writing = []
+        return
+
+    def RestorePending(self, samples):
+        # samples which could not be written go back in front of the newer
+        # ones, the oldest are dropped if too many are waiting. Called with
+        # the lock of the historian held.
+        samples = samples + list(self.pending)
+        excess = max(0, len(samples) - self.maxPendingSamples)
+
+        self.droppedSamples += excess
+        self.pending = deque(samples[excess:], maxlen=self.maxPendingSamples)
+        self.writing = []
+        return
+
+    def Write(self, samples, maxChunkSize, maxChunkDuration) -> int:
+        # write a batch of samples, returns the number of samples written
+        if self.chunks is None:
+            # chunks of an earlier run are kept, the new samples start a new
+            # chunk
+            os.makedirs(self.path, exist_ok=True)
+            self.chunks = HistoryReader.LoadIndex(self.path, self.fieldTypes)
+            self._SaveIndex()
+
+        times, columns, bad, error = DecodeSamples(self.fields, samples)
+        self.badSamples += bad
+        if error is not None:
+            print ("Exception for history samples of " + self.path + ": " + str(error))
+
+        if not times:
+            return 0
+
+        # a chunk is rotated between two batches, once it is large or old enough
+        if self.chunk is not None and self.chunk.samples and (self.chunk.size >= maxChunkSize or
+                times[0] - self.chunk.start >= maxChunkDuration):
+            self.CloseChunk()
+
+        if self.chunk is None:
+            name = "{:06d}".format(int(self.chunks[-1]["name"]) + 1 if self.chunks else 1)
+            self.chunk = ChunkWriter(self.path, name, self.fieldTypes)
+
+        self.chunk.Write(times, columns)
+        return len(times)
+
+    def CloseChunk(self):
+        # the closed chunk gets its entry in the index
+        if self.chunk is None:
+            return
+
+        chunk = self.chunk
+        self.chunk = None
+
+        # without an entry, readers take the range from the time column
+        if chunk.samples:
+            self.chunks.append(chunk.GetIndexEntry())
+            self._SaveIndex()
+
+        return
+
+    def _SaveIndex(self):
+        # the index is replaced as a whole, so it is never read half written
+        filename = os.path.join(self.path, INDEX_FILE)
+        with open(filename + ".tmp", "w") as f:
+            json.dump({"fields" : self.fieldTypes, "chunks" : self.chunks}, f, indent=4)
+
+        os.replace(filename + ".tmp", filename)
+        return
+
+class HistoryReader:
+    # time range queries on a history directory. Only the chunks overlapping
+    # the range are opened, their columns are memory-mapped and binary
+    # searched, so only the pages of the requested samples are read.
+    def __init__(self, directory):
+        if np is None:
+            raise ImportError("numpy is needed for reading the history")
+
+        self.directory = directory
+
+    @staticmethod
+    def LoadIndex(path, fieldTypes = None) -> list:
+        # index entries of all chunks of a device directory. Chunks missing in
+        # the index, e.g. the open one or one of a crashed run, are added with
+        # the range of their time column.
+        try:
+            with open(os.path.join(path, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {"fields" : fieldTypes, "chunks" : []}
+
+        chunks = index["chunks"]
+        indexed = {chunk["name"] for chunk in chunks}
+
+        for name in sorted(os.listdir(path)):
+            if name in indexed or not name.isdigit():
+                continue
+
+            chunk = HistoryReader._ReadRange(os.path.join(path, name))
+            if chunk is not None:
+                chunks.append(dict(name=name, **chunk))
+
+        chunks.sort(key=lambda chunk: int(chunk["name"]))
+        return chunks
+
+    @staticmethod
+    def _ReadRange(chunkPath):
+        # range of a chunk without an index entry from the first and the last
+        # complete timestamp, None if it is empty
+        filename = os.path.join(chunkPath, TIME_COLUMN)
+        samples = os.path.getsize(filename) // 8 if os.path.exists(filename) else 0
+        if not samples:
+            return None
+
+        times = array("d")
+        with open(filename, "rb") as f:
+            times.frombytes(f.read(8))
+            f.seek((samples - 1) * 8)
+            times.frombytes(f.read(8))
+
+        return {"start" : times[0], "end" : times[1], "samples" : samples}
+
+    def GetDevices(self) -> list:
+        # (deviceType, deviceId) of all devices in the history
+        devices = []
+        for name in sorted(os.listdir(self.directory)):
+            device = ParseDeviceDirectory(name)
+            if device is not None and os.path.isdir(os.path.join(self.directory, name)):
+                devices.append(device)
+
+        return devices
+
+    def GetFieldTypes(self, deviceType, deviceId) -> dict:
+        # field names and their types as recorded, the current ones if the
+        # device has no index
+        try:
+            with open(os.path.join(self.directory, GetDeviceDirectory(deviceType, deviceId), INDEX_FILE)) as f:
+                return json.load(f)["fields"]
+        except (OSError, ValueError, KeyError):
+            return {name : field.dtype for name, field in liveDataFields.get(deviceType, {}).items()}
+
+    def GetFieldNames(self, deviceType, deviceId) -> list:
+        return list(self.GetFieldTypes(deviceType, deviceId))
+
+    def GetChunks(self, deviceType, deviceId) -> list:
+        path = os.path.join(self.directory, GetDeviceDirectory(deviceType, deviceId))
+        if not os.path.isdir(path):
+            return []
+
+        return HistoryReader.LoadIndex(path)
+
+    def Query(self, deviceType, deviceId, fields = None, start = None, end = None):
+        # times and values by field of a device with start <= time <= end,
+        # oldest first
+        fieldTypes = self.GetFieldTypes(deviceType, deviceId)
+        if fields is not None:
+            fieldTypes = {name : fieldTypes[name] for name in fields}
+
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+
+        path = os.path.join(self.directory, GetDeviceDirectory(deviceType, deviceId))
+        times = [np.zeros(0, dtype=np.float64)]
+        values = {name : [np.zeros(0, dtype=dtype)] for name, dtype in fieldTypes.items()}
+
+        for chunk in self.GetChunks(deviceType, deviceId):
+            if chunk["start"] > end or chunk["end"] < start:
+                continue
+
+            chunkTimes, chunkValues = self._QueryChunk(os.path.join(path, chunk["name"]), fieldTypes, start, end)
+            times.append(chunkTimes)
+            for name in fieldTypes:
+                values[name].append(chunkValues[name])
+
+        return np.concatenate(times), {name : np.concatenate(values[name]) for name in fieldTypes}
+
+    def _QueryChunk(self, chunkPath, fieldTypes, start, end):
+        # columns written partially are cut to the samples all columns have, a
+        # missing column has none
+        columns = [(os.path.join(chunkPath, TIME_COLUMN), np.float64)]
+        columns += [(os.path.join(chunkPath, GetColumnFile(name, dtype)), dtype) for name, dtype in fieldTypes.items()]
+
+        samples = min((os.path.getsize(filename) if os.path.exists(filename) else 0) // np.dtype(dtype).itemsize
+            for filename, dtype in columns)
+        if not samples:
+            return np.zeros(0, dtype=np.float64), {name : np.zeros(0, dtype=dtype) for name, dtype in fieldTypes.items()}
+
+        times = np.memmap(columns[0][0], dtype=np.float64, mode="r", shape=(samples,))
+        i0 = np.searchsorted(times, start, "left")
+        i1 = np.searchsorted(times, end, "right")
+
+        # copies, the maps are closed when the query returns
+        chunkTimes = np.array(times[i0:i1])
+        chunkValues = {}
+        for name, (filename, dtype) in zip(fieldTypes, columns[1:]):
+            chunkValues[name] = np.array(np.memmap(filename, dtype=dtype, mode="r", shape=(samples,))[i0:i1])
+
+        return chunkTimes, chunkValues
+
+class Historian:
+    # writes the live data of all devices to a history directory. The
+    # payloads are queued in memory and written in batches by a thread of its
+    # own, which also creates the directories, so the receiving thread never
+    # waits for the disk. A chunk is closed once it is larger than
+    # maxChunkSize bytes or older than maxChunkDuration seconds. Samples which
+    # could not be written are tried again with the next batch, at most
+    # maxPendingSamples per device are kept, the oldest are dropped.
+    def __init__(self, directory, maxChunkSize = 64 * 1024 * 1024, maxChunkDuration = 3600, flushInterval = 1.0,
+            maxPendingSamples = 100000):
+        self.directory = directory
+        self.maxChunkSize = maxChunkSize
+        self.maxChunkDuration = maxChunkDuration
+        self.flushInterval = flushInterval
+        self.maxPendingSamples = maxPendingSamples
+
+        os.makedirs(directory, exist_ok=True)
+
+        # histories by (deviceType, deviceId)
+        self.devices = {}
+
+        # the lock protects the pending samples, the write lock the files
+        self.lock = threading.Lock()
+        self.writeLock = threading.Lock()
+
+        # statistics
+        self.writtenSamples = 0
+
+        # Close wakes up the writer thread with the stop event
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self._WriterThread, name="historian", daemon=True)
+        self.thread.start()
+
+    def Append(self, deviceType, deviceId, payload, timestamp = None):
+        # record a live data payload received at the time.time() timestamp,
+        # types without fields are ignored
+        fields = liveDataFields.get(deviceType)
+        if fields is None:
+            return
+
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self.lock:
+            device = self.devices.get((deviceType, deviceId))
+            if device is None:
+                device = DeviceHistory(os.path.join(self.directory, GetDeviceDirectory(deviceType, deviceId)), fields,
+                    self.maxPendingSamples)
+                self.devices[(deviceType, deviceId)] = device
+
+            device.Append(timestamp, payload)
+
+        return
+
+    def Flush(self):
+        # write all pending samples. A device whose samples can't be written
+        # keeps them, the other devices are written anyway.
+        with self.writeLock:
+            with self.lock:
+                batches = [(device, device.TakePending()) for device in self.devices.values() if device.pending]
+
+            for device, samples in batches:
+                try:
+                    self.writtenSamples += device.Write(samples, self.maxChunkSize, self.maxChunkDuration)
+                except Exception as e:
+                    print ("Exception for writing history " + device.path + ": " + str(e))
+
+                    with self.lock:
+                        device.RestorePending(samples)
+                else:
+                    with self.lock:
+                        device.WriteDone()
+
+        return
+
+    def Close(self):
+        # write the rest and close all chunks
+        self.stopEvent.set()
+        self.thread.join()
+
+        self.Flush()
+
+        with self.writeLock:
+            with self.lock:
+                devices = list(self.devices.values())
+
+            for device in devices:
+                try:
+                    device.CloseChunk()
+                except Exception as e:
+                    print ("Exception for closing history " + device.path + ": " + str(e))
+
+        return
+
+    def Query(self, deviceType, deviceId, fields = None, start = None, end = None):
+        # the samples on disk followed by the ones not written yet. Nothing is
+        # written for the query, the unwritten samples are decoded in memory
+        # without the write lock.
+        with self.lock:
+            device = self.devices.get((deviceType, deviceId))
+            samples = device.GetUnwritten() if device is not None else []
+
+        times, values = HistoryReader(self.directory).Query(deviceType, deviceId, fields, start, end)
+        if not samples or any(name not in device.fields for name in values):
+            return times, values
+
+        # a batch written after the samples were taken is on disk already
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        if len(times):
+            start = max(start, np.nextafter(times[-1], np.inf))
+
+        samples = [sample for sample in samples if start <= sample[0] <= end]
+        if not samples:
+            return times, values
+
+        fields = {name : device.fields[name] for name in values}
+        newTimes, newColumns, bad, error = DecodeSamples(fields, samples)
+        if not newTimes:
+            return times, values
+
+        # the typecodes of the columns are the ones of the field types
+        times = np.concatenate([times, np.frombuffer(newTimes, dtype=np.float64)])
+        for (name, field), column in zip(fields.items(), newColumns):
+            values[name] = np.concatenate([values[name], np.frombuffer(column, dtype=field.dtype).astype(values[name].dtype)])
+
+        return times, values
+
+    def GetStatistics(self) -> dict:
+        with self.lock:
+            devices = list(self.devices.values())
+            pending = sum(len(device.pending) for device in devices)
+
+        return {
+            "written" : self.writtenSamples,
+            "pending" : pending,
+            "dropped" : sum(device.droppedSamples for device in devices),
+            "bad"     : sum(device.badSamples for device in devices)}
+
+    def _WriterThread(self):
+        while not self.stopEvent.wait(self.flushInterval):
+            try:
+                self.Flush()
+            except Exception as e:
+                print ("Exception for writing history: " + str(e))
+
+        return
\ No newline at end of file
@@ -0,0 +1,255 @@
+import operator
+import queue
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    # the store is optional, the editor runs without it
+    np = None
+
+from network.headers.header import DeviceType
+
+class LiveDataField:
+    # a live data field is the attribute path in the decoded live data payload
+    # or a function of the payload, stored with a numpy type name
+    def __init__(self, field, dtype = "int32"):
+        self.field = field
+        self.dtype = dtype
+        self.getter = field if callable(field) else operator.attrgetter(field)
+
+# all live data fields of every device type. The status words are sent
+# unsigned, the scaled values are floats.
+liveDataFields = {
+    DeviceType.CONVERTER : {
+        "status"             : LiveDataField("status", "int64"),
+        "state"              : LiveDataField("statusDataSet.state"),
+        "warnings"           : LiveDataField("statusDataSet.warnings"),
+        "errors"             : LiveDataField("statusDataSet.errors"),
+        "mode"               : LiveDataField("statusDataSet.mode"),
+        "staticModes"        : LiveDataField("staticDataSet.modes"),
+        "staticPower"        : LiveDataField("staticDataSet.power", "float64"),
+        "voltageP1"          : LiveDataField("voltageMeasurement.voltageP1"),
+        "voltageM1"          : LiveDataField("voltageMeasurement.voltageM1"),
+        "voltageP2"          : LiveDataField("voltageMeasurement.voltageP2"),
+        "voltageM2"          : LiveDataField("voltageMeasurement.voltageM2"),
+        "currentP1"          : LiveDataField("currentMeasurement.currentP1"),
+        "currentM1"          : LiveDataField("currentMeasurement.currentM1"),
+        "currentP2"          : LiveDataField("currentMeasurement.currentP2"),
+        "currentM2"          : LiveDataField("currentMeasurement.currentM2"),
+        "voltageSetpoint1"   : LiveDataField("voltageControl1Data.voltage"),
+        "voltageSetpoint2"   : LiveDataField("voltageControl2Data.voltage"),
+        "droopVoltage1"      : LiveDataField("droopControl1Data.voltage"),
+        "droopParam1"        : LiveDataField("droopControl1Data.droopParam"),
+        "droopVoltage2"      : LiveDataField("droopControl2Data.voltage"),
+        "droopParam2"        : LiveDataField("droopControl2Data.droopParam"),
+        "powerSetpoint"      : LiveDataField("powerControlData.power", "float64"),
+        "prechargeNextMode1" : LiveDataField("precharge1Data.nextMode"),
+        "prechargeNextMode2" : LiveDataField("precharge2Data.nextMode")},
+    DeviceType.FENSWITCHGEAR : {
+        # the currents are sent with an offset of 1250
+        "deviceStatus"   : LiveDataField("deviceStatus"),
+        "closedSwitches" : LiveDataField("closedSwitches"),
+        "lockedSwitches" : LiveDataField("lockedSwitches"),
+        "hvOnLine"       : LiveDataField("hvOnLine"),
+        "voltageP"       : LiveDataField("voltageP"),
+        "voltageM"       : LiveDataField("voltageM"),
+        "current1"       : LiveDataField(lambda payload: payload.current1 - 1250),
+        "current2"       : LiveDataField(lambda payload: payload.current2 - 1250),
+        "current3"       : LiveDataField(lambda payload: payload.current3 - 1250),
+        "current4"       : LiveDataField(lambda payload: payload.current4 - 1250)},
+    DeviceType.SCIBREAKBREAKER : {
+        "status"       : LiveDataField("status", "int64"),
+        "voltageTop"   : LiveDataField("voltageTop"),
+        "voltageBot"   : LiveDataField("voltageBot"),
+        "currentTop"   : LiveDataField("currentTop"),
+        "currentBot"   : LiveDataField("currentBot"),
+        "tripLevelTop" : LiveDataField("tripLevelTop"),
+        "tripLevelBot" : LiveDataField("tripLevelBot")}}
+
+class DeviceSeries:
+    # time series of the live data fields of one device. Every field has a
+    # preallocated ring buffer of its own type, all share the ring of
+    # timestamps and the write position.
+    def __init__(self, fields, capacity):
+        self.fieldNames = list(fields)
+        self.fields = list(fields.values())
+        self.capacity = capacity
+
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.columns = [np.zeros(capacity, dtype=field.dtype) for field in self.fields]
+
+        # next position to write and number of stored samples
+        self.head = 0
+        self.count = 0
+        self.lastTime = float("-inf")
+
+        # appends and queries come from different threads
+        self.lock = threading.Lock()
+
+    def Append(self, timestamp, payload):
+        # write the fields of a payload into the rings, the timestamps never go
+        # back so the ring stays sorted. The fields are read before the lock
+        # is taken, queries only wait for the writes. Called on the writer
+        # thread of the store.
+        values = [field.getter(payload) for field in self.fields]
+
+        with self.lock:
+            self.lastTime = max(timestamp, self.lastTime)
+            self.times[self.head] = self.lastTime
+            for column, value in zip(self.columns, values):
+                column[self.head] = value
+
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+        return
+
+    def GetRange(self, start = None, end = None, fields = None):
+        # samples with start <= time <= end, oldest first. Returns the times and
+        # a dictionary of the values by field name, both copies.
+        names = list(fields) if fields is not None else self.fieldNames
+        columns = [self.columns[self.fieldNames.index(name)] for name in names]
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+
+        with self.lock:
+            # the ring is made of up to two sorted segments, the older one first
+            if self.count < self.capacity:
+                segments = [(0, self.count)]
+            else:
+                segments = [(self.head, self.capacity), (0, self.head)]
+
+            slices = []
+            for first, last in segments:
+                segmentTimes = self.times[first:last]
+                i0 = first + np.searchsorted(segmentTimes, start, "left")
+                i1 = first + np.searchsorted(segmentTimes, end, "right")
+                slices.append(slice(i0, i1))
+
+            times = np.concatenate([self.times[s] for s in slices])
+            values = {name : np.concatenate([column[s] for s in slices]) for name, column in zip(names, columns)}
+
+        return times, values
+
+    def GetLatest(self):
+        # time and values of the last sample, None if there is none
+        with self.lock:
+            if not self.count:
+                return None
+
+            last = (self.head - 1) % self.capacity
+            return float(self.times[last]), {name : column[last].item() for name, column in zip(self.fieldNames, self.columns)}
+
+    def GetMemorySize(self) -> int:
+        return self.times.nbytes + sum(column.nbytes for column in self.columns)
+
+class TimeSeriesStore:
+    # history of the live values of all devices. Every device keeps the last
+    # capacity samples in preallocated rings. Appending only puts the payload
+    # into a queue of at most maxQueued entries, a thread of the store reads
+    # the fields, which decodes the data sets of converter live data, and
+    # writes them into the rings. Payloads arriving while the queue is full
+    # are dropped, so the memory stays fixed. Range queries only slice the
+    # arrays and don't see the payloads still queued.
+    def __init__(self, capacity = 6000, maxQueued = 10000):
+        if np is None:
+            raise ImportError("numpy is needed for the time series store")
+
+        self.capacity = capacity
+
+        # series by (deviceType, deviceId), only the writer thread adds some
+        self.series = {}
+
+        # (deviceType, deviceId, timestamp, payload) for the writer thread,
+        # None stops it
+        self.queue = queue.Queue(maxQueued)
+
+        # statistics
+        self.droppedSamples = 0
+
+        self.thread = threading.Thread(target=self._WriterThread, name="time series store", daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def IsAvailable() -> bool:
+        return np is not None
+
+    def Append(self, deviceType, deviceId, payload, timestamp = None):
+        # store a live data payload received at the time.time() timestamp,
+        # types without fields are ignored. Never waits.
+        if deviceType not in liveDataFields:
+            return
+
+        try:
+            self.queue.put_nowait((deviceType, deviceId, time.time() if timestamp is None else timestamp, payload))
+        except queue.Full:
+            self.droppedSamples += 1
+
+        return
+
+    def Close(self):
+        # stop the writer thread, queued payloads are dropped
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+        self.queue.put(None)
+        self.thread.join()
+        return
+
+    def GetDevices(self) -> list:
+        # (deviceType, deviceId) of all devices with samples
+        return list(self.series)
+
+    def GetFieldNames(self, deviceType) -> list:
+        return list(liveDataFields.get(deviceType, ()))
+
+    def GetRange(self, deviceType, deviceId, start = None, end = None, fields = None):
+        # times and values by field of a device between start and end, empty
+        # arrays if the device sent nothing
+        series = self.series.get((deviceType, deviceId))
+        if series is None:
+            types = {name : field.dtype for name, field in liveDataFields.get(deviceType, {}).items()}
+            names = fields if fields is not None else types
+            return np.zeros(0, dtype=np.float64), {name : np.zeros(0, dtype=types.get(name, "int32")) for name in names}
+
+        return series.GetRange(start, end, fields)
+
+    def GetLatest(self, deviceType, deviceId):
+        # time and values of the last sample of a device, None if there is none
+        series = self.series.get((deviceType, deviceId))
+        if series is None:
+            return None
+
+        return series.GetLatest()
+
+    def GetMemorySize(self) -> int:
+        # bytes of all buffers
+        return sum(series.GetMemorySize() for series in list(self.series.values()))
+
+    def GetStatistics(self) -> dict:
+        return {"queued" : self.queue.qsize(), "dropped" : self.droppedSamples}
+
+    def _WriterThread(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+
+            deviceType, deviceId, timestamp, payload = item
+
+            series = self.series.get((deviceType, deviceId))
+            if series is None:
+                series = DeviceSeries(liveDataFields[deviceType], self.capacity)
+                self.series[(deviceType, deviceId)] = series
+
+            try:
+                series.Append(timestamp, payload)
+            except Exception as e:
+                print ("Exception for time series of " + str(deviceType) + " " + str(deviceId) + ": " + str(e))
+
+        return
\ No newline at end of file
@@ -0,0 +1,204 @@
+import asyncio
+
+from network.networkinterface import *
+from network.receivebuffer import ReceiveBuffer
+
+class ServerLinkProtocol(asyncio.BufferedProtocol):
+    # protocol of the server connection, the data is received straight into
+    # the buffer of the stream framer. Frames to send stay in the priority
+    # queue while the transport is busy.
+    def __init__(self, networkInterface):
+        self.networkInterface = networkInterface
+        self.receiveBuffer = ReceiveBuffer()
+        self.sendQueue = SendQueue()
+        self.writingPaused = False
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+        # keep the write buffer of the transport small, so urgent frames can
+        # pass queued bulk transfers
+        transport.set_write_buffer_limits(high=self.sendQueue.maxBatchBytes)
+        return
+
+    def pause_writing(self):
+        self.writingPaused = True
+        return
+
+    def resume_writing(self):
+        self.writingPaused = False
+        self.Flush()
+        return
+
+    def Flush(self):
+        # called on the loop, write all queued frames by priority
+        while not self.writingPaused and not self.transport.is_closing():
+            batch = self.sendQueue.GetBatch(0)
+            if not batch:
+                break
+            self.transport.write(b"".join(batch))
+        return
+
+    def get_buffer(self, sizehint):
+        return self.receiveBuffer.GetWriteView()
+
+    def buffer_updated(self, nbytes):
+        self.receiveBuffer.CommitWrite(nbytes)
+
+        # every incoming data shows the server is alive
+        self.networkInterface.livenessMonitor.OnDataReceived()
+
+        # forward every frame completed by this read
+        for frame in self.receiveBuffer.GetFrames():
+            try:
+                self.networkInterface._ForwardPacketData(frame)
+            except Exception as e:
+                print ("Exception for forwarding packet: " + str(e))
+
+        return
+
+    def connection_lost(self, exc):
+        # report corrupt data of the connection
+        if self.receiveBuffer.resyncs:
+            print ("Receive stream resynchronized: " + str(self.receiveBuffer.GetStatistics()))
+
+        self.sendQueue.Close()
+        self.networkInterface._OnConnectionLost(self.transport)
+        return
+
+class AsyncNetworkInterface(NetworkInterface):
+    # network interface, which runs the server connection and the isAlive
+    # timer on the event loop instead of threads of its own
+    def __init__(self, editor, eventLoop):
+        super().__init__(editor)
+
+        self.eventLoop = eventLoop
+        self.transport = None
+        self.protocol = None
+        self.aliveTimer = None
+        self.reconnectTask = None
+
+    def SendData(self, data : bytearray, priority = SendPriority.CONTROL) -> bool:
+        # the transport is only used on the loop, which must never wait for
+        # room in the queue
+        protocol = self.protocol
+        if protocol is None:
+            return False
+
+        timeout = 0 if self.eventLoop.IsEventLoopThread() else self.sendTimeout
+        if not protocol.sendQueue.Put(data, priority, timeout):
+            if not protocol.sendQueue.closed:
+                print ("Send queue full, dropping " + SendPriority(priority).name + " frame")
+            return False
+
+        self.eventLoop.CallSoon(protocol.Flush)
+        self._RecordFrame(CaptureDirection.SENT, data)
+        return True
+
+    def _Open(self):
+        # check if we can connect to a server
+        if self.transport is not None:
+            return False
+
+        connection = self.eventLoop.loop.create_connection(
+            lambda: ServerLinkProtocol(self), self.ip, self.port)
+
+        try:
+            self.transport, self.protocol = self.eventLoop.Submit(connection, timeout=1).result()
+        except Exception as e:
+            #print ("Cannot create server connection")
+            return False
+
+        self._StartAliveTimer()
+        return True
+
+    def _StartAliveTimer(self):
+        # send isAlive packets and check the server responds
+        self.livenessMonitor.Reset()
+        self.aliveTimer = self.eventLoop.Every(self.livenessMonitor.interval,
+            self._OnAliveTimer)
+        return
+
+    def _Close(self):
+        # stopping the timer and closing the transport don't block
+        if self.aliveTimer is not None:
+            self.aliveTimer.cancel()
+            self.aliveTimer = None
+
+        if self.transport is not None:
+            self.protocol.sendQueue.Close()
+            self.eventLoop.CallSoon(self.transport.close)
+            self.transport = None
+            self.protocol = None
+
+        return
+
+    def _OnAliveTimer(self):
+        # called on the loop, no data within the deadline means the connection
+        # was interrupted
+        if self.livenessMonitor.IsExpired():
+            print ("Server connection timed out")
+            if self.transport is not None:
+                self.transport.close()
+            return
+
+        self._SendIsAlivePacket()
+        return
+
+    def _OnConnectionLost(self, transport):
+        # called on the loop, the status is changed on the Tk loop
+        self.editor.tkBridge.Post(self._OnTransportClosed, transport)
+        return
+
+    def _OnTransportClosed(self, transport):
+        # a connection closed by Disconnect or replaced meanwhile is ignored
+        if transport is self.transport:
+            self._OnLinkLost()
+        return
+
+    def _StartReconnect(self):
+        # the attempts run on the loop, cancel the future to stop them
+        self.reconnectTask = self.eventLoop.Submit(self._Reconnect())
+        return
+
+    def _StopReconnect(self):
+        if self.reconnectTask is not None:
+            self.reconnectTask.cancel()
+            self.reconnectTask = None
+        return
+
+    async def _Reconnect(self):
+        # coroutine trying to connect with exponential backoff
+        for delay in self._GetReconnectDelays():
+            await asyncio.sleep(delay)
+
+            connection = self.eventLoop.loop.create_connection(
+                lambda: ServerLinkProtocol(self), self.ip, self.port)
+
+            try:
+                transport, protocol = await asyncio.wait_for(connection, 1)
+            except (OSError, asyncio.TimeoutError):
+                continue
+
+            # the transport is taken over on the Tk loop
+            self.editor.tkBridge.Post(self._OnTransportReconnected, transport, protocol)
+            return
+
+    def _OnTransportReconnected(self, transport, protocol):
+        # the user might have disconnected or connected meanwhile
+        if self.interfaceStatus != "reconnecting" or self.transport is not None:
+            self.eventLoop.CallSoon(transport.close)
+            return
+
+        self.reconnectTask = None
+        self.transport = transport
+        self.protocol = protocol
+        self._StartAliveTimer()
+
+        if self._OnReconnected():
+            print ("Reconnected to server")
+        else:
+            self._Close()
+
+        return
\ No newline at end of file
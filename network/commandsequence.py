@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+
+from network.sendscheduler import SendPriority
+
+class CommandSequence:
+    # sends commands one after another without blocking the caller. A command
+    # is only sent when the previous one got a respond. The future returns
+    # the respond of the last command or None if a command timed out.
+    def __init__(self, packetDistributor, networkInterface, commands, priority = SendPriority.CONTROL):
+        # store parameters
+        self.packetDistributor = packetDistributor
+        self.networkInterface = networkInterface
+        self.commands = list(commands)
+        self.priority = priority
+        
+        # future of the whole sequence and handle of the running command
+        self.future = Future()
+        self.handle = None
+        
+        self.future.add_done_callback(self._OnSequenceDone)
+    
+    def Start(self) -> Future:
+        # send the first command
+        self._SendNext(None)
+        return self.future
+    
+    def _SendNext(self, respond):
+        # stop if the sequence was cancelled
+        if self.future.cancelled():
+            return
+        
+        # finish when all commands got a respond
+        if not self.commands:
+            self._Finish(respond)
+            return
+        
+        id, packet = self.commands.pop(0)
+        
+        # register before sending, so the respond cannot be missed
+        self.handle = self.packetDistributor.RegisterTransfer(id)
+        self.handle.add_done_callback(self._OnCommandDone)
+        
+        self.networkInterface.SendData(packet.GetBytes(), self.priority)
+        return
+    
+    def _OnCommandDone(self, handle):
+        # called from the thread which finished the transfer
+        if handle.cancelled() or handle.exception() is not None:
+            self._Finish(None)
+        else:
+            self._SendNext(handle.result())
+        return
+    
+    def _OnSequenceDone(self, future):
+        # stop the running command if the sequence was cancelled
+        if future.cancelled() and self.handle is not None:
+            self.handle.cancel()
+        return
+    
+    def _Finish(self, respond):
+        # the sequence might have been cancelled meanwhile
+        if self.future.set_running_or_notify_cancel():
+            self.future.set_result(respond)
+        return
\ No newline at end of file
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+class EventLoopThread:
+    # runs one asyncio event loop on a background thread. Server link, scope
+    # stream and timers share this loop instead of running threads of their
+    # own. All methods may be called from any thread.
+    def __init__(self, name = "event loop"):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._Run, name=name, daemon=True)
+        self.thread.start()
+
+    def Submit(self, coroutine, timeout = None):
+        # run a coroutine on the loop, the returned future can be waited for
+        # or cancelled from any thread
+        if timeout is not None:
+            coroutine = asyncio.wait_for(coroutine, timeout)
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def CallSoon(self, function, *args):
+        # call a function on the loop
+        self.loop.call_soon_threadsafe(function, *args)
+        return
+
+    def Every(self, interval, function, *args):
+        # call a function periodically on the loop, cancel the returned future
+        # to stop the timer
+        return self.Submit(self._Every(interval, function, args))
+
+    def IsEventLoopThread(self) -> bool:
+        # check if the caller runs on the loop
+        return threading.current_thread() is self.thread
+
+    def Stop(self, timeout = 1):
+        # cancel all tasks and stop the loop, nothing waits for sleeps to end
+        if self.loop.is_closed():
+            return
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        return
+
+    def _Run(self):
+        # thread function
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+        # let the cancelled tasks finish before closing the loop
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+        self.loop.close()
+        return
+
+    async def _Every(self, interval, function, args):
+        # the deadlines don't drift with the run time of the function
+        deadline = self.loop.time()
+        while True:
+            deadline += interval
+            await asyncio.sleep(deadline - self.loop.time())
+
+            try:
+                function(*args)
+            except Exception as e:
+                print ("Exception in timer: " + str(e))
+
+            # skip missed calls if the loop was blocked
+            if self.loop.time() - deadline > interval:
+                deadline = self.loop.time()
\ No newline at end of file
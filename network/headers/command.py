@@ -35,33 +35,14 @@ class CommandHeader(Header):
     command : int = field(default=0)
     commandId : int = field(default=random.randint(0, 4294967295))
 
-    def GetBytes(self) -> bytearray:
-        """Gives the binary representation of the CommandHeader.
-
-        The binary representation of the added fields are appended to the
-        binary representation of Header.
-
-        Returns:
-            bytearray: Binary representation of all fields (even inherited
-                ones).
-        
-        Raises:
-            struct.error: The type of one of the added fields doesn't match
-                with _typeFormatString or the value is not in the specified
-                range.
-        """
-        headerBytes = super().GetBytes()
-        commandBytes = struct.pack(CommandHeader._typeFormatString,
-            self.command, self.commandId)
-        return headerBytes + commandBytes
-
-    def ParseBytes(headerBytes: bytearray) -> tuple[int, int]:
+    def ParseBytes(headerBytes: bytearray, offset: int = 0) -> tuple[int, int]:
         """Retrieves command and commandId from a bytearray.
 
         Args:
             headerBytes (bytearray): Binary data of the added fields.
-                Only the bytes from 0 to size (exclusive) are considered.
-                Further bytes don't have an effect.
+                Only the bytes from offset to offset + size (exclusive) are
+                considered. Further bytes don't have an effect.
+            offset (int): Position of the first added field.
 
         Returns:
             A tuple representing (command, commandId)
@@ -70,9 +51,6 @@ class CommandHeader(Header):
             IndexError: Number of bytes in headerBytes is insufficient for
                 creating CommandHeader
         """
-        if len(headerBytes) < CommandHeader.size:
+        if len(headerBytes) - offset < CommandHeader.size:
             raise IndexError("Error: Too few bytes for a CommandHeader.")
-        commandHeaderBytes = headerBytes[:CommandHeader.size]
-        commandHeaderTuple = struct.unpack(CommandHeader._typeFormatString,
-            commandHeaderBytes)
-        return commandHeaderTuple
\ No newline at end of file
+        return CommandHeader._struct.unpack_from(headerBytes, offset)
\ No newline at end of file
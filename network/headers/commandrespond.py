@@ -34,43 +34,20 @@ class CommandRespondHeader(Header):
     result : int = field(default=0, compare=False)
     commandId : int = field(default=0)
 
-    def GetBytes(self) -> bytearray:
-        """Gives a binary representation ofthe CommandRespondHeader.
-
-        The binary form of the added fields is appended to the binary form
-        of Header.
-
-        Returns:
-            bytearray: Binary representation of all fields (even inherited
-                ones).
-
-        Raises:
-            struct.error: The type of one of the added fields doesn't match
-                with _typeFormatString or the value is not in the specified
-                range.
-        """
-
-        headerBytes = super().GetBytes()
-        commandResponseBytes = struct.pack(
-            CommandRespondHeader._typeFormatString, self.result,
-            self.commandId)
-        return headerBytes + commandResponseBytes
-
-    def ParseBytes(headerBytes: bytearray) -> tuple[int, int]:
+    def ParseBytes(headerBytes: bytearray, offset: int = 0) -> tuple[int, int]:
         """Retrieves result and commandId from a bytearray.
 
         Args:
             headerbytes (bytearray): Binary representation of the added
-                fields. Only the bytes from 0 to size (exclusive) are
-                considered. Further bytes don't have an effect.
+                fields. Only the bytes from offset to offset + size
+                (exclusive) are considered. Further bytes don't have an
+                effect.
+            offset (int): Position of the first added field.
 
         Returns:
             A tuple (result, commandId) describing the additional fields of
             CommandRespondHeader. 
         """
-        if len(headerBytes) < CommandRespondHeader.size:
+        if len(headerBytes) - offset < CommandRespondHeader.size:
             raise IndexError("Error: Too few bytes for a CommandRespondHeader")
-        commandRespondHeaderBytes = headerBytes[:CommandRespondHeader.size]
-        commandResponseHeaderTuple = struct.unpack(
-            CommandRespondHeader._typeFormatString, commandRespondHeaderBytes)
-        return commandResponseHeaderTuple
\ No newline at end of file
+        return CommandRespondHeader._struct.unpack_from(headerBytes, offset)
\ No newline at end of file
@@ -37,34 +37,15 @@ class DeviceDataHeader(Header):
     id : int = field(default=0)
     rsvd : int = field(default=0, init=False)
 
-    def GetBytes(self) -> bytearray:
-        """Gives the bytearray representation of the DeviceDataHeader.
-
-        The binary representation of the added fields are appended to the
-        binary representation of Header.
-
-        Returns:
-            bytearray: Binary representation of all fields (even inherited
-                ones).
-
-        Raises:
-            struct.error: The type of one of the added fields doesn't match
-            with their stated ctype or the value is not in the expected range.
-        """
-        
-        headerBytes = super().GetBytes()
-        deviceDataHeaderBytes = struct.pack(DeviceDataHeader._typeFormatString,
-            self.id, self.rsvd)
-        return headerBytes + deviceDataHeaderBytes
-
-    def ParseBytes(headerBytes: bytearray) -> tuple[int, int]:
+    def ParseBytes(headerBytes: bytearray, offset: int = 0) -> tuple[int, int]:
         """ Retries deviceStatus, deviceErrors from a bytearray.
 
         Args:
             headerBytes (bytearray): Binary representation of added fields
                 compared to header (id, rsvd). Only the
-                bytes from 0 to size (exclusive) are considered. Further bytes
-                don't have an effect.
+                bytes from offset to offset + size (exclusive) are
+                considered. Further bytes don't have an effect.
+            offset (int): Position of the first added field.
         
         Returns:
             A tuple (id, rsvd)
@@ -73,9 +54,6 @@ class DeviceDataHeader(Header):
             IndexError: Number of bytes in headerBytes is insufficient for
                 creating a DeviceDataHeader.
         """
-        if len(headerBytes) < DeviceDataHeader.size:
+        if len(headerBytes) - offset < DeviceDataHeader.size:
             raise IndexError("Error: Too few bytes for a DeviceDataHeader.")
-        headerBytes = headerBytes[:DeviceDataHeader.size]
-        deviceDataHeaderTuple = struct.unpack(
-            DeviceDataHeader._typeFormatString, headerBytes)
-        return deviceDataHeaderTuple
\ No newline at end of file
+        return DeviceDataHeader._struct.unpack_from(headerBytes, offset)
\ No newline at end of file
@@ -131,34 +131,14 @@ class GridCommandLoadFileHeader(CommandHeader):
     part : int = field(default=0)
     numberGridElements : int = field(default=0)
 
-    def GetBytes(self) -> bytearray:
-        """Gives the binary representation of the GridCommandLoadGridFileHeader.
-
-        The binary representation of the added fields are appended to the
-        binary representation of CommandHeader.
-
-        Returns:
-            bytearray: Binary representation of all fields (even inherited
-                ones)
-
-        Raises:
-            struct.error: The type of one of the added fields doesn't match
-                with _typeFormatString or the value is not within the specified
-                range.
-        """
-        commandHeaderBytes = super().GetBytes()
-        gridHeaderBytes = struct.pack(GridCommandLoadFileHeader._typeFormatString,
-            self.version, self.subversion, self.totalParts, self.part,
-            self.numberGridElements)
-        return commandHeaderBytes + gridHeaderBytes
-
-    def ParseBytes(gridHeaderBytes: bytearray) -> tuple[int, int, int, int, int]:
+    def ParseBytes(gridHeaderBytes: bytearray, offset: int = 0) -> tuple[int, int, int, int, int]:
         """Retrieves the added fields from a bytearray.
 
         Args:
             gridHeaderBytes (bytearray): Binary data of the added fields. Only
-                the bytes from 0 to size (exclusive) are considered. Further
-                bytes don't have an effect.
+                the bytes from offset to offset + size (exclusive) are
+                considered. Further bytes don't have an effect.
+            offset (int): Position of the first added field.
 
         Returns:
             A tuple representing (version, subversion, totalParts, part,
@@ -168,10 +148,7 @@ class GridCommandLoadFileHeader(CommandHeader):
             IndexError: Number of bytes in gridHeaderBytes is insufficient
                 for creating GridCommandLoadFileHeader.
         """
-        if len(gridHeaderBytes) < GridCommandLoadFileHeader.size:
+        if len(gridHeaderBytes) - offset < GridCommandLoadFileHeader.size:
             raise IndexError("Error: Too few bytes for a " /
                 "GridCommandLoadFileHeader""")
-        gridHeaderBytes = gridHeaderBytes[:GridCommandLoadFileHeader.size]
-        loadGridFileTuple = struct.unpack(
-            GridCommandLoadFileHeader._typeFormatString, gridHeaderBytes)
-        return loadGridFileTuple
\ No newline at end of file
+        return GridCommandLoadFileHeader._struct.unpack_from(gridHeaderBytes, offset)
\ No newline at end of file
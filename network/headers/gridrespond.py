@@ -75,44 +75,20 @@ class GridCommandGetFileHeader(CommandRespondHeader):
     part : int = field(default=0)
     numberGridElements : int = field(default=0)
 
-    def GetBytes(self) -> bytearray:
-        """Gives the binary representation of the GridCommandGetFileHeader.
-
-        The binary representation of the added fields are appended to the
-        binary representation of CommandHeader.
-
-        Returns:
-            bytearray: Binary representation of all fields (even inherited
-                ones)
-
-        Raises:
-            struct.error: The type of one of the added fields doesn't match
-                with _typeFormatString or the value is not within the specified
-                range.
-        """
-        commandRespondHeaderBytes = super().GetBytes()
-        getFileHeaderBytes = struct.pack(
-            GridCommandGetFileHeader._typeFormatString,
-            self.version, self.subversion, self.totalParts, self.part,
-            self.numberGridElements)
-        return commandRespondHeaderBytes + getFileHeaderBytes
-
-    def ParseBytes(getFileHeaderBytes: bytearray) -> tuple[int, int, int, int, int]:
+    def ParseBytes(getFileHeaderBytes: bytearray, offset: int = 0) -> tuple[int, int, int, int, int]:
         """Retrieves the added fields from a bytearray.
 
         Args:
             gridHeaderBytes: Binary data of the added fields. Only the bytes
-                from 0 to size (exclusive) are considered. Furhter bytes don't
-                have an effect.
+                from offset to offset + size (exclusive) are considered.
+                Furhter bytes don't have an effect.
+            offset (int): Position of the first added field.
 
         Returns:
             A tuple representing (version, subversion, totalParts, part,
                 numberGridElements)
         """
-        if len(getFileHeaderBytes) < GridCommandGetFileHeader.size:
+        if len(getFileHeaderBytes) - offset < GridCommandGetFileHeader.size:
             raise IndexError("Error: Too few bytes for a " / 
                 "GridCommandGetFileHeader")
-        getFileHeaderBytes = getFileHeaderBytes[:GridCommandGetFileHeader.size]
-        getFileHeaderTuple = struct.unpack(
-            GridCommandGetFileHeader._typeFormatString, getFileHeaderBytes)
-        return getFileHeaderTuple        
\ No newline at end of file
+        return GridCommandGetFileHeader._struct.unpack_from(getFileHeaderBytes, offset)
\ No newline at end of file
@@ -91,25 +91,53 @@ class Header(PacketSegment):
     def GetBytes(self) -> bytearray:
         """Gives the binary representation of the Header.
 
+        Derived headers add their fields to fullTypeFormatString in the same
+        order as they are declared, so all fields of a header are packed
+        with one call of the compiled _fullStruct. Derived headers don't
+        override this method.
+
+        Returns:
+            bytearray: Binary representation of all fields (even inherited
+                ones)
+
+        Raises:
+            struct.error: The type of one of the fields doesn't match with
+                _typeFormatString or the values are not within the expected
+                range.
+        """
+        headerClass = type(self)
+        return headerClass._fullStruct.pack(*headerClass._fieldGetter(self))
+
+    def PackInto(self, buffer: bytearray, offset: int = 0) -> int:
+        """Writes all fields of the Header into a preallocated buffer.
+
+        Args:
+            buffer (bytearray): Writable buffer with at least totalSize bytes
+                after offset.
+            offset (int): Position of the first byte of the Header.
+
         Returns:
-            bytearray: Binary representation of all fields
+            int: Position right after the written fields.
 
         Raises:
             struct.error: The type of one of the fields doesn't match with
                 _typeFormatString or the values are not within the expected
                 range.
         """
-        return struct.pack(Header._typeFormatString, self.packetType,
-            self.deviceType, self.deviceId, self.length, self.connection)
+        headerClass = type(self)
+        headerClass._fullStruct.pack_into(buffer, offset,
+            *headerClass._fieldGetter(self))
+        return offset + headerClass.totalSize
 
-    def ParseBytes(headerBytes: bytearray) -> tuple[PacketType,
+    def ParseBytes(headerBytes: bytearray, offset: int = 0) -> tuple[PacketType,
         DeviceType, int, int]:
         """Retrieves the fields from a bytearray.
 
         Args:
             headerBytes (bytearray): Binary data of the fields. Only the bytes
-                from 0 to size (exclusive) are considered. Further bytes don't
-                have an effect.
+                from offset to offset + size (exclusive) are considered.
+                Further bytes don't have an effect.
+            offset (int): Position of the first byte of the Header.
         
         Returns:
             A tuple representing (packetType, deviceType, deviceId, length,
@@ -119,9 +147,6 @@ class Header(PacketSegment):
             IndexError: Number of bytes in headerBytes is insufficient for
                 creating a Header.
         """
-        if len(headerBytes) < Header.size:
+        if len(headerBytes) - offset < Header.size:
             raise IndexError("Error: Too few bytes for a Header.")
-        headerBytes = headerBytes[:Header.size]
-        (packetType, deviceType, deviceId, length, connection) = struct.unpack(
-            Header.fullTypeFormatString, headerBytes)
-        return (packetType, deviceType, deviceId, length, connection)
\ No newline at end of file
+        return Header._struct.unpack_from(headerBytes, offset)
\ No newline at end of file
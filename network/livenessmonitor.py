@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from network.packets.isalive import IsAlivePacket
+
+class LivenessMonitor:
+    # characters of the RTT sparkline, lowest to highest
+    sparkCharacters = "▁▂▃▄▅▆▇█"
+
+    def __init__(self, interval = 2.0, missThreshold = 3, historyLength = 30):
+        # an isAlive probe is sent every interval, the link is dead when no data
+        # arrived for missThreshold intervals
+        self.interval = interval
+        self.missThreshold = missThreshold
+
+        # all access is guarded by the lock
+        self.lock = threading.Lock()
+
+        # probes without a respond, sequence number -> send time
+        self.probes = OrderedDict()
+        self.sequence = 0
+
+        # round trip times in seconds
+        self.rttHistory = deque(maxlen=historyLength)
+        self.jitter = 0.0
+
+        self.Reset()
+
+    def Reset(self, now = None):
+        # start monitoring a new connection
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            self.lastReceive = now
+            self.probes.clear()
+            self.rttHistory.clear()
+            self.jitter = 0.0
+            self.missedProbes = 0
+        return
+
+    def CreateProbe(self, now = None) -> IsAlivePacket:
+        # isAlive packet carrying a sequence number, the send time is stored
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            # probes without a respond within the interval are missed
+            while self.probes and next(iter(self.probes.values())) < now - self.interval:
+                self.probes.popitem(last = False)
+                self.missedProbes += 1
+
+            self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+            self.probes[self.sequence] = now
+
+            sequence = self.sequence
+
+        return IsAlivePacket.FromConfig(rsvd0 = sequence)
+
+    def OnDataReceived(self, now = None):
+        # any incoming data shows the link is alive
+        if now is None:
+            now = time.monotonic()
+
+        self.lastReceive = now
+        return
+
+    def OnIsAlive(self, payload, now = None):
+        # respond to a probe, the sequence number is matched if the server echoes
+        # it, otherwise the oldest probe is used
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            sendTime = self.probes.pop(payload.rsvd0, None)
+            if sendTime is None:
+                if not self.probes:
+                    return
+                _, sendTime = self.probes.popitem(last = False)
+
+            rtt = now - sendTime
+
+            # interarrival jitter as in RFC 3550
+            if self.rttHistory:
+                self.jitter += (abs(rtt - self.rttHistory[-1]) - self.jitter) / 16
+
+            self.rttHistory.append(rtt)
+
+        return
+
+    def GetDeadline(self) -> float:
+        # monotonic time, when the link is considered dead
+        return self.lastReceive + self.interval * self.missThreshold
+
+    def IsExpired(self, now = None) -> bool:
+        # check if the deadline passed
+        if now is None:
+            now = time.monotonic()
+        return now > self.GetDeadline()
+
+    def GetStatistics(self) -> dict:
+        # round trip times in milliseconds
+        with self.lock:
+            history = list(self.rttHistory)
+            statistics = {
+                "rtt"    : history[-1] * 1000 if history else None,
+                "minRtt" : min(history) * 1000 if history else None,
+                "maxRtt" : max(history) * 1000 if history else None,
+                "jitter" : self.jitter * 1000,
+                "missed" : self.missedProbes}
+        return statistics
+
+    def GetSparkline(self) -> str:
+        # RTT history as a short line of block characters
+        with self.lock:
+            history = list(self.rttHistory)
+
+        if not history:
+            return ""
+
+        low = min(history)
+        span = max(history) - low
+        steps = len(LivenessMonitor.sparkCharacters) - 1
+
+        if span == 0:
+            return LivenessMonitor.sparkCharacters[0] * len(history)
+
+        return "".join(LivenessMonitor.sparkCharacters[round((rtt - low) / span * steps)] for rtt in history)
+
+    def GetStatusText(self) -> str:
+        # short description of the link for the status bar
+        statistics = self.GetStatistics()
+        if statistics["rtt"] is None:
+            return "RTT: -"
+
+        text = "RTT: {:.1f} ms (jitter {:.1f} ms) {}".format(statistics["rtt"],
+            statistics["jitter"], self.GetSparkline())
+
+        if statistics["missed"]:
+            text += " | missed: " + str(statistics["missed"])
+
+        return text
\ No newline at end of file
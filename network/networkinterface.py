@@ -6,6 +6,11 @@ from network.packets.isalive import *
 import tkinter as tk
 from generic.genericconfigwindowclass import *
 from network.packets.packetparser import *
+from network.receivebuffer import ReceiveBuffer
+from network.livenessmonitor import LivenessMonitor
+from network.packetdispatcher import *
+from network.sendscheduler import *
+from network.trafficcapture import *
 
 class NetworkInterface:
     def __init__(self, editor):
@@ -16,17 +21,49 @@ class NetworkInterface:
         # set some variables
         self.runThreads = False
         self.socket = None
-        self.sendLock = threading.Lock()
-        self.timeoutLock = threading.Lock()
         self.statusLock = threading.Lock()
         
+        # all frames are sent by the send scheduler, by priority. Senders wait
+        # up to sendTimeout seconds for room in the queue.
+        self.sendScheduler = None
+        self.sendTimeout = 1
+        
+        # a small socket buffer keeps urgent frames from waiting behind bulk
+        # data already handed to the system
+        self.sendBufferSize = 64 * 1024
+        
+        # optional recorder of all frames sent and received
+        self.trafficRecorder = None
+        
+        # received packets are handled on the dispatch thread, live data
+        # waiting there is replaced by newer frames of the same device
+        self.packetDispatcher = PacketDispatcher(self._HandlePacket)
+        
+        # functions called with every live data packet and the monotonic time
+        # it was received, on the receiving thread before live data is
+        # coalesced. The list is replaced as a whole.
+        self.liveDataListeners = []
+        
         self.ip = "127.0.0.1"
         self.port = 50000
         
         # recv and periodic task
         self.recvTask = None
         self.periodicTask = None
-        self.timeoutCounter = 0
+        
+        # deadlines and round trip times of the server link, Disconnect wakes
+        # the periodic task with the stop event
+        self.livenessMonitor = LivenessMonitor()
+        self.stopEvent = threading.Event()
+        
+        # a lost connection is opened again with exponential backoff, the
+        # delays are given in seconds
+        self.autoReconnect = True
+        self.reconnectDelay = 0.5
+        self.reconnectMaxDelay = 8
+        self.reconnectTask = None
+        self.reconnectEvent = threading.Event()
+        self.openLock = threading.Lock()
         
         # status of the interface
         self.interfaceStatus = "not connected"
@@ -45,12 +82,52 @@ class NetworkInterface:
         configWindow.title("Setup Network Configuration")
         configWindow.wait_window()
         
+        return self.Connect()
+    
+    def Connect(self):
+        # connect to ip and port without asking, e.g. for headless clients
+        # a running reconnect is replaced by the new connection
+        self._CancelReconnect()
+        
+        # open the connection with the backend of the interface
+        with self.openLock:
+            if not self._Open():
+                return False
+            
+            self.SetStatus("connected")
+        
+        return True
+    
+    def Disconnect(self):
+        # disconnect from server
+        # the status is checked and set in one step, so either this or
+        # _OnLinkLost closes the connection
+        with self.statusLock:
+            status = self.interfaceStatus
+            self.interfaceStatus = "not connected"
+        
+        if status == "not connected":
+            return
+        
+        # stop trying to reconnect
+        if status == "reconnecting":
+            self._StopReconnect()
+        
+        self.editor.ChangedNetworkStatus()
+        
+        if status == "connected":
+            self._Close()
+        
+        return
+    
+    def _Open(self):
         # check if we can connect to a server
         if self.socket != None:
             return False
         
         # create a socket and connect to the server
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sendBufferSize)
         self.socket.settimeout(1)
         
         try:
@@ -63,8 +140,12 @@ class NetworkInterface:
             return False
         
         
-        # start the recv thread
+        # start the send scheduler and the recv thread
+        self.sendScheduler = SendScheduler(self.socket, self._OnSendError)
+        
         self.runThreads = True
+        self.livenessMonitor.Reset()
+        self.stopEvent.clear()
         self.recvTask = threading.Thread(target=self._RecvThreadFunction)
         self.recvTask.start()
         
@@ -72,21 +153,27 @@ class NetworkInterface:
         self.periodicTask = threading.Thread(target=self._PeriodicThreadFunction)
         self.periodicTask.start()
         
-        self.SetStatus("connected")
-        
         return True
     
-    def Disconnect(self):
-        # disconnect from server        
-        # check if we need to disconnect
-        if not self.IsConnected():
+    def _Close(self):
+        # nothing to do, if the connection is closed already
+        if self.socket is None:
             return
-            
-        self.SetStatus("not connected")
         
         # stop recv and periodic task
         print ("Stopping network threads")
         self.runThreads = False
+        self.stopEvent.set()
+        
+        # a blocked recv returns at once after shutting down the socket
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        
+        # pending frames are dropped
+        self.sendScheduler.Stop()
+        self.sendScheduler = None
         
         # join both tasks
         try:
@@ -110,18 +197,61 @@ class NetworkInterface:
         
         return
     
-    def SendData(self, data : bytearray):
-        # get lock and send out data
-        self.sendLock.acquire()
+    def SendData(self, data : bytearray, priority = SendPriority.CONTROL) -> bool:
+        # queue data for the send scheduler, False if it cannot be sent
+        sendScheduler = self.sendScheduler
+        if sendScheduler is None:
+            return False
         
-        # send out data
-        try:
-            self.socket.sendall(data)
-        except:
-            pass
+        if not sendScheduler.Put(data, priority, self.sendTimeout):
+            # nothing to report while the connection is closed
+            if not sendScheduler.queue.closed:
+                print ("Send queue full, dropping " + SendPriority(priority).name + " frame")
+            return False
+        
+        self._RecordFrame(CaptureDirection.SENT, data)
         
-        # release lock and return
-        self.sendLock.release()
+        return True
+    
+    def StartRecording(self, filename):
+        # record all frames to a capture file, a running recording is stopped
+        self.StopRecording()
+        self.trafficRecorder = TrafficRecorder(filename)
+        return
+    
+    def StopRecording(self):
+        trafficRecorder = self.trafficRecorder
+        self.trafficRecorder = None
+        
+        if trafficRecorder is not None:
+            trafficRecorder.Close()
+            print ("Recorded " + str(trafficRecorder.GetStatistics()))
+        
+        return
+    
+    def AddLiveDataListener(self, listener):
+        self.liveDataListeners = self.liveDataListeners + [listener]
+        return
+    
+    def RemoveLiveDataListener(self, listener):
+        self.liveDataListeners = [l for l in self.liveDataListeners if l is not listener]
+        return
+    
+    def _NotifyLiveData(self, packet, receiveTime):
+        # the listeners see every live data frame, they must not block
+        for listener in self.liveDataListeners:
+            try:
+                listener(packet, receiveTime)
+            except Exception as e:
+                print ("Exception for live data listener: " + str(e))
+        
+        return
+    
+    def _RecordFrame(self, direction, frame):
+        # data is recorded as given to SendData, received data frame by frame
+        trafficRecorder = self.trafficRecorder
+        if trafficRecorder is not None:
+            trafficRecorder.Record(direction, frame)
         return
     
     def SetStatus(self, status):
@@ -142,131 +272,229 @@ class NetworkInterface:
         return self.interfaceStatus == "connected"
     
     def _RecvThreadFunction(self):
-        # some variables
-        bytesToRead = 0
-        counter = 0
+        # all frames are received into one preallocated buffer
+        receiveBuffer = ReceiveBuffer()
         
         # main loop
         while self.runThreads:
-            # read in 16 bytes as header
-            bytesToRead = 8
-            header = bytearray()
-            payload = bytearray()
-            counter += 1
-            #print ("Recv thread loop: " + str(counter))
-            
             try:
-                #print ("Reading in header")
-                header = self._RecvBytes(bytesToRead)
-                #print ("Header read in")
+                received = receiveBuffer.RecvFrom(self.socket)
+            except socket.timeout:
+                received = None
             except Exception as e:
-                print ("Exception for reading in header: " + str(e))
-                header = None
+                print ("Exception for receiving data: " + str(e))
+                break
             
-            #print (header)
+            if received is None:
+                continue
             
-            # reset timeout counter
-            self.timeoutLock.acquire()
-            self.timeoutCounter = 0
-            self.timeoutLock.release()
+            # an empty read means the server closed the connection
+            if received == 0:
+                if self.runThreads:
+                    print ("Connection closed by server")
+                break
             
-            if header:
-                # process the header and get the number of bytes to be read as payload
-                payloadLength = self._GetPacketLength(header) - 8
-                #print (payloadLength)
+            # every incoming data shows the server is alive
+            self.livenessMonitor.OnDataReceived()
             
-                try:
-                    #print ("Reading in payload")
-                    payload = self._RecvBytes(payloadLength)
-                    #print ("Payload read in")
-                except Exception as e:
-                    print ("Exception for reading in payload: " + str(e))
-                    payload = None
-                
-                #print (payload)
-                
-                if not payload:
-                    continue
-                
-                #print ("Forwarding packet")
-                # send header and payload to device
-                self._ForwardPacketData(header, payload)
-                #print ("Packet forwarded")
-                #print ("Entering next recv loop")
+            # forward every frame completed by this read
+            for frame in receiveBuffer.GetFrames():
+                self._ForwardPacketData(frame)
         
         print ("Recv function left")
+        
+        # report corrupt data of the connection
+        if receiveBuffer.resyncs:
+            print ("Receive stream resynchronized: " + str(receiveBuffer.GetStatistics()))
+        
         # loop breaks
         self.runThreads = False
         
-        self.Disconnect()
+        self._OnLinkLost()
         
         return
     
     def _PeriodicThreadFunction(self):
-        # periodic thread sends isAlive packet every 1 s
+        # periodic thread sends an isAlive probe every interval and checks the
+        # deadline of the server link
+        nextProbe = time.monotonic()
+        
         while self.runThreads:
-            # set timeout counter
-            self.timeoutLock.acquire()
-            self.timeoutCounter = 1
-            self.timeoutLock.release()
+            now = time.monotonic()
             
-            # send packet
-            self._SendIsAlivePacket()
+            # no data within the deadline means the connection was interrupted
+            if self.livenessMonitor.IsExpired(now):
+                print ("Server connection timed out")
+                self.runThreads = False
+                break
             
-            # wait 1 s
-            time.sleep(2)
+            # send probe, the deadlines don't drift with the send time
+            if now >= nextProbe:
+                self._SendIsAlivePacket()
+                nextProbe += self.livenessMonitor.interval
+                if nextProbe < now:
+                    nextProbe = now + self.livenessMonitor.interval
             
-            # check if the timeout signal was reset
-            if self.timeoutCounter != 0:
-                self.runThreads = False
+            # sleep until the next probe or the deadline, Disconnect wakes up
+            # the thread at once
+            wakeUp = min(nextProbe, self.livenessMonitor.GetDeadline())
+            self.stopEvent.wait(max(0, wakeUp - time.monotonic()))
         
         # when this function breaks, server connection was interrrupted
-        self.Disconnect()
+        self._OnLinkLost()
         
         return
     
-    def _RecvBytes(self, length):
-        # receive a certain length of bytes
-        recvData = bytearray()
-        while length > 0:
-            try:
-                data = self.socket.recv(length)
-            except:
-                raise ConnectionError
-                
-            length -= len(data)
-            recvData += data
+    def _OnSendError(self, e):
+        # called by the send scheduler, the connection cannot be used anymore
+        print ("Exception for sending data: " + str(e))
+        self._OnLinkLost()
+        return
+    
+    def _OnLinkLost(self):
+        # called when the connection was interrupted, only the first caller
+        # handles it
+        with self.statusLock:
+            if self.interfaceStatus != "connected":
+                return
+            
+            self.interfaceStatus = "reconnecting" if self.autoReconnect else "not connected"
+        
+        self.editor.tkBridge.Post(self.editor.ChangedNetworkStatus)
         
-        return recvData
+        self._Close()
+        
+        # a Disconnect meanwhile has cancelled reconnecting
+        with self.statusLock:
+            if self.interfaceStatus == "reconnecting":
+                self._StartReconnect()
+        
+        return
     
-    def _GetPacketLength(self, header : bytearray) -> int:
-        # stuff header into header class and get data
-        type, device, id, length, connection = Header.ParseBytes(header)
+    def _OnReconnected(self):
+        # the link is only restored, if nobody disconnected meanwhile
+        with self.statusLock:
+            if self.interfaceStatus != "reconnecting":
+                return False
+            
+            self.interfaceStatus = "connected"
+        
+        # restore subscriptions and check the grid on the Tk loop
+        self.editor.tkBridge.Post(self.editor.ChangedNetworkStatus)
+        self.editor.tkBridge.Post(self.editor.ServerReconnected)
         
-        return length
+        return True
     
-    def _ForwardPacketData(self, header, payload):
-        # process header
-        packet = PacketParser.GetPacketFromBytes(header + payload)
+    def _CancelReconnect(self):
+        # stop reconnecting, e.g. when the user disconnects
+        with self.statusLock:
+            reconnecting = self.interfaceStatus == "reconnecting"
+        
+        if reconnecting:
+            self._StopReconnect()
+            self.SetStatus("not connected")
+        
+        return
+    
+    def _GetReconnectDelays(self):
+        # exponential backoff between the attempts
+        delay = self.reconnectDelay
+        while True:
+            yield delay
+            delay = min(delay * 2, self.reconnectMaxDelay)
+    
+    def _StartReconnect(self):
+        # try to connect again in the background, the thread must not keep
+        # the editor from exiting
+        self.reconnectEvent.clear()
+        self.reconnectTask = threading.Thread(target=self._ReconnectThreadFunction, daemon=True)
+        self.reconnectTask.start()
+        return
+    
+    def _StopReconnect(self):
+        # the reconnect thread ends after its current attempt
+        self.reconnectEvent.set()
+        self.reconnectTask = None
+        return
+    
+    def _ReconnectThreadFunction(self):
+        for delay in self._GetReconnectDelays():
+            # stopping wakes the thread at once
+            if self.reconnectEvent.wait(delay):
+                break
+            
+            with self.openLock:
+                if self.reconnectEvent.is_set():
+                    break
+                
+                if not self._Open():
+                    continue
+                
+                # close the connection again, if the user disconnected during
+                # the attempt
+                if self._OnReconnected():
+                    print ("Reconnected to server")
+                else:
+                    self._Close()
+            
+            break
+        
+        return
+    
+    def _ForwardPacketData(self, frame):
+        # live data is timestamped on arrival, not when it is handled
+        receiveTime = time.monotonic()
+        
+        self._RecordFrame(CaptureDirection.RECEIVED, frame)
+        
+        # parse the frame straight from the receive buffer
+        packet = PacketParser.GetPacketFromBytes(frame)
         #print (packet)
         
         # check type
         if isinstance(packet, IsAlivePacket):
-            # TODO
-            #print ("Incoming IsAlive packet")
+            # respond to a probe, measure the round trip time
+            self.livenessMonitor.OnIsAlive(packet.payload)
+        elif isinstance(packet, UnknownPacket):
+            # counted by the packet registry, nobody handles these
             pass
         else:
-            # send packets for grid file to class
-            if packet.header.deviceType == DeviceType.GRID:
-                self.gridFile.NewPacket(packet)
-            else:
-                self.editor.NewPacket(packet)
+            if packet.header.packetType == PacketType.DEVICEDATA:
+                self._NotifyLiveData(packet, receiveTime)
+            
+            # the handlers run on the dispatch thread
+            self.packetDispatcher.Put(packet)
                 
         return
     
+    def ReplayFrame(self, frame):
+        # handle a frame of a capture. Replayed frames are not recorded, don't
+        # reach the liveness monitor and are never coalesced, the handlers
+        # run on the calling thread for every frame.
+        receiveTime = time.monotonic()
+        packet = PacketParser.GetPacketFromBytes(frame)
+        
+        if not isinstance(packet, (IsAlivePacket, UnknownPacket)):
+            if packet.header.packetType == PacketType.DEVICEDATA:
+                self._NotifyLiveData(packet, receiveTime)
+            
+            self._HandlePacket(packet)
+        
+        return
+    
+    def _HandlePacket(self, packet):
+        # called on the dispatch thread
+        # send packets for grid file to class
+        if packet.header.deviceType == DeviceType.GRID:
+            self.gridFile.NewPacket(packet)
+        else:
+            self.editor.NewPacket(packet)
+        
+        return
+    
     def _SendIsAlivePacket(self):
-        # send out data
-        self.SendData(IsAlivePacket.FromConfig().GetBytes())
+        # send out a probe with a sequence number
+        self.SendData(self.livenessMonitor.CreateProbe().GetBytes(), SendPriority.KEEPALIVE)
         
         return
     
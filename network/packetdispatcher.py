@@ -0,0 +1,148 @@
+import threading
+from collections import deque
+
+from network.headers.header import PacketType
+
+class DispatchQueue:
+    # bounded queue between the receiving thread and the packet handlers.
+    # Live data waits in one slot per device, a newer frame replaces the
+    # waiting one and keeps its place. All other packets are never dropped
+    # and handled before the live data.
+    def __init__(self, maxLiveData = 1024):
+        # all access is guarded by the condition
+        self.condition = threading.Condition()
+
+        # packets in the order of arrival, live data by (deviceType, deviceId)
+        # with the keys in the order of arrival
+        self.packets = deque()
+        self.liveData = {}
+        self.liveDataKeys = deque()
+        self.closed = False
+
+        # live data of more devices is dropped
+        self.maxLiveData = maxLiveData
+
+        # statistics
+        self.dispatchedPackets = 0
+        self.replacedLiveData = 0
+        self.droppedLiveData = 0
+        self.maxDepth = 0
+
+    def Put(self, packet) -> bool:
+        # queue a packet, False if live data was dropped or the queue is closed
+        header = packet.header
+
+        with self.condition:
+            if self.closed:
+                return False
+
+            if header.packetType == PacketType.DEVICEDATA:
+                key = (header.deviceType, header.deviceId)
+
+                # only the latest live data of a device is of interest
+                if key in self.liveData:
+                    self.liveData[key] = packet
+                    self.replacedLiveData += 1
+                    return True
+
+                if len(self.liveDataKeys) >= self.maxLiveData:
+                    self.droppedLiveData += 1
+                    return False
+
+                self.liveData[key] = packet
+                self.liveDataKeys.append(key)
+            else:
+                # responds are queued in any case, the reading thread must not
+                # wait for the handlers
+                self.packets.append(packet)
+
+            self.maxDepth = max(self.maxDepth, len(self.packets) + len(self.liveDataKeys))
+            self.condition.notify()
+
+        return True
+
+    def Get(self, timeout = None):
+        # next packet, responds before live data. None if nothing arrived
+        # within the timeout or the queue was closed.
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.closed or self.packets or self.liveDataKeys, timeout):
+                return None
+
+            if self.closed:
+                return None
+
+            if self.packets:
+                packet = self.packets.popleft()
+            else:
+                packet = self.liveData.pop(self.liveDataKeys.popleft())
+
+            self.dispatchedPackets += 1
+
+        return packet
+
+    def Close(self):
+        # drop all packets and wake up the waiting thread
+        with self.condition:
+            self.closed = True
+            self.packets.clear()
+            self.liveData.clear()
+            self.liveDataKeys.clear()
+            self.condition.notify_all()
+        return
+
+    def GetStatistics(self) -> dict:
+        # counters of the queue
+        with self.condition:
+            return {
+                "pending"    : len(self.packets) + len(self.liveDataKeys),
+                "dispatched" : self.dispatchedPackets,
+                "replaced"   : self.replacedLiveData,
+                "dropped"    : self.droppedLiveData,
+                "maxDepth"   : self.maxDepth}
+
+class PacketDispatcher:
+    # runs the packet handlers on a thread of its own, so a slow handler
+    # doesn't stall reading the socket
+    def __init__(self, handler, dispatchQueue = None):
+        self.handler = handler
+        self.queue = dispatchQueue if dispatchQueue is not None else DispatchQueue()
+
+        self.thread = threading.Thread(target=self._DispatchThreadFunction, name="packet dispatcher", daemon=True)
+        self.thread.start()
+
+    def Put(self, packet) -> bool:
+        return self.queue.Put(packet)
+
+    def Stop(self):
+        # pending packets are dropped
+        self.queue.Close()
+
+        if threading.current_thread() is not self.thread:
+            self.thread.join()
+
+        return
+
+    def GetStatistics(self) -> dict:
+        return self.queue.GetStatistics()
+
+    def GetStatusText(self) -> str:
+        # short description of skipped and dropped live data, empty if there
+        # was nothing to skip
+        statistics = self.GetStatistics()
+        if not statistics["replaced"] and not statistics["dropped"]:
+            return ""
+
+        return "live data skipped: {} | dropped: {}".format(statistics["replaced"], statistics["dropped"])
+
+    def _DispatchThreadFunction(self):
+        while True:
+            packet = self.queue.Get()
+            if packet is None:
+                break
+
+            try:
+                self.handler(packet)
+            except Exception as e:
+                print ("Exception for handling packet: " + str(e))
+
+        return
\ No newline at end of file
@@ -1,90 +1,221 @@
+import heapq
+import itertools
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, CancelledError, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+class TransferHandle(Future):
+    # future of one transfer, the result is the respond packet or a list of
+    # packets for multiple transfers
+    def __init__(self, id : int, deadline : float, multiple = False, expectedPackets = None):
+        super().__init__()
+        
+        self.id = id
+        self.deadline = deadline
+        
+        # only used by multiple transfers
+        self.multiple = multiple
+        self.expectedPackets = expectedPackets
+        self.packets = []
 
 class PacketDistributor:
-    def __init__(self, name = ""):
-        # dictionary for ongoing transfers
-        self.transferLockDict = dict()
-        self.transferDataDict = dict()
+    # number of finished transfer ids remembered for detecting late responses
+    expiredIdsLength = 256
+    
+    def __init__(self, name = "", timeout = 1):
+        # in-flight table, all access is guarded by the lock
+        self.lock = threading.Lock()
+        self.transfers = dict()
+        
+        # deadlines of all transfers ordered by time
+        self.deadlineHeap = []
+        self.deadlineCounter = itertools.count()
         
-        self.multipleTransferLockDict = dict()
-        self.multipleTransferDataDict = dict()
+        # ids of timed out or cancelled transfers
+        self.expiredIds = OrderedDict()
+        
+        # statistics
+        self.completedTransfers = 0
+        self.timedOutTransfers = 0
+        self.cancelledTransfers = 0
+        self.lateResponses = 0
+        self.unknownResponses = 0
         
         self.name = name
+        self.timeout = timeout
     
-    def RegisterTransfer(self, id : int):
-        # return False if id is already in dict
-        if id in self.transferLockDict:
-            return False
-        
-        # create condition varaible and store
-        self.transferLockDict[id] = threading.Condition(threading.Lock())
+    def RegisterTransfer(self, id : int, timeout = None) -> TransferHandle:
+        # register a transfer with a single respond
+        return self._Register(id, timeout, False, None)
+    
+    def RegisterMultipleTransfers(self, id : int, packets = None, timeout = None) -> TransferHandle:
+        # register a transfer with several responds, the number of packets may
+        # also be given when waiting
+        return self._Register(id, timeout, True, packets)
+    
+    def WaitForTransferComplete(self, handle : TransferHandle):
+        # wait for the transfer to get a respond, None if it timed out
+        try:
+            return handle.result(timeout = max(0, handle.deadline - time.monotonic()))
+        except (TimeoutError, FutureTimeoutError):
+            self._Expire(handle)
+        except CancelledError:
+            pass
         
-        return
+        return None
     
-    def RegisterMultipleTransfers(self, id : int):
-        # return False if id is already in dict
-        if id in self.multipleTransferLockDict:
-            return False
+    def WaitForMultipleTransfersComplete(self, handle : TransferHandle, packets : int):
+        # set number of packets, the transfer might already be complete
+        with self.lock:
+            handle.expectedPackets = packets
+            complete = len(handle.packets) >= packets
         
-        # create condition varaible and store
-        self.multipleTransferLockDict[id] = threading.Condition(threading.Lock())
+        if complete:
+            self._Complete(handle, handle.packets)
         
+        # only return number fo available packets
+        self.WaitForTransferComplete(handle)
+        return list(handle.packets)
+    
+    def Cancel(self, handle : TransferHandle):
+        # cancel a transfer, a respond arriving later is counted as late
+        handle.cancel()
         return
     
-    def WaitForTransferComplete(self, id : int):
-        # wait for the transaction to get a respond
-        with self.transferLockDict[id]:
-            self.transferLockDict[id].wait_for(lambda: self.IsDataAvailable(id), timeout = 1)
+    def NewPacketData(self, id : int, data):
+        complete = False
+        late = False
+        
+        # get the transfer belonging to the id
+        with self.lock:
+            handle = self.transfers.get(id, None)
+            
+            if handle is None:
+                late = id in self.expiredIds
+                if late:
+                    self.lateResponses += 1
+                else:
+                    self.unknownResponses += 1
+            elif not handle.multiple:
+                complete = True
+            else:
+                # collect data of a multiple transfer
+                handle.packets.append(data)
+                data = handle.packets
+                if handle.expectedPackets is not None:
+                    complete = len(handle.packets) >= handle.expectedPackets
+        
+        if handle is None:
+            if late:
+                print (self.name + ": Late respond for expired transfer, ID = " + str(id))
+            else:
+                print (self.name + ": Data incoming without transfer, ID = " + str(id))
+        elif complete:
+            self._Complete(handle, data)
         
-        # remove lock from dictionary
-        self.transferLockDict.pop(id, None)
+        # the receive thread also takes care of transfers without a waiter
+        self.ExpireTransfers()
         
-        # return data
-        return self.transferDataDict.pop(id, None)
+        return
     
-    def WaitForMultipleTransfersComplete(self, id : int, packets : int):
-        # setup transaction data
-        self.multipleTransferDataDict[id] = []
+    def ExpireTransfers(self):
+        # time out all transfers whose deadline passed
+        now = time.monotonic()
+        expired = []
         
-        # wait for multiple transactions to get a respond
-        with self.multipleTransferLockDict[id]:
-            self.multipleTransferLockDict[id].wait_for(lambda: self.IsMultipleDataAvialable(id, packets), timeout = 1)
+        with self.lock:
+            while self.deadlineHeap and self.deadlineHeap[0][0] <= now:
+                _, _, handle = heapq.heappop(self.deadlineHeap)
+                if not handle.done():
+                    expired.append(handle)
         
-        # remove lock from dictionary
-        self.multipleTransferLockDict.pop(id, None)
+        for handle in expired:
+            self._Expire(handle)
         
-        # only return number fo available packets
-        return self.multipleTransferDataDict.pop(id, None)
+        return len(expired)
     
-    def NewPacketData(self, id : int, data : bytearray):
-        # check if id is registered
-        if not id in self.transferLockDict:
-            if not id in self.multipleTransferLockDict:
-                print (self.name + ": Data incoming without transfer, ID = " + str(id))
-                return
-            else:
-                # store data in multiple data dict
-                self.multipleTransferDataDict[id].append(data)
-                with self.multipleTransferLockDict[id]:
-                    self.multipleTransferLockDict[id].notify_all()
-        else:
-            # store data
-            self.transferDataDict[id] = data
+    def GetNextDeadline(self):
+        # earliest deadline of all transfers in flight
+        with self.lock:
+            if self.deadlineHeap:
+                return self.deadlineHeap[0][0]
+        return None
+    
+    def GetTransfersInFlight(self) -> int:
+        # number of registered transfers without a respond
+        with self.lock:
+            return len(self.transfers)
+    
+    def GetStatistics(self) -> dict:
+        # counters of this distributor
+        with self.lock:
+            return {
+                "inFlight"  : len(self.transfers),
+                "completed" : self.completedTransfers,
+                "timedOut"  : self.timedOutTransfers,
+                "cancelled" : self.cancelledTransfers,
+                "late"      : self.lateResponses,
+                "unknown"   : self.unknownResponses}
+    
+    def _Register(self, id : int, timeout, multiple, expectedPackets) -> TransferHandle:
+        # create a handle and put it into the in-flight table
+        if timeout is None:
+            timeout = self.timeout
+        
+        with self.lock:
+            # a transfer with the same id is still running, reuse it
+            handle = self.transfers.get(id, None)
+            if handle is not None:
+                return handle
             
-            with self.transferLockDict[id]:
-                self.transferLockDict[id].notify_all()
+            handle = TransferHandle(id, time.monotonic() + timeout, multiple, expectedPackets)
+            self.transfers[id] = handle
+            self.expiredIds.pop(id, None)
+            heapq.heappush(self.deadlineHeap, (handle.deadline, next(self.deadlineCounter), handle))
         
+        # remove the handle from the table, however it is finished
+        handle.add_done_callback(self._OnTransferDone)
+        
+        return handle
+    
+    def _Complete(self, handle : TransferHandle, result):
+        # set the result, the transfer might have been cancelled meanwhile
+        try:
+            handle.set_result(result)
+        except InvalidStateError:
+            # count the respond as late, if the transfer did not succeed
+            if handle.cancelled() or handle.exception() is not None:
+                with self.lock:
+                    self.lateResponses += 1
         return
     
-    def IsDataAvailable(self, id : int):
-        # check if data is available
-        if id in self.transferDataDict:
-            return True
-        return False
+    def _Expire(self, handle : TransferHandle):
+        # time out a transfer
+        try:
+            handle.set_exception(TimeoutError("Transfer " + str(handle.id) + " timed out"))
+        except InvalidStateError:
+            pass
+        return
     
-    def IsMultipleDataAvialable(self, id : int, packets : int):
-        # check if data is available and length matches
-        if id in self.multipleTransferLockDict:
-            if len(self.multipleTransferDataDict[id]) == packets:
-                return True
-        return False
\ No newline at end of file
+    def _OnTransferDone(self, handle : TransferHandle):
+        # remove finished transfer from in-flight table and update statistics
+        with self.lock:
+            if self.transfers.get(handle.id, None) is handle:
+                self.transfers.pop(handle.id)
+            
+            if handle.cancelled():
+                self.cancelledTransfers += 1
+            elif handle.exception() is not None:
+                self.timedOutTransfers += 1
+            else:
+                self.completedTransfers += 1
+                return
+            
+            # remember id to detect late responses
+            self.expiredIds[handle.id] = None
+            if len(self.expiredIds) > PacketDistributor.expiredIdsLength:
+                self.expiredIds.popitem(last = False)
+        
+        return
\ No newline at end of file
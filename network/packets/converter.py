@@ -37,9 +37,7 @@ class ConverterUpdateDataPacket(Packet):
     
     def GetBytes(self) -> bytearray:
         # return the bytes of the packet
-        packetBytes = self.header.GetBytes() + self.payload.GetBytes()
-        
-        return self.AddPadding(packetBytes)
+        return self.PackSegments()
     
     @classmethod
     def FromConfig(cls, deviceId, mode, data : list[int]) -> tuple[int, ConverterUpdateDataPacket]:
@@ -134,17 +134,15 @@ class GridConfigPacket(Packet):
             bytearray: Binary representation of header and payload (in
                 that order).
         """
-        headerBytes = self.header.GetBytes()
-        payloadBytesList = []
+        size = (self.header.GetTotalSize() +
+            GridElementConfig.maxTotalSize * len(self.payload))
+        packetBytes = bytearray(Packet.GetPaddedSize(size))
 
+        # write header and all GridElementConfigs into one buffer
+        offset = self.header.PackInto(packetBytes, 0)
         for payload in self.payload:
-            payloadBytesList.append(
-                payload.GetBytes()
-            )
-        # merge bytearrays of single GridElementConfigs into one bytearray
-        payloadBytes = b''.join(payloadBytesList)
-        unpadded =headerBytes + payloadBytes
-        return self.AddPadding(unpadded)
+            offset = payload.PackInto(packetBytes, offset)
+        return packetBytes
 
     @classmethod
     def FromConfig(cls, gridElements : list[GridElementConfig],
@@ -59,6 +59,36 @@ class Packet:
             return unpaddedBinaryPacket + zeroPadding
         return unpaddedBinaryPacket
 
+    @staticmethod
+    def GetPaddedSize(size : int) -> int:
+        """Number of bytes of a packet with the given size after padding.
+
+        Args:
+            size (int): Number of bytes of header and payload.
+
+        Returns:
+            The next multiple of 16, which is not smaller than size.
+        """
+        return ceil(size / 16) * 16
+
+    def PackSegments(self) -> bytearray:
+        """Packs header and payload into one preallocated buffer.
+
+        The buffer is allocated with the padded size, so no bytes have to
+        be concatenated or appended afterwards. Header and payload write
+        their fields with PackInto.
+
+        Return:
+            bytearray: Binary representation of header and payload (in
+                that order) including the padding.
+        """
+        size = self.header.GetTotalSize() + self.payload.GetTotalSize()
+        packetBytes = bytearray(Packet.GetPaddedSize(size))
+
+        offset = self.header.PackInto(packetBytes, 0)
+        self.payload.PackInto(packetBytes, offset)
+        return packetBytes
+
     def GetBytes(self) -> bytearray:
         """Gives the binary representation of the entire packet.
 
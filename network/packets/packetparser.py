@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from network.headers.header import PacketType, DeviceType
-from network.headers.headerparser import HeaderParser
+from network.headers.header import Header, PacketType, DeviceType
+from network.headers.commandrespond import CommandRespondHeader
+from network.headers.devicedata import DeviceDataHeader
 from network.headers.gridcommand import GridCommand
 from network.headers.gridrespond import *
 from network.headers.serverrespond import *
 
+from network.packetsegment import TrustedDecode
 from network.packets.packet import Packet
 from network.packets.gridconfig import GridConfigPacket
 from network.packets.isalive import IsAlivePacket
@@ -17,6 +19,8 @@ from network.packets.serverrespond import ServerStatusPacket
 from network.packets.fenswitchgearrespond import *
 from network.packets.converterrespond import *
 from network.packets.scibreakbreakerrespond import *
+from network.packets.packetregistry import PacketDecoder, PacketRegistry
+from network.packets.unknown import UnknownPacket
 
 from network.payloads.isalive import IsAlivePayload
 from network.payloads.error import ErrorPayload
@@ -29,93 +33,76 @@ from network.payloads.fenswitchgearrespond import *
 from network.payloads.converterrespond import *
 from network.payloads.scibreakbreakerrespond import *
 
+class GridGetConfigRespondDecoder(PacketDecoder):
+    # the number of grid elements in the payload is part of the header
+    def GetPayload(self, header : GridCommandGetFileHeader, payloadBytes : bytearray):
+        return self.payloadClass.GetPayloadFromBytes(payloadBytes, header.numberGridElements)
+
 class PacketParser:
     """Collection of methods to retrieve an entire packet from binary data.
     
+    The decoder of a packet is selected with the PacketRegistry. The
+    decoders of all packets the editor receives are registered below.
+    
     Typical usage:
 
     parsedPacket = PacketParser.GetPacketFromBytes(packetBytes)
-
-    TODO:
-    - implement device data packet
     """
 
     @staticmethod
     def GetPacketFromBytes(packetBytes: bytearray) -> Packet:
-        (header, lastRead) = HeaderParser.GetHeaderFromBytes(packetBytes)
         """Retrieves a packet from binary data.
         
+        The segments are created inside a TrustedDecode block, so they are
+        not packed again for validation.
+        
         Args:
             packetBytes (bytearray): Entire binary data representing a single
                 packet.
         
         Returns:
-            A Packet (or a derived class) based on the binary data.
+            A Packet (or a derived class) based on the binary data. Packets
+            without a registered decoder are returned as UnknownPacket and
+            counted by the PacketRegistry.
         
         Raises:
             IndexError: The number of bytes is insufficient for the anticipated
                 packet.
         """
-        payloadBytes = packetBytes[lastRead:]
-        
-        if header.packetType == PacketType.ISALIVE:
-            payload = IsAlivePayload.GetPayloadFromBytes(payloadBytes)
-            return IsAlivePacket(header, payload)
+        decoder = PacketRegistry.GetDecoder(packetBytes)
         
-        elif header.packetType == PacketType.ERROR:
-            payload = ErrorPayload.GetPayloadFromBytes(payloadBytes)
-            return ErrorPacket(header, payload)
+        if decoder is None:
+            # keep a copy, the bytes might be reused by the receive buffer
+            header = Header.GetSegmentFromBytes(packetBytes)
+            return UnknownPacket(header, bytes(packetBytes[Header.totalSize:]))
         
-        elif header.packetType == PacketType.DEVICEDATA:
-            # this returns packets containing live data from devices
-            if header.deviceType == DeviceType.FENSWITCHGEAR:
-                # create a new payload for the FEN switchgear device data
-                payload = FENSwitchgearLiveDataPayload.GetPayloadFromBytes(payloadBytes)
-                return FENSwitchgearLiveDataPacket(header, payload)
-            
-            elif header.deviceType == DeviceType.CONVERTER:
-                # create a new payload for the converter device data
-                payload = ConverterLiveDataPayload.GetPayloadFromBytes(payloadBytes)
-                return ConverterLiveDataPacket(header, payload)
-            
-            elif header.deviceType == DeviceType.SCIBREAKBREAKER:
-                # create a new payload for the SciBreak breaker device data
-                payload = SciBreakBreakerLiveDataPayload.GetPayloadFromBytes(payloadBytes)
-                return SciBreakBreakerLiveDataPacket(header, payload)
-            
-            print ("Unknown live data packet type")
-            
-            return None
-        
-        elif header.packetType == PacketType.RESPOND:
-            # grid gets either a pure respond packet OR a GET_CONFIG_DATA
-            if header.deviceType == DeviceType.GRID:
-                if header.result == GridRespond.GET_CONFIG_DATA:
-                    # create a grid data respond packet
-                    payload = GridGetConfigRespondPayload.GetPayloadFromBytes(payloadBytes, header.numberGridElements)
-                    return GridGetConfigRespondPacket(header, payload)
-                elif header.result == GridRespond.GET_CONFIG_LENGTH:
-                    # create a grid config length respond packet
-                    payload = GridGetLengthRespondPayload.GetPayloadFromBytes(payloadBytes)
-                    return GridConfigSizeRespondPacket(header, payload)
-                else:
-                    # create a generic respond packet
-                    return GenericRespondPacket(header)
-            # server get either a pure respond packet OR a STATUS_DATA
-            elif header.deviceType == DeviceType.SERVER:
-                if header.result == ServerRespond.STATUS_DATA:
-                    # create a server status data packet
-                    payload = ServerStatusPayload.GetPayloadFromBytes(payloadBytes)
-                    return ServerStatusPacket(header, payload)
-                else:
-                    # create a generic repond packet
-                    return GenericRespondPacket(header)
-            
-            elif header.deviceType == DeviceType.FENSWITCHGEAR:
-                return GenericRespondPacket(header)
-            
-            elif header.deviceType == DeviceType.CONVERTER:
-                return GenericRespondPacket(header)
-            
-            elif header.deviceType == DeviceType.SCIBREAKBREAKER:
-                return GenericRespondPacket(header)
\ No newline at end of file
+        with TrustedDecode():
+            return decoder.Decode(packetBytes)
+
+# packets without a device
+PacketRegistry.Register(PacketType.ISALIVE, None, None,
+    PacketDecoder(Header, IsAlivePacket, IsAlivePayload))
+PacketRegistry.Register(PacketType.ERROR, None, None,
+    PacketDecoder(Header, ErrorPacket, ErrorPayload))
+
+# live data from devices
+PacketRegistry.Register(PacketType.DEVICEDATA, DeviceType.FENSWITCHGEAR, None,
+    PacketDecoder(DeviceDataHeader, FENSwitchgearLiveDataPacket, FENSwitchgearLiveDataPayload))
+PacketRegistry.Register(PacketType.DEVICEDATA, DeviceType.CONVERTER, None,
+    PacketDecoder(DeviceDataHeader, ConverterLiveDataPacket, ConverterLiveDataPayload))
+PacketRegistry.Register(PacketType.DEVICEDATA, DeviceType.SCIBREAKBREAKER, None,
+    PacketDecoder(DeviceDataHeader, SciBreakBreakerLiveDataPacket, SciBreakBreakerLiveDataPayload))
+
+# responds with a payload
+PacketRegistry.Register(PacketType.RESPOND, DeviceType.GRID, GridRespond.GET_CONFIG_DATA,
+    GridGetConfigRespondDecoder(GridCommandGetFileHeader, GridGetConfigRespondPacket, GridGetConfigRespondPayload))
+PacketRegistry.Register(PacketType.RESPOND, DeviceType.GRID, GridRespond.GET_CONFIG_LENGTH,
+    PacketDecoder(CommandRespondHeader, GridConfigSizeRespondPacket, GridGetLengthRespondPayload))
+PacketRegistry.Register(PacketType.RESPOND, DeviceType.SERVER, ServerRespond.STATUS_DATA,
+    PacketDecoder(CommandRespondHeader, ServerStatusPacket, ServerStatusPayload))
+
+# all other responds only consist of the header
+for deviceType in (DeviceType.GRID, DeviceType.SERVER, DeviceType.FENSWITCHGEAR,
+    DeviceType.CONVERTER, DeviceType.SCIBREAKBREAKER):
+    PacketRegistry.Register(PacketType.RESPOND, deviceType, None,
+        PacketDecoder(CommandRespondHeader, GenericRespondPacket))
\ No newline at end of file
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from collections import Counter
+import struct
+
+from network.packetsegment import PacketSegment
+from network.headers.header import Header, DeviceType
+from network.packets.packet import Packet
+
+class PacketDecoder:
+    """Creates a packet of one kind from binary data.
+
+    Attributes:
+        headerClass (type): Header (or a derived class) of the packet.
+        packetClass (type): Packet (or a derived class), which is created.
+        payloadClass (type): Payload providing GetPayloadFromBytes or None
+            for packets without a payload.
+    """
+    def __init__(self, headerClass : type, packetClass : type,
+        payloadClass : type = None) -> None:
+        self.headerClass = headerClass
+        self.packetClass = packetClass
+        self.payloadClass = payloadClass
+
+    def Decode(self, packetBytes : bytearray) -> Packet:
+        """Creates the header, the payload and the packet.
+
+        Args:
+            packetBytes (bytearray): Entire binary data of a single packet.
+
+        Returns:
+            A packet of packetClass.
+
+        Raises:
+            IndexError: The number of bytes is insufficient for the packet.
+        """
+        header = self.headerClass.GetSegmentFromBytes(packetBytes)
+
+        if self.payloadClass is None:
+            return self.packetClass(header)
+
+        # view on the payload, the bytes are not copied
+        payloadBytes = memoryview(packetBytes)[self.headerClass.totalSize:]
+        return self.packetClass(header, self.GetPayload(header, payloadBytes))
+
+    def GetPayload(self, header : Header, payloadBytes : bytearray):
+        """Creates the payload from the binary data following the header.
+        Derived decoders may use the header for parsing the payload.
+        """
+        return self.payloadClass.GetPayloadFromBytes(payloadBytes)
+
+class PacketRegistry:
+    """Table of the decoders of all packets, which can be received.
+
+    Each decoder is registered for a (packetType, deviceType, result) key,
+    so the decoder of a packet is selected by a dictionary lookup instead of
+    comparing the types one after another. result is only read for packet
+    types, which have at least one decoder with a result. A key with result
+    None is used for all other results of that packetType and deviceType.
+
+    Typical usage:
+        PacketRegistry.Register(PacketType.DEVICEDATA, DeviceType.CONVERTER,
+            None, PacketDecoder(DeviceDataHeader, ConverterLiveDataPacket,
+            ConverterLiveDataPayload))
+
+        decoder = PacketRegistry.GetDecoder(packetBytes)
+
+    Attributes:
+        decoders (dict): (packetType, deviceType, result) -> PacketDecoder
+        resultPacketTypes (set): Packet types with decoders for results.
+        unknownPackets (Counter): Number of received packets without a
+            decoder for each (packetType, deviceType, result).
+    """
+    decoders = dict()
+    resultPacketTypes = set()
+    unknownPackets = Counter()
+
+    # packetType and deviceType of the header, result following the header
+    _typeStruct = struct.Struct(PacketSegment._byteOrder + "BB")
+    _resultStruct = struct.Struct(PacketSegment._byteOrder + "I")
+
+    @staticmethod
+    def Register(packetType : int, deviceType : int, result : int,
+        decoder : PacketDecoder) -> None:
+        """Registers a decoder.
+
+        Args:
+            packetType (int): PacketType of the packets.
+            deviceType (int): DeviceType of the packets or None for all
+                device types.
+            result (int): Result of the packets or None for all results,
+                which have no decoder of their own.
+            decoder (PacketDecoder): Decoder for these packets.
+        """
+        deviceTypes = DeviceType if deviceType is None else (deviceType, )
+
+        for d in deviceTypes:
+            PacketRegistry.decoders[(packetType, d, result)] = decoder
+
+        if result is not None:
+            PacketRegistry.resultPacketTypes.add(packetType)
+
+        return
+
+    @staticmethod
+    def GetKey(packetBytes : bytearray) -> tuple[int, int, int]:
+        """Retrieves the key of a packet from binary data.
+
+        Args:
+            packetBytes (bytearray): Entire binary data of a single packet.
+
+        Returns:
+            A tuple (packetType, deviceType, result). result is None, if the
+            packetType has no decoders for results.
+
+        Raises:
+            IndexError: The number of bytes is insufficient for a header.
+        """
+        if len(packetBytes) < Header.totalSize:
+            raise IndexError("Error: Too few bytes for a Header.")
+
+        (packetType, deviceType) = PacketRegistry._typeStruct.unpack_from(packetBytes)
+
+        result = None
+        if (packetType in PacketRegistry.resultPacketTypes and
+            len(packetBytes) >= Header.totalSize + PacketRegistry._resultStruct.size):
+            (result, ) = PacketRegistry._resultStruct.unpack_from(packetBytes, Header.totalSize)
+
+        return (packetType, deviceType, result)
+
+    @staticmethod
+    def GetDecoder(packetBytes : bytearray) -> PacketDecoder:
+        """Selects the decoder of a packet.
+
+        Args:
+            packetBytes (bytearray): Entire binary data of a single packet.
+
+        Returns:
+            The registered PacketDecoder or None, if there is no decoder for
+            the packet. Packets without a decoder are counted in
+            unknownPackets.
+
+        Raises:
+            IndexError: The number of bytes is insufficient for a header.
+        """
+        key = PacketRegistry.GetKey(packetBytes)
+        decoder = PacketRegistry.decoders.get(key, None)
+
+        if decoder is None and key[2] is not None:
+            # decoder for all other results
+            decoder = PacketRegistry.decoders.get((key[0], key[1], None), None)
+
+        if decoder is None:
+            PacketRegistry.unknownPackets[key] += 1
+
+        return decoder
+
+    @staticmethod
+    def GetStatistics() -> dict:
+        """
+        Returns:
+            A dict (packetType, deviceType, result) -> number of received
+            packets without a decoder.
+        """
+        return dict(PacketRegistry.unknownPackets)
\ No newline at end of file
@@ -12,9 +12,7 @@ class SciBreakBreakerSetTripLevelPacket(Packet):
         self.payload = payload
     
     def GetBytes(self):
-        packetBytes = self.header.GetBytes() + self.payload.GetBytes()
-        
-        return self.AddPadding(packetBytes)
+        return self.PackSegments()
     
     @classmethod
     def FromConfig(cls, deviceId, data : list[int]) -> tuple[int, SciBreakBreakerSetTripLevelPacket]:
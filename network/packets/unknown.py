@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from network.packets.packet import Packet
+from network.headers.header import Header
+
+class UnknownPacket(Packet):
+    """Packet with a combination of packetType, deviceType and result, for
+    which no decoder is registered.
+
+    Attributes:
+        header (Header): Header (not derived class) of the received packet.
+        payload (bytes): Copy of the binary data following the header.
+    """
+    def __init__(self, header: Header, payload : bytes) -> None:
+        """Creates an UnknownPacket based on an existing header and the
+        remaining binary data.
+
+        Args:
+            header (Header): Header (not derived class) of the received packet.
+            payload (bytes): Binary data following the header.
+        """
+        super().__init__(header, payload)
\ No newline at end of file
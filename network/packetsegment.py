@@ -1,19 +1,131 @@
 from dataclasses import *
+import operator
+import struct
+import threading
+
+class _DecodeState(threading.local):
+    # number of nested TrustedDecode blocks of the current thread
+    depth = 0
+
+_decodeState = _DecodeState()
+
+class TrustedDecode:
+    """Context manager for creating segments from received bytes.
+
+    Segments created inside the block skip the validation in __post_init__,
+    because their fields were just unpacked from bytes and are known to
+    match the format strings. Re-encoding them would only create bytes,
+    which are thrown away. The state is kept per thread, so commands built
+    by other threads at the same time are still validated.
+
+    Typical usage:
+        with TrustedDecode():
+            header = Header(*Header.ParseBytes(headerBytes))
+    """
+
+    def __enter__(self) -> "TrustedDecode":
+        _decodeState.depth += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback) -> bool:
+        _decodeState.depth -= 1
+        return False
+
+    @staticmethod
+    def IsActive() -> bool:
+        """
+        Returns:
+            True, if the current thread is inside a TrustedDecode block.
+        """
+        return _decodeState.depth > 0
 
 class PacketSegment:
 
     _byteOrder = "<"
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Compiles the format strings of a subclass once, when the class is
+        defined. The compiled structs are used for packing and unpacking
+        instead of passing the format strings to struct every time.
+
+        Attributes (set on the subclass):
+            _struct (struct.Struct): Compiled _typeFormatString
+            _fullStruct (struct.Struct): Compiled fullTypeFormatString
+            _fieldNames (tuple): Names of all fields in the order of the
+                dataclass, parents first.
+            _fieldGetter (operator.attrgetter): Returns the values of all
+                fields as a tuple with one call. For segments with a fixed
+                layout, these are the values for _fullStruct. Only set for
+                segments with more than one field.
+
+        Subclasses without their own format strings share the compiled
+        structs of their parent.
+        """
+        super().__init_subclass__(**kwargs)
+
+        if "_typeFormatString" in cls.__dict__:
+            cls._struct = struct.Struct(cls._typeFormatString)
+        if "fullTypeFormatString" in cls.__dict__:
+            cls._fullStruct = struct.Struct(cls.fullTypeFormatString)
+
+        # same order as the fields of the dataclass, a redefined field keeps
+        # the position of the parent. Only the annotations of the class itself
+        # are taken, not the inherited ones.
+        fieldNames = []
+        for base in reversed(cls.__mro__):
+            for name in base.__dict__.get("__annotations__", {}):
+                if name not in fieldNames:
+                    fieldNames.append(name)
+
+        cls._fieldNames = tuple(fieldNames)
+        if len(fieldNames) > 1:
+            cls._fieldGetter = operator.attrgetter(*fieldNames)
+
     def __post_init__(self) -> None:
         """
         Validate the field's data by creating a byte represensation. 
+        Segments created from received bytes inside a TrustedDecode block
+        are not validated.
 
         Errors:
             Raises struct.error, if the format string and the data don't
             matchup.
         """
+        if _decodeState.depth:
+            return
         self.GetBytes()
 
+    @classmethod
+    def GetSegmentFromBytes(cls, segmentBytes: bytearray,
+        offset: int = 0) -> "PacketSegment":
+        """Creates a segment from the binary data of all its fields.
+
+        All fields are unpacked with _fullStruct in one call and assigned
+        without calling __init__, so fields with init=False get the received
+        values as well. Like TrustedDecode, this is only meant for received
+        bytes, the segment is not validated.
+
+        Args:
+            segmentBytes (bytearray): Binary data of all fields. Only the
+                bytes from offset to offset + totalSize (exclusive) are
+                considered. Further bytes don't have an effect.
+            offset (int): Position of the first field.
+
+        Returns:
+            The segment (of the class this is called on).
+
+        Raises:
+            IndexError: Number of bytes is insufficient for the segment.
+        """
+        if len(segmentBytes) - offset < cls._fullStruct.size:
+            raise IndexError("Error: Too few bytes for a " + cls.__name__ + ".")
+
+        segment = cls.__new__(cls)
+        segment.__dict__.update(zip(cls._fieldNames,
+            cls._fullStruct.unpack_from(segmentBytes, offset)))
+        return segment
+
     def ParseBytes(packetBytes: bytearray) -> None:
         pass
 
@@ -72,6 +184,26 @@ class PacketSegment:
         """
         pass
 
+    def PackInto(self, buffer: bytearray, offset: int = 0) -> int:
+        """
+        Writes the byte representation into a preallocated buffer.
+
+        Segments with a fixed layout override this and write their fields
+        with pack_into directly. Otherwise the result of GetBytes is copied.
+
+        Args:
+            buffer (bytearray): Writable buffer with enough space after offset
+            offset (int): Position of the first byte in the buffer
+
+        Returns:
+            The position right after the written bytes.
+        """
+        segmentBytes = self.GetBytes()
+        endIndex = offset + len(segmentBytes)
+        buffer[offset:endIndex] = segmentBytes
+
+        return endIndex
+
     def UpdateSlicingIndices(oldStartIndex: int, oldEndIndex: int,
             length: int) -> tuple[int, int]:
         """
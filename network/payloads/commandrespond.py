@@ -26,7 +26,7 @@ class CommandRespondPayload(Payload):
                 _typeFormatString or the values are not within the expected
                 range.
         """
-        return struct.pack(CommandRespondPayload._typeFormatString, self.rsvd0, self.rsvd1)
+        return CommandRespondPayload._struct.pack(self.rsvd0, self.rsvd1)
     
     def ParseBytes(respondPayloadBytes: bytearray) -> tuple[int, int]:
         """Retrieves error and rsvd0 from binary data.
@@ -46,7 +46,7 @@ class CommandRespondPayload(Payload):
         if len(respondPayloadBytes) < CommandRespondPayload.totalSize:
             raise IndexError("Error: Too few bytes for an ErrorHeader.")
         
-        respondPayloadTuple = struct.unpack(CommandRespondPayload._typeFormatString,
+        respondPayloadTuple = CommandRespondPayload._struct.unpack_from(
             respondPayloadBytes)
         return respondPayloadTuple
 
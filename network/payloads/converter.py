@@ -17,16 +17,21 @@ class ConverterUpdateDataPayload(Payload):
     
     def GetBytes(self) -> bytearray:
         # return the bytes of the packet
-        dataBytes = struct.pack(ConverterUpdateDataPayload._typeFormatString, *self.data, 0, 0)
+        dataBytes = ConverterUpdateDataPayload._struct.pack(*self.data, 0, 0)
         return dataBytes
     
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes of the packet into a preallocated buffer
+        ConverterUpdateDataPayload._struct.pack_into(buffer, offset, *self.data, 0, 0)
+        return offset + ConverterUpdateDataPayload.size
+    
     def ParseBytes(payloadBytes : bytearray) -> list[int]:
         # parse the bytes into switchgear data
         if len(payloadBytes) != ConverterUpdateDataPayload.totalSize:
             raise IndexError("Error: Number of bytes does not match length of ConverterUpdateDataPayload.")
         
         # split the struct
-        d1, d2, d3, d4, _, __ = struct.unpack(ConverterUpdateDataPayload._typeFormatString, payloadBytes)
+        d1, d2, d3, d4, _, __ = ConverterUpdateDataPayload._struct.unpack_from(payloadBytes)
         return [d1, d2, d3, d4]
     
     @classmethod
@@ -4,7 +4,7 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterCurrentData:
+class ConverterCurrentData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
@@ -13,17 +13,28 @@ class ConverterCurrentData:
     currentM1 : int = field(default=0)
     currentP2 : int = field(default=0)
     currentM2 : int = field(default=0)
+    
+    def GetBytes(self) -> bytearray:
+        # returns the packed bytes, the currents are sent with an offset
+        return ConverterCurrentData._struct.pack(self.currentP1 + 0x8000, self.currentM1 + 0x8000,
+            self.currentP2 + 0x8000, self.currentM2 + 0x8000)
+    
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes into a preallocated buffer
+        ConverterCurrentData._struct.pack_into(buffer, offset, self.currentP1 + 0x8000, self.currentM1 + 0x8000,
+            self.currentP2 + 0x8000, self.currentM2 + 0x8000)
+        return offset + ConverterCurrentData.size
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterCurrentData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterCurrentData.")
+        if len(data) - offset < ConverterCurrentData.size:
+            raise IndexError("Error: Too few bytes for ConverterCurrentData.")
         
-        return struct.unpack(ConverterCurrentData._typeFormatString, data)
+        return ConverterCurrentData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        vp1, vm1, vp2, vm2 = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        vp1, vm1, vp2, vm2 = cls.ParseBytes(data, offset)
         
         vp1 -= 0x8000
         vm1 -= 0x8000
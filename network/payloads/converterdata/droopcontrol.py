@@ -4,7 +4,7 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterDroopControlData:
+class ConverterDroopControlData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
@@ -12,15 +12,15 @@ class ConverterDroopControlData:
     voltage : int = field(default=0)
     droopParam : int = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterDroopControlData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterDroopControlData.")
+        if len(data) - offset < ConverterDroopControlData.size:
+            raise IndexError("Error: Too few bytes for ConverterDroopControlData.")
         
-        return struct.unpack(ConverterDroopControlData._typeFormatString, data)
+        return ConverterDroopControlData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        voltage, droopParam, _, __ = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        voltage, droopParam, _, __ = cls.ParseBytes(data, offset)
         
         return ConverterDroopControlData(voltage, droopParam)
\ No newline at end of file
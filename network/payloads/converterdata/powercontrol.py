@@ -4,23 +4,23 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterPowerControlData:
+class ConverterPowerControlData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
     
     power : float = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterPowerControlData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterPowerControlData.")
+        if len(data) - offset < ConverterPowerControlData.size:
+            raise IndexError("Error: Too few bytes for ConverterPowerControlData.")
         
-        return struct.unpack(ConverterPowerControlData._typeFormatString, data)
+        return ConverterPowerControlData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        power, _, __, ___ = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        power, _, __, ___ = cls.ParseBytes(data, offset)
         
         power -= 0x8000
         power /= 100
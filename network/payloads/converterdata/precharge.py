@@ -4,22 +4,22 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterPrechargeData:
+class ConverterPrechargeData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
     
     nextMode : int = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterPrechargeData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterPrechargeData.")
+        if len(data) - offset < ConverterPrechargeData.size:
+            raise IndexError("Error: Too few bytes for ConverterPrechargeData.")
         
-        return struct.unpack(ConverterPrechargeData._typeFormatString, data)
+        return ConverterPrechargeData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        nextMode, _, __, ___ = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        nextMode, _, __, ___ = cls.ParseBytes(data, offset)
         
         return ConverterPrechargeData(nextMode)
\ No newline at end of file
@@ -4,7 +4,7 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterStaticData:
+class ConverterStaticData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
@@ -12,16 +12,16 @@ class ConverterStaticData:
     modes : int = field(default=0)
     power : float = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterStaticData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterStaticData.")
+        if len(data) - offset < ConverterStaticData.size:
+            raise IndexError("Error: Too few bytes for ConverterStaticData.")
         
-        return struct.unpack(ConverterStaticData._typeFormatString, data)
+        return ConverterStaticData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        modes, p, _, __ = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        modes, p, _, __ = cls.ParseBytes(data, offset)
         
         # calculate actual power
         sig = (p & 0xFFC0) >> 6
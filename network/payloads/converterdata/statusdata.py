@@ -4,7 +4,7 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterStatusData:
+class ConverterStatusData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
@@ -14,15 +14,24 @@ class ConverterStatusData:
     errors : int = field(default=0)
     mode : int = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def GetBytes(self) -> bytearray:
+        # returns the packed bytes
+        return ConverterStatusData._struct.pack(self.state, self.warnings, self.errors, self.mode)
+
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes into a preallocated buffer
+        ConverterStatusData._struct.pack_into(buffer, offset, self.state, self.warnings, self.errors, self.mode)
+        return offset + ConverterStatusData.size
+
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterStatusData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterStatusData.")
+        if len(data) - offset < ConverterStatusData.size:
+            raise IndexError("Error: Too few bytes for ConverterStatusData.")
         
-        return struct.unpack(ConverterStatusData._typeFormatString, data)
+        return ConverterStatusData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        status, warnings, errors, mode = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        status, warnings, errors, mode = cls.ParseBytes(data, offset)
         
         return ConverterStatusData(status, warnings, errors, mode)
\ No newline at end of file
@@ -4,22 +4,22 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterVoltageControlData:
+class ConverterVoltageControlData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
     
     voltage : int = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterVoltageControlData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterVoltageControlData.")
+        if len(data) - offset < ConverterVoltageControlData.size:
+            raise IndexError("Error: Too few bytes for ConverterVoltageControlData.")
         
-        return struct.unpack(ConverterVoltageControlData._typeFormatString, data)
+        return ConverterVoltageControlData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        voltage, _, __, ___ = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        voltage, _, __, ___ = cls.ParseBytes(data, offset)
         
         return ConverterVoltageControlData(voltage)
\ No newline at end of file
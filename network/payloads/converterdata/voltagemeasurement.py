@@ -4,7 +4,7 @@ from enum import IntEnum
 from network.packetsegment import *
 
 @dataclass
-class ConverterVoltageData:
+class ConverterVoltageData(PacketSegment):
     _typeFormatString = "HHHH"
     _typeFormatString = PacketSegment._byteOrder + _typeFormatString
     size = struct.calcsize(_typeFormatString)
@@ -14,15 +14,24 @@ class ConverterVoltageData:
     voltageP2 : int = field(default=0)
     voltageM2 : int = field(default=0)
 
-    def ParseBytes(data : bytearray) -> tuple[int, int, int, int]:
+    def GetBytes(self) -> bytearray:
+        # returns the packed bytes
+        return ConverterVoltageData._struct.pack(self.voltageP1, self.voltageM1, self.voltageP2, self.voltageM2)
+
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes into a preallocated buffer
+        ConverterVoltageData._struct.pack_into(buffer, offset, self.voltageP1, self.voltageM1, self.voltageP2, self.voltageM2)
+        return offset + ConverterVoltageData.size
+
+    def ParseBytes(data : bytearray, offset : int = 0) -> tuple[int, int, int, int]:
         # chekc length and return data
-        if len(data) != ConverterVoltageData.size:
-            raise IndexError("Error: Number of bytes does not match length of ConverterVoltageData.")
+        if len(data) - offset < ConverterVoltageData.size:
+            raise IndexError("Error: Too few bytes for ConverterVoltageData.")
         
-        return struct.unpack(ConverterVoltageData._typeFormatString, data)
+        return ConverterVoltageData._struct.unpack_from(data, offset)
 
     @classmethod
-    def GetDataFromBytes(cls, data : bytearray):
-        vp1, vm1, vp2, vm2 = cls.ParseBytes(data)
+    def GetDataFromBytes(cls, data : bytearray, offset : int = 0):
+        vp1, vm1, vp2, vm2 = cls.ParseBytes(data, offset)
         
         return ConverterVoltageData(vp1, vm1, vp2, vm2)
\ No newline at end of file
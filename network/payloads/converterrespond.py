@@ -91,30 +91,83 @@ class ConverterLiveDataPayload(Payload):
     
     def ParseBytes(payloadBytes : bytearray):
         # check length
-        print (len(payloadBytes))
         if len(payloadBytes) != ConverterLiveData.LIVE_DATA_LENGTH:
             raise IndexError("Error: Too few bytes for converter live data.")
         
-        statusBits, = struct.unpack(ConverterLiveDataPayload._typeFormatString, payloadBytes[0:4])
-        print (statusBits)
+        statusBits, = ConverterLiveDataPayload._struct.unpack_from(payloadBytes, 0)
         
-        converterStructure = payloadBytes[8:]
+        # the converter structure starts at byte 8
+        converterStructure = 8
         
-        # process the bytes
-        statusData = ConverterStatusData.GetDataFromBytes(converterStructure[0:8])
-        staticData = ConverterStaticData.GetDataFromBytes(converterStructure[8:16])
-        voltageData = ConverterVoltageData.GetDataFromBytes(converterStructure[16:24])
-        currentData = ConverterCurrentData.GetDataFromBytes(converterStructure[24:32])
-        vControl1Data = ConverterVoltageControlData.GetDataFromBytes(converterStructure[48:56])
-        vControl2Data = ConverterVoltageControlData.GetDataFromBytes(converterStructure[56:64])
-        dControl1Data = ConverterDroopControlData.GetDataFromBytes(converterStructure[64:72])
-        dControl2Data = ConverterDroopControlData.GetDataFromBytes(converterStructure[72:80])
-        pControlData = ConverterPowerControlData.GetDataFromBytes(converterStructure[80:88])
-        precharge1Data = ConverterPrechargeData.GetDataFromBytes(converterStructure[88:96])
-        precharge2Data = ConverterPrechargeData.GetDataFromBytes(converterStructure[96:104])
+        # process the bytes in place
+        statusData = ConverterStatusData.GetDataFromBytes(payloadBytes, converterStructure + 0)
+        staticData = ConverterStaticData.GetDataFromBytes(payloadBytes, converterStructure + 8)
+        voltageData = ConverterVoltageData.GetDataFromBytes(payloadBytes, converterStructure + 16)
+        currentData = ConverterCurrentData.GetDataFromBytes(payloadBytes, converterStructure + 24)
+        vControl1Data = ConverterVoltageControlData.GetDataFromBytes(payloadBytes, converterStructure + 48)
+        vControl2Data = ConverterVoltageControlData.GetDataFromBytes(payloadBytes, converterStructure + 56)
+        dControl1Data = ConverterDroopControlData.GetDataFromBytes(payloadBytes, converterStructure + 64)
+        dControl2Data = ConverterDroopControlData.GetDataFromBytes(payloadBytes, converterStructure + 72)
+        pControlData = ConverterPowerControlData.GetDataFromBytes(payloadBytes, converterStructure + 80)
+        precharge1Data = ConverterPrechargeData.GetDataFromBytes(payloadBytes, converterStructure + 88)
+        precharge2Data = ConverterPrechargeData.GetDataFromBytes(payloadBytes, converterStructure + 96)
         
         return (statusBits, statusData, staticData, voltageData, currentData, vControl1Data, vControl2Data, dControl1Data, dControl2Data, pControlData, precharge1Data, precharge2Data)
     
     @classmethod
     def GetPayloadFromBytes(cls, payloadBytes : bytearray) -> ConverterLiveDataPayload(Payload):
-        return ConverterLiveDataPayload(*cls.ParseBytes(payloadBytes))
\ No newline at end of file
+        # the data sets are only decoded when they are used
+        return ConverterLiveDataView(payloadBytes)
+
+class LazyDataSet:
+    # data set of the converter live data. On the first access all data sets
+    # are decoded and stored in the instance, so later accesses don't reach
+    # the descriptor anymore.
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        instance.DecodeDataSets()
+        return instance.__dict__[self.name]
+
+class ConverterLiveDataView(ConverterLiveDataPayload):
+    # converter live data created from received bytes. Only the status is
+    # decoded right away, it is all a converter without an open control
+    # window reads. The data sets are decoded when they are accessed.
+
+    # names of the data sets in the order of ParseBytes
+    dataSetNames = ConverterLiveDataPayload._fieldNames[2:]
+
+    statusDataSet       = LazyDataSet()
+    staticDataSet       = LazyDataSet()
+    voltageMeasurement  = LazyDataSet()
+    currentMeasurement  = LazyDataSet()
+    voltageControl1Data = LazyDataSet()
+    voltageControl2Data = LazyDataSet()
+    droopControl1Data   = LazyDataSet()
+    droopControl2Data   = LazyDataSet()
+    powerControlData    = LazyDataSet()
+    precharge1Data      = LazyDataSet()
+    precharge2Data      = LazyDataSet()
+
+    def __init__(self, payloadBytes : bytearray):
+        # check length
+        if len(payloadBytes) != ConverterLiveData.LIVE_DATA_LENGTH:
+            raise IndexError("Error: Too few bytes for converter live data.")
+
+        # copy the bytes, the receive buffer is reused for the next frames
+        self.liveDataBytes = bytes(payloadBytes)
+
+        self.status, = ConverterLiveDataPayload._struct.unpack_from(self.liveDataBytes, 0)
+
+    def DecodeDataSets(self):
+        # a control window reads all data sets, so they are decoded together.
+        # The bytes were received, no need to validate the data sets.
+        with TrustedDecode():
+            dataSets = ConverterLiveDataPayload.ParseBytes(self.liveDataBytes)[1:]
+
+        self.__dict__.update(zip(ConverterLiveDataView.dataSetNames, dataSets))
+        return
\ No newline at end of file
@@ -81,7 +81,7 @@ class BreakerStatusPayload(Payload):
             struct.error: The type of at least one field doesn't match with
                 _typeFormatString or the value exceeds the expected range.
         """
-        breakerStatusBytes = struct.pack(BreakerStatusPayload._typeFormatString,
+        breakerStatusBytes = BreakerStatusPayload._struct.pack(
             self.status, self.voltageNode1, self.voltageNode2, self.current)
         return breakerStatusBytes
 
@@ -103,8 +103,7 @@ class BreakerStatusPayload(Payload):
         """
         if len(breakerBytes) < BreakerStatusPayload.size:
             raise IndexError("Error: Too few bytes for a BreakerStatusPayload.")
-        breakerBytes = breakerBytes[:BreakerStatusPayload.size]
-        return struct.unpack(BreakerStatusPayload._typeFormatString, breakerBytes)
+        return BreakerStatusPayload._struct.unpack_from(breakerBytes)
 
     @classmethod
     def GetPayloadFromBytes(cls, payloadBytes: bytearray) -> BreakerStatusPayload:
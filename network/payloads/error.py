@@ -55,7 +55,7 @@ class ErrorPayload(Payload):
                 _typeFormatString or the values are not within the expected
                 range.
         """
-        return struct.pack(ErrorPayload._typeFormatString, self.error,
+        return ErrorPayload._struct.pack(self.error,
             self.rsvd0)
     
     def ParseBytes(errorPayloadBytes: bytearray) -> tuple[int, int]:
@@ -76,7 +76,7 @@ class ErrorPayload(Payload):
         if len(errorPayloadBytes) < ErrorPayload.totalSize:
             raise IndexError("Error: Too few bytes for an ErrorHeader.")
         
-        errorPayloadTuple = struct.unpack(ErrorPayload._typeFormatString,
+        errorPayloadTuple = ErrorPayload._struct.unpack_from(
             errorPayloadBytes)
         return errorPayloadTuple
 
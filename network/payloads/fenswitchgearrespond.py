@@ -29,13 +29,26 @@ class FENSwitchgearLiveDataPayload(Payload):
     current3 : int = field(default=0)
     current4 : int = field(default=0)
     
+    def GetBytes(self) -> bytearray:
+        # returns the packed bytes
+        return FENSwitchgearLiveDataPayload._struct.pack(self.closedSwitches,
+            self.lockedSwitches, self.hvOnLine, self.deviceStatus, self.voltageP,
+            self.voltageM, self.current1, self.current2, self.current3, self.current4)
+
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes into a preallocated buffer
+        FENSwitchgearLiveDataPayload._struct.pack_into(buffer, offset, self.closedSwitches,
+            self.lockedSwitches, self.hvOnLine, self.deviceStatus, self.voltageP,
+            self.voltageM, self.current1, self.current2, self.current3, self.current4)
+        return offset + FENSwitchgearLiveDataPayload.size
+
     def ParseBytes(payloadBytes :  bytearray) -> tuple[int, int, int, int, int, int, int, int, int, int]:
         # parse the bytes into switchgear data
         if len(payloadBytes) != FENSwitchgearLiveDataPayload.totalSize:
             raise IndexError("Error: Number of bytes does not match length of FENSwitchgearLiveDataPayload.")
         
         # split the struct
-        closed, locked, hv, status, vp, vm, c1, c2, c3, c4 = struct.unpack(FENSwitchgearLiveDataPayload._typeFormatString, payloadBytes)
+        closed, locked, hv, status, vp, vm, c1, c2, c3, c4 = FENSwitchgearLiveDataPayload._struct.unpack_from(payloadBytes)
         return (closed, locked, hv, status, vp, vm, c1, c2, c3, c4)
     
     @classmethod
@@ -61,7 +61,7 @@ class BreakerConfig(GridElementConfig):
                 _typeFormatString or the value exceeds the expected range.
         """
         gridElementConfigBytes = super().GetBytes()
-        breakerConfigBytes = struct.pack(BreakerConfig._typeFormatString, 
+        breakerConfigBytes = BreakerConfig._struct.pack(
             self.point1Id, self.point2Id, self.port, self.config, self.ip,
             self.posX, self.posY, self.rotation, self.rsvd)
         
@@ -90,8 +90,7 @@ class BreakerConfig(GridElementConfig):
         """
         if len(breakerConfigBytes) < BreakerConfig.size:
             raise IndexError("Error: Too few bytes for a BreakerConfig")
-        breakerConfigBytes = breakerConfigBytes[:BreakerConfig.size]
-        breakerConfigTuple = struct.unpack(BreakerConfig._typeFormatString,
+        breakerConfigTuple = BreakerConfig._struct.unpack_from(
             breakerConfigBytes)
         return breakerConfigTuple
 
@@ -64,7 +64,7 @@ class ConverterConfig(GridElementConfig):
         """
         gridElementConfigBytes = super().GetBytes()
         ip = IP2Int(self.ip)
-        converterConfigBytes = struct.pack(ConverterConfig._typeFormatString,
+        converterConfigBytes = ConverterConfig._struct.pack(
                 self.point1Id, self.point2Id, self.config, self.port,
                 ip, self.posX, self.posY, self.rotation, self.rsvd)
         
@@ -94,8 +94,7 @@ class ConverterConfig(GridElementConfig):
         if len(converterConfigBytes) < ConverterConfig.size:
             raise IndexError("Error: Too few bytes  for a ConverterConfig")
         
-        converterConfigBytes = converterConfigBytes[:ConverterConfig.size]
-        converterConfigTuple = struct.unpack(ConverterConfig._typeFormatString, converterConfigBytes)
+        converterConfigTuple = ConverterConfig._struct.unpack_from(converterConfigBytes)
         
         return converterConfigTuple
 
@@ -61,8 +61,7 @@ class FENSwitchgearConfig(GridElementConfig):
         """
         gridElementConfigBytes = super().GetBytes()
         ip = IP2Int(self.ip)
-        FENSwitchgearConfigBytes = struct.pack(
-            FENSwitchgearConfig._typeFormatString, self.point1Id,
+        FENSwitchgearConfigBytes = FENSwitchgearConfig._struct.pack(self.point1Id,
             self.point2Id, self.point3Id, self.point4Id, self.port, self.config, ip,
             self.posX, self.posY, self.rotation, self.rsvd)
         
@@ -92,9 +91,8 @@ class FENSwitchgearConfig(GridElementConfig):
         """
         if len(FENSwitchgearConfigBytes) < FENSwitchgearConfig.size:
             raise IndexError("Error: Too few bytes for a FENSwitchgearConfig")
-        FENSwitchgearConfigBytes = FENSwitchgearConfigBytes[:FENSwitchgearConfig.size]
         
-        FENSwitchgearConfigTuple = struct.unpack(FENSwitchgearConfig._typeFormatString, FENSwitchgearConfigBytes)
+        FENSwitchgearConfigTuple = FENSwitchgearConfig._struct.unpack_from(FENSwitchgearConfigBytes)
         
         return FENSwitchgearConfigTuple
 
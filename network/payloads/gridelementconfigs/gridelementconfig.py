@@ -46,8 +46,7 @@ class GridElementConfig(Payload):
                 _TypeFormatString or the values are not within the expected
                 range.
         """
-        gridElementConfigBytes = struct.pack(
-            GridElementConfig._typeFormatString,
+        gridElementConfigBytes = GridElementConfig._struct.pack(
             self.elementType, self.id)
         return gridElementConfigBytes
 
@@ -68,9 +67,7 @@ class GridElementConfig(Payload):
         """
         if len(gridElementConfigBytes) < GridElementConfig.size:
             raise IndexError("Error: Too few bytes for a GridElementConfig")
-        gridElementConfigBytes = (
-            gridElementConfigBytes[:GridElementConfig.size])
-        return struct.unpack(GridElementConfig._typeFormatString,
+        return GridElementConfig._struct.unpack_from(
             gridElementConfigBytes)
 
     def FillUpGridElementConfig(self, gridElementConfigBytes : bytearray) -> bytearray:
@@ -50,7 +50,7 @@ class NodeConfig(GridElementConfig):
                 _typeFormatString or the value exceeds the expected range.
         """
         gridElementConfigBytes = super().GetBytes()
-        nodeConfigBytes = struct.pack(NodeConfig._typeFormatString, self.nodeType, self.rsvd)
+        nodeConfigBytes = NodeConfig._struct.pack(self.nodeType, self.rsvd)
         
         unpadded = gridElementConfigBytes + nodeConfigBytes
         return self.FillUpGridElementConfig(unpadded)
@@ -74,8 +74,7 @@ class NodeConfig(GridElementConfig):
         if len(nodeConfigBytes) < NodeConfig.size:
             raise IndexError("Error: Too few bytes for a NodeConfig")
         
-        nodeConfigBytes = nodeConfigBytes[:NodeConfig.size]
-        nodeConfigTuple = struct.unpack(NodeConfig._typeFormatString, nodeConfigBytes)
+        nodeConfigTuple = NodeConfig._struct.unpack_from(nodeConfigBytes)
         
         return nodeConfigTuple
 
@@ -57,7 +57,7 @@ class PointConfig(GridElementConfig):
                 _typeFormatString or the value exceeds the expected range.
         """
         gridElementConfigBytes = super().GetBytes()
-        pointConfigBytes = struct.pack(PointConfig._typeFormatString,
+        pointConfigBytes = PointConfig._struct.pack(
             self.nodeId, self.rsvd, self.posX, self.posY)
         unpadded = gridElementConfigBytes + pointConfigBytes
         return self.FillUpGridElementConfig(unpadded)
@@ -81,8 +81,7 @@ class PointConfig(GridElementConfig):
         """
         if len(pointConfigBytes) < PointConfig.size:
             raise IndexError("Error: Too few bytes for a PointConfig")
-        pointConfigBytes = pointConfigBytes[:PointConfig.size]
-        pointConfigTuple = struct.unpack(PointConfig._typeFormatString,
+        pointConfigTuple = PointConfig._struct.unpack_from(
             pointConfigBytes)
         return pointConfigTuple
 
@@ -63,7 +63,7 @@ class SciBreakBreakerConfig(GridElementConfig):
         """
         gridElementConfigBytes = super().GetBytes()
         ip = IP2Int(self.ip)
-        breakerConfigBytes = struct.pack(SciBreakBreakerConfig._typeFormatString, 
+        breakerConfigBytes = SciBreakBreakerConfig._struct.pack(
             self.point1Id, self.point2Id, self.config, self.port, ip,
             self.posX, self.posY, self.rotation, self.rsvd)
         
@@ -92,8 +92,7 @@ class SciBreakBreakerConfig(GridElementConfig):
         """
         if len(breakerConfigBytes) < SciBreakBreakerConfig.size:
             raise IndexError("Error: Too few bytes for a SciBreakBreakerConfig")
-        breakerConfigBytes = breakerConfigBytes[:SciBreakBreakerConfig.size]
-        breakerConfigTuple = struct.unpack(SciBreakBreakerConfig._typeFormatString,
+        breakerConfigTuple = SciBreakBreakerConfig._struct.unpack_from(
             breakerConfigBytes)
         return breakerConfigTuple
 
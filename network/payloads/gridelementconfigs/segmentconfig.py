@@ -46,7 +46,7 @@ class SegmentConfig(GridElementConfig):
                 _typeFormatString or the value exceeds the expected range.
         """
         nodeConfigBytes = super().GetBytes()
-        segmentConfigBytes = struct.pack(SegmentConfig._typeFormatString,
+        segmentConfigBytes = SegmentConfig._struct.pack(
             self.point1Id, self.point2Id)
         unpadded = nodeConfigBytes + segmentConfigBytes
         return self.FillUpGridElementConfig(unpadded)
@@ -70,8 +70,7 @@ class SegmentConfig(GridElementConfig):
         """
         if len(segmentConfigBytes) < SegmentConfig.size:
             raise IndexError("Error: Too few bytes for a SegmentConfig")
-        segmentConfigBytes = segmentConfigBytes[:SegmentConfig.size]
-        segmentConfigTuple = struct.unpack(SegmentConfig._typeFormatString,
+        segmentConfigTuple = SegmentConfig._struct.unpack_from(
             segmentConfigBytes)
         return segmentConfigTuple
 
@@ -41,7 +41,7 @@ class SourceConfig(GridElementConfig):
                 _typeFormatString or the value exceeds the expected range.
         """
         gridElementConfigBytes = super().GetBytes()
-        sourceConfigBytes = struct.pack(SourceConfig._typeFormatString,
+        sourceConfigBytes = SourceConfig._struct.pack(
             self.pointId, self.posX, self.posY, self.rotation)
         
         if len(self.name) > 36:
@@ -70,8 +70,7 @@ class SourceConfig(GridElementConfig):
         if len(sourceConfigBytes) < SourceConfig.size:
             raise IndexError("Error: Too few bytes for a SourceConfig")
         
-        sourceConfigBytes = sourceConfigBytes[:SourceConfig.size]
-        sourceConfigTuple = struct.unpack(SourceConfig._typeFormatString, sourceConfigBytes)
+        sourceConfigTuple = SourceConfig._struct.unpack_from(sourceConfigBytes)
         
         return sourceConfigTuple
     
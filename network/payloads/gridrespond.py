@@ -21,6 +21,20 @@ class GridGetLengthRespondPayload(Payload):
     rsvd1 : int = field(default=0)
     rsvd2 : int = field(default=0)
     
+    def GetBytes(self) -> bytearray:
+        """Gives the binary representation of the GridGetLengthRespondPayload.
+        
+        Returns:
+            bytearray: Binary representation of the fields.
+        
+        Raises:
+            struct.error: The type of one of the fields doesn't match with
+                _typeFormatString or the values are not within the expected
+                range.
+        """
+        return GridGetLengthRespondPayload._struct.pack(self.numPackets,
+            self.rsvd0, self.rsvd1, self.rsvd2)
+    
     def ParseBytes(getLengthPayloadBytes: bytearray) -> int:
         """Retrieves the number of packets.
         
@@ -39,7 +53,7 @@ class GridGetLengthRespondPayload(Payload):
         if len(getLengthPayloadBytes) < GridGetLengthRespondPayload.totalSize:
             raise IndexError("Error: Too few bytes for an GetLengthHeader.")
         
-        numPackets, _, __, ___ = struct.unpack(GridGetLengthRespondPayload._typeFormatString, getLengthPayloadBytes)
+        numPackets, _, __, ___ = GridGetLengthRespondPayload._struct.unpack_from(getLengthPayloadBytes)
         return numPackets
     
     @classmethod
@@ -40,7 +40,7 @@ class IsAlivePayload(Payload):
                 _typeFormatString or the values are not within the expected
                 range.
         """
-        return struct.pack(IsAlivePayload._typeFormatString, self.rsvd0, self.rsvd1)
+        return IsAlivePayload._struct.pack(self.rsvd0, self.rsvd1)
 
     def ParseBytes(isAliveBytes: bytearray) -> tuple[int, int]:
         """Retrieves rsvd0 and rsvd1 from binary data.
@@ -59,7 +59,7 @@ class IsAlivePayload(Payload):
         """
         if len(isAliveBytes) < IsAlivePayload.totalSize:
             raise IndexError("Error: Too Few bytes for an IsAlivePayload.")
-        isAliveTuple = struct.unpack(IsAlivePayload._typeFormatString,
+        isAliveTuple = IsAlivePayload._struct.unpack_from(
             isAliveBytes)
         return isAliveTuple
 
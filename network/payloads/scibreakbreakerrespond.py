@@ -30,13 +30,24 @@ class SciBreakBreakerLiveDataPayload(Payload):
     tripLevelTop : int = field(default=0)
     tripLevelBot : int = field(default=0)
     
+    def GetBytes(self) -> bytearray:
+        # returns the packed bytes
+        return SciBreakBreakerLiveDataPayload._struct.pack(self.status, self.voltageTop,
+            self.voltageBot, self.currentTop, self.currentBot, self.tripLevelTop, self.tripLevelBot)
+
+    def PackInto(self, buffer : bytearray, offset : int = 0) -> int:
+        # write the bytes into a preallocated buffer
+        SciBreakBreakerLiveDataPayload._struct.pack_into(buffer, offset, self.status, self.voltageTop,
+            self.voltageBot, self.currentTop, self.currentBot, self.tripLevelTop, self.tripLevelBot)
+        return offset + SciBreakBreakerLiveDataPayload.size
+
     def ParseBytes(payloadBytes :  bytearray):
         # parse the bytes into switchgear data
         if len(payloadBytes) != SciBreakBreakerLiveDataPayload.totalSize:
             raise IndexError("Error: Number of bytes does not match length of SciBreakBreakerLiveDataPayload.")
         
         # split the struct
-        status, voltageTop, voltageBot, currentTop, currentBot, tripLevelTop, tripLevelBot = struct.unpack(SciBreakBreakerLiveDataPayload._typeFormatString, payloadBytes)
+        status, voltageTop, voltageBot, currentTop, currentBot, tripLevelTop, tripLevelBot = SciBreakBreakerLiveDataPayload._struct.unpack_from(payloadBytes)
         return (status, voltageTop, voltageBot, currentTop, currentBot, tripLevelTop, tripLevelBot)
     
     @classmethod
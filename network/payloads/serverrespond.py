@@ -22,7 +22,7 @@ class ServerStatusPayload(Payload):
     
     def GetBytes(self) -> bytearray:
         # returns the packed bytes
-        return struct.pack(ServerStatusPayload._typeFormatString, self.usedConnections,
+        return ServerStatusPayload._struct.pack(self.usedConnections,
                             self.status, self.serverLoad, self.connectedDevices, self.fileVersion, self.rsvd1, self.rsvd2)
     
     def ParseBytes(statusPayloadBytes : bytearray) -> tuple[int, int, int, int, int]:
@@ -30,7 +30,7 @@ class ServerStatusPayload(Payload):
         if len(statusPayloadBytes) != ServerStatusPayload.totalSize:
             raise IndexError("Error: Too few bytes for a ServerStatusPayload.")
         
-        connections, status, load, devices, version, _, __ = struct.unpack(ServerStatusPayload._typeFormatString, statusPayloadBytes)
+        connections, status, load, devices, version, _, __ = ServerStatusPayload._struct.unpack_from(statusPayloadBytes)
         
         return (connections, status, load, devices, version)
     
@@ -0,0 +1,21 @@
+from network.streamframer import StreamFramer
+
+class ReceiveBuffer(StreamFramer):
+    # stream framer, which receives directly from a socket into its buffer
+    def RecvFrom(self, sock) -> int:
+        # receive directly into the free part of the buffer
+        received = sock.recv_into(self.GetWriteView())
+        self.CommitWrite(received)
+
+        return received
+
+    def GetWriteView(self):
+        # make room at the end of the buffer if the last frame is incomplete
+        # and return a view on the free part
+        self._MakeRoom()
+        return self.view[self.writeIndex:]
+
+    def CommitWrite(self, count):
+        # count bytes written into the view of GetWriteView
+        self.writeIndex += count
+        return
\ No newline at end of file
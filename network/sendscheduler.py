@@ -0,0 +1,166 @@
+import socket
+import threading
+from collections import deque
+from enum import IntEnum
+
+class SendPriority(IntEnum):
+    # lower values are sent first
+    SAFETY = 0
+    CONTROL = 1
+    BULK = 2
+    KEEPALIVE = 3
+
+class SendQueue:
+    # one bounded queue of frames per priority, shared by all sending threads
+    def __init__(self, maxQueuedBytes = 256 * 1024, maxBatchBytes = 16 * 1024, maxBatchFrames = 256):
+        # all access is guarded by the condition
+        self.condition = threading.Condition()
+        self.queues = [deque() for _ in SendPriority]
+        self.queuedBytes = [0] * len(SendPriority)
+        self.closed = False
+
+        # a frame of higher priority waits for one batch at most, the number
+        # of frames is limited by the buffers sendmsg accepts
+        self.maxQueuedBytes = maxQueuedBytes
+        self.maxBatchBytes = maxBatchBytes
+        self.maxBatchFrames = maxBatchFrames
+
+        # statistics
+        self.sentFrames = [0] * len(SendPriority)
+        self.sentBatches = 0
+        self.rejectedFrames = 0
+
+    def Put(self, data, priority = SendPriority.CONTROL, timeout = None) -> bool:
+        # queue a frame, wait while the queue of the priority is full. False
+        # if the queue is still full after the timeout or closed.
+        size = len(data)
+
+        with self.condition:
+            hasRoom = self.condition.wait_for(lambda: self.closed or not self.queues[priority] or
+                self.queuedBytes[priority] + size <= self.maxQueuedBytes, timeout)
+
+            if self.closed:
+                return False
+
+            if not hasRoom:
+                self.rejectedFrames += 1
+                return False
+
+            self.queues[priority].append(bytes(data))
+            self.queuedBytes[priority] += size
+            self.condition.notify_all()
+
+        return True
+
+    def GetBatch(self, timeout = None) -> list:
+        # take frames by priority until the batch is full, an empty list if
+        # nothing arrived within the timeout or the queue was closed
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.closed or any(self.queuedBytes), timeout):
+                return []
+
+            if self.closed:
+                return []
+
+            batch = []
+            size = 0
+
+            for priority, queue in enumerate(self.queues):
+                while queue and len(batch) < self.maxBatchFrames and (not batch or
+                        size + len(queue[0]) <= self.maxBatchBytes):
+                    data = queue.popleft()
+                    batch.append(data)
+                    size += len(data)
+                    self.queuedBytes[priority] -= len(data)
+                    self.sentFrames[priority] += 1
+
+            self.sentBatches += 1
+
+            # wake up senders waiting for room
+            self.condition.notify_all()
+
+        return batch
+
+    def Close(self):
+        # drop all frames and wake up all waiting threads
+        with self.condition:
+            self.closed = True
+            for queue in self.queues:
+                queue.clear()
+            self.queuedBytes = [0] * len(SendPriority)
+            self.condition.notify_all()
+        return
+
+    def GetStatistics(self) -> dict:
+        # counters of the queue
+        with self.condition:
+            return {
+                "queuedBytes" : dict(zip(SendPriority.__members__, self.queuedBytes)),
+                "sentFrames"  : dict(zip(SendPriority.__members__, self.sentFrames)),
+                "batches"     : self.sentBatches,
+                "rejected"    : self.rejectedFrames}
+
+class SendScheduler:
+    # sends all frames of a socket from one thread, small frames are
+    # coalesced into one call. Errors are reported to the onError callback.
+    def __init__(self, sock, onError = None, sendQueue = None):
+        self.socket = sock
+        self.onError = onError
+        self.queue = sendQueue if sendQueue is not None else SendQueue()
+
+        self.thread = threading.Thread(target=self._SendThreadFunction, name="send scheduler", daemon=True)
+        self.thread.start()
+
+    def Put(self, data, priority = SendPriority.CONTROL, timeout = None) -> bool:
+        return self.queue.Put(data, priority, timeout)
+
+    def Stop(self):
+        # pending frames are dropped, a blocked send ends with the socket
+        self.queue.Close()
+
+        if threading.current_thread() is not self.thread:
+            self.thread.join()
+
+        return
+
+    def _SendThreadFunction(self):
+        while True:
+            batch = self.queue.GetBatch()
+            if not batch:
+                break
+
+            try:
+                self._SendBatch(batch)
+            except Exception as e:
+                # errors after stopping are expected
+                if not self.queue.closed and self.onError:
+                    self.onError(e)
+                break
+
+        return
+
+    def _SendBatch(self, batch):
+        # send all frames, sendmsg is not available on every platform
+        sendmsg = getattr(self.socket, "sendmsg", None)
+        if sendmsg is None:
+            batch = [b"".join(batch)]
+            sendmsg = lambda buffers: self.socket.send(buffers[0])
+
+        while batch:
+            try:
+                sent = sendmsg(batch)
+            except socket.timeout:
+                # the socket buffer is full, try again until stopped
+                if self.queue.closed:
+                    return
+                continue
+
+            # remove the frames sent completely, keep the rest of a partial one
+            while batch and sent >= len(batch[0]):
+                sent -= len(batch[0])
+                batch.pop(0)
+
+            if sent:
+                batch[0] = memoryview(batch[0])[sent:]
+
+        return
\ No newline at end of file
@@ -0,0 +1,139 @@
+import struct
+
+from network.packetsegment import PacketSegment
+from network.headers.header import Header, PacketType
+from network.packets.packet import Packet
+
+class StreamFramer:
+    # packetType and length field of the header
+    headerStruct = struct.Struct(PacketSegment._byteOrder + "BxxxH")
+    
+    # packet types a frame can start with
+    packetTypes = frozenset(PacketType)
+    
+    def __init__(self, size = 2 * 65536, maxFrameLength = Packet.maxSizePacket):
+        # preallocated buffer, large enough to hold the longest possible frame
+        # and the following data
+        self.buffer = bytearray(max(size, 2 * maxFrameLength))
+        self.view = memoryview(self.buffer)
+        self.maxFrameLength = maxFrameLength
+        
+        # unprocessed data lies between readIndex and writeIndex
+        self.readIndex = 0
+        self.writeIndex = 0
+        
+        # statistics of the stream
+        self.synchronized = True
+        self.frames = 0
+        self.resyncs = 0
+        self.discardedBytes = 0
+    
+    def Feed(self, data):
+        # yield all frames completed by a chunk of bytes of any size, the views
+        # are only valid until the next frame is requested
+        data = memoryview(data)
+        position = 0
+        
+        while position < len(data):
+            free = self._MakeRoom()
+            count = min(free, len(data) - position)
+            
+            self.buffer[self.writeIndex:self.writeIndex + count] = data[position:position + count]
+            self.writeIndex += count
+            position += count
+            
+            yield from self.GetFrames()
+        
+        return
+    
+    def GetFrames(self):
+        # yield all complete frames as memoryviews into the buffer, the views
+        # are only valid until new data is added
+        while self.writeIndex - self.readIndex >= Header.size:
+            packetType, length = StreamFramer.headerStruct.unpack_from(self.buffer,
+                self.readIndex)
+            
+            # a corrupt header cannot be trusted, search for the next header
+            # byte by byte
+            if not self._IsHeader(packetType, length):
+                self._Discard(1)
+                continue
+            
+            # frames without a payload carry no data, skip the header
+            if length == Header.size:
+                self.readIndex += Header.size
+                continue
+            
+            # wait for more data if the frame is incomplete
+            if self.writeIndex - self.readIndex < length:
+                break
+            
+            # while searching, garbage might look like a header. Only accept
+            # it, if the next frame starts with a header as well.
+            if not self.synchronized:
+                nextIndex = self.readIndex + length
+                if self.writeIndex - nextIndex < Header.size:
+                    break
+                
+                if not self._IsHeader(*StreamFramer.headerStruct.unpack_from(self.buffer, nextIndex)):
+                    self._Discard(1)
+                    continue
+            
+            self.synchronized = True
+            self.frames += 1
+            
+            frameStart = self.readIndex
+            self.readIndex += length
+            yield self.view[frameStart:self.readIndex]
+        
+        # rewind for free if everything was processed
+        if self.readIndex == self.writeIndex:
+            self.readIndex = 0
+            self.writeIndex = 0
+        
+        return
+    
+    def GetStatistics(self) -> dict:
+        # counters of the stream
+        return {
+            "frames"         : self.frames,
+            "resyncs"        : self.resyncs,
+            "discardedBytes" : self.discardedBytes}
+    
+    def Reset(self):
+        # drop all unprocessed data, e.g. after a new connection
+        self.readIndex = 0
+        self.writeIndex = 0
+        self.synchronized = True
+        return
+    
+    def _IsHeader(self, packetType, length) -> bool:
+        # check if the fields of a header are plausible
+        return (packetType in StreamFramer.packetTypes and
+            Header.size <= length <= self.maxFrameLength)
+    
+    def _Discard(self, count):
+        # skip bytes, which do not belong to a valid frame
+        if self.synchronized:
+            self.synchronized = False
+            self.resyncs += 1
+        
+        self.readIndex += count
+        self.discardedBytes += count
+        return
+    
+    def _MakeRoom(self) -> int:
+        # move the remaining bytes to the start of the buffer, if the last frame
+        # might not fit anymore
+        if self.readIndex != 0 and len(self.buffer) - self.writeIndex < self.maxFrameLength:
+            self._Compact()
+        
+        return len(self.buffer) - self.writeIndex
+    
+    def _Compact(self):
+        # move the remaining bytes to the start of the buffer
+        remaining = self.writeIndex - self.readIndex
+        self.buffer[:remaining] = self.buffer[self.readIndex:self.writeIndex]
+        self.readIndex = 0
+        self.writeIndex = remaining
+        return
\ No newline at end of file
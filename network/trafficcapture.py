@@ -0,0 +1,139 @@
+import struct
+import threading
+import time
+from enum import IntEnum
+
+class CaptureDirection(IntEnum):
+    RECEIVED = 0
+    SENT = 1
+
+# a capture file starts with the magic, every record is a record header
+# followed by the raw bytes of the frame
+CAPTURE_MAGIC = b"KESSCAP1"
+recordStruct = struct.Struct("<QBH")
+
+class TrafficRecorder:
+    # writes all frames of a connection with monotonic nanosecond timestamps
+    # to an append-only capture file. Frames may be recorded from any thread.
+    def __init__(self, filename):
+        self.lock = threading.Lock()
+        self.file = open(filename, "ab")
+
+        # a new file starts with the magic
+        if self.file.tell() == 0:
+            self.file.write(CAPTURE_MAGIC)
+
+        self.frames = 0
+        self.bytes = 0
+
+    def Record(self, direction, frame, timestamp = None):
+        # timestamp and append one frame
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+
+        with self.lock:
+            if self.file is None:
+                return
+
+            self.file.write(recordStruct.pack(timestamp, direction, len(frame)))
+            self.file.write(frame)
+
+            self.frames += 1
+            self.bytes += len(frame)
+
+        return
+
+    def Close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        return
+
+    def GetStatistics(self) -> dict:
+        with self.lock:
+            return {"frames" : self.frames, "bytes" : self.bytes}
+
+def ReadCapture(filename):
+    # yield (timestamp, direction, frame) of all records, a record cut off at
+    # the end of the file is ignored
+    with open(filename, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError("Error: " + str(filename) + " is not a capture file.")
+
+        while True:
+            recordHeader = f.read(recordStruct.size)
+            if len(recordHeader) < recordStruct.size:
+                break
+
+            timestamp, direction, length = recordStruct.unpack(recordHeader)
+
+            frame = f.read(length)
+            if len(frame) < length:
+                break
+
+            yield timestamp, direction, frame
+
+    return
+
+class TrafficReplayer:
+    # feeds the frames of a capture to a function with the recorded timing,
+    # faster by a factor or as fast as possible
+    def __init__(self, filename):
+        self.filename = filename
+        self.stopEvent = threading.Event()
+
+    def Replay(self, onFrame, speed = 1.0, direction = CaptureDirection.RECEIVED) -> dict:
+        # speed None replays at maximum speed, returns the statistics
+        self.stopEvent.clear()
+
+        frames = 0
+        totalBytes = 0
+        errors = 0
+        maxLag = 0.0
+
+        firstTimestamp = None
+        start = time.perf_counter()
+
+        for timestamp, recordDirection, frame in ReadCapture(self.filename):
+            if recordDirection != direction:
+                continue
+
+            if firstTimestamp is None:
+                firstTimestamp = timestamp
+
+            # wait for the time of the frame, Stop wakes up at once
+            if speed:
+                delay = start + (timestamp - firstTimestamp) / 1e9 / speed - time.perf_counter()
+                if delay > 0:
+                    if self.stopEvent.wait(delay):
+                        break
+                else:
+                    maxLag = max(maxLag, -delay)
+
+            if self.stopEvent.is_set():
+                break
+
+            try:
+                onFrame(frame)
+            except Exception as e:
+                errors += 1
+                print ("Exception for replaying frame: " + str(e))
+
+            frames += 1
+            totalBytes += len(frame)
+
+        duration = time.perf_counter() - start
+
+        return {
+            "frames"      : frames,
+            "bytes"       : totalBytes,
+            "errors"      : errors,
+            "duration"    : duration,
+            "framesPerS"  : frames / duration if duration > 0 else 0.0,
+            "bytesPerS"   : totalBytes / duration if duration > 0 else 0.0,
+            "maxLagMs"    : maxLag * 1000}
+
+    def Stop(self):
+        self.stopEvent.set()
+        return
\ No newline at end of file
@@ -0,0 +1,45 @@
+import itertools
+import operator
+
+class ScopeChannel:
+    # live data field of a device shown in a scope channel. The field is the
+    # attribute path in the decoded live data payload, e.g.
+    # "voltageMeasurement.voltageP1", or a function of the payload.
+
+    # the scope identifies the channels by their id
+    channelIds = itertools.count(1)
+
+    def __init__(self, device, field, name = "", group = "Default", scale = 1, offset = 0):
+        self.device = device
+        self.field = field
+        self.name = name
+        self.group = group
+        self.scale = scale
+        self.offset = offset
+        self.channelId = next(ScopeChannel.channelIds)
+
+        self.getter = field if callable(field) else operator.attrgetter(field)
+
+        # latest value, set by the live data of the device
+        self.value = 0
+
+    def GetValue(self, payload):
+        # value of the field in a live data payload of the device
+        return self.getter(payload)
+
+class ScopeGroup:
+    # channels the scope receives together, every group has a stream of
+    # samples of its own
+    def __init__(self, groupId, name, channels):
+        self.groupId = groupId
+        self.name = name
+        self.channels = channels
+
+        self.stream = None
+
+        # time of the last sample by device
+        self.lastSampleTimes = {}
+
+    def GetValues(self) -> list:
+        # latest values of all channels, the other devices' values are held
+        return [channel.value for channel in self.channels]
\ No newline at end of file
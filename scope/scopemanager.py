@@ -1,27 +1,41 @@
 import tkinter as tk
+import asyncio
 import socket
 import threading
 import time
 import struct
 from generic.genericconfigwindowclass import *
+from scope.scopestream import *
+from scope.scopechannel import *
 
 class ScopeManager:
     """ this class manages the connection for a live view scope """
-    def __init__(self, master):
+    # the legacy data datagram has room for this many channels
+    legacySlots = 8
+    
+    def __init__(self, master, eventLoop = None):
         # store variables
         self.master = master
         
-        # data sources
-        self.channels = [None] * 8
-        self.channelNames = [""] * 8
-        self.channelScales = [1] * 8
-        self.channelOffsets = [0] * 8
+        # with an event loop, the scope stream runs on it instead of a thread
+        self.eventLoop = eventLoop
+        self.scopeTransport = None
+        self.scopeTimer = None
+        
+        # data sources, any number of channels in named groups
+        self.channels = []
+        self.groups = {}
+        self.groupIds = {}
         
+        # channels and groups by device, so a live data frame only touches its
+        # own channels
+        self.deviceChannels = {}
         
         # subwindow
         self.cWindow = None
         self.eWindow = None
         self.listbox = None
+        self.lastGroup = "Default"
         
         # scope connection
         self.scopeIP = ""
@@ -31,31 +45,95 @@ class ScopeManager:
         self.scopeRunThread = False
         self.scopeThread = None
         
-    def SetChannel(self, slot, source, name):
-        # set the data for a slot
-        if slot < 0 or slot > 7:
+        # streaming sends a timestamped sample of the groups of a device for
+        # every live data frame in batches, instead of the latest values of 8
+        # channels every 100 ms. The sample rate limits the samples of a device
+        # per group.
+        self.streamMode = False
+        self.sampleRate = 1000
+        self.streaming = False
+        self.streamStartTime = 0.0
+        self.streamLock = threading.Lock()
+    
+    def AddChannel(self, channel):
+        # a group holds as many channels as fit into a datagram
+        group = self.groups.get(channel.group)
+        if group and len(group.channels) >= ScopeStream.maxChannels:
+            print ("Scope group " + channel.group + " is full")
             return False
         
-        self.channels[slot] = source
-        self.channelNames[slot] = name
+        self.channels.append(channel)
+        self._UpdateGroups()
+        self._SendChannelConfigs()
         
         return True
     
-    def RemoveChannel(self, slot):
-        # delete source and name
-        if slot < 0 or slot > 7:
+    def RemoveChannel(self, channel):
+        # delete the channel and tell the scope
+        if channel not in self.channels:
             return False
         
-        self.channels[slot] = None
-        self.channelNames[slot] = ""
+        index = self.channels.index(channel)
+        self.channels.remove(channel)
+        self._UpdateGroups()
+        
+        self._SendChannelRemove(channel, index)
+        self._SendChannelConfigs()
         
         return True
     
+    def RemoveDevice(self, device):
+        # remove the channels of a deleted device
+        for channel in [c for c in self.channels if c.device is device]:
+            self.RemoveChannel(channel)
+        
+        return
+    
+    def PushLiveData(self, device, payload, sampleTime = None):
+        # take the values of the channels from a live data frame received at
+        # the monotonic sampleTime, this is called for every frame on the
+        # receiving thread
+        channels, groups = self.deviceChannels.get(device, (None, None))
+        if not channels:
+            return
+        
+        for channel in channels:
+            try:
+                channel.value = int(channel.GetValue(payload))
+            except Exception as e:
+                print ("Exception for scope channel " + channel.name + ": " + str(e))
+        
+        # the datagrams are sent under the lock, so they leave in order. The
+        # groups are taken again, they may have changed meanwhile.
+        now = time.monotonic() if sampleTime is None else sampleTime
+        with self.streamLock:
+            if not self.streaming:
+                return
+            
+            # a frame received while the streams started belongs to them
+            now = max(now, self.streamStartTime)
+            
+            channels, groups = self.deviceChannels.get(device, (None, ()))
+            for group in groups:
+                # the sample rate limits the samples of every device in a group
+                if now - group.lastSampleTimes.get(device, float("-inf")) < 1 / self.sampleRate:
+                    continue
+                
+                group.lastSampleTimes[device] = now
+                
+                datagram = group.stream.AddSample(now, group.GetValues())
+                if datagram is not None:
+                    self._SendToScope(datagram)
+        
+        return
+    
     def ConnectToScope(self):
         # create the connection window
         config = {}
         config["IP Address"] = GenericIPConfig(init=self.scopeIP).GetConfig()
         config["Scope Port"] = GenericIntConfig(init=self.scopePort, limitMin=1, limitMax=65535).GetConfig()
+        config["Streaming"] = GenericCheckboxConfig(init=self.streamMode).GetConfig()
+        config["Max Sample Rate"] = GenericIntConfig(init=self.sampleRate, limitMin=1, limitMax=10000).GetConfig()
         
         configWindow = GenericConfigurationWindow(self.master, config, self._OnIPConfigSave)
         configWindow.title("Setup Scope Connection")
@@ -66,6 +144,10 @@ class ScopeManager:
             # already connected, disconnect first
             self.DisconnectFromScope()
         
+        if self.eventLoop is not None:
+            self._OpenScopeEndpoint()
+            return
+        
         try:
             self.scopeSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         except Exception as e:
@@ -80,9 +162,17 @@ class ScopeManager:
     
     def DisconnectFromScope(self):
         # remove channels from scope
-        for i in range(8):
-            if self.channels[i]:
-                self._SendChannelInvalidate(i)
+        if self.streaming:
+            for channel in self.channels:
+                self._SendChannelRemove(channel, 0)
+        else:
+            for i in range(min(len(self.channels), ScopeManager.legacySlots)):
+                self._SendToScope(struct.pack("<I", ScopeOpcode.LEGACY_INVALIDATE + i))
+        
+        # stop timer and endpoint on the event loop, nothing to wait for
+        if self.eventLoop is not None:
+            self._CloseScopeEndpoint()
+            return
         
         # stop thread
         self.scopeRunThread = False
@@ -91,32 +181,52 @@ class ScopeManager:
         
         return
     
-    def OpenConfigWindow(self, source = None, name = ""):
+    def OpenConfigWindow(self, device = None):
         # create a subwindow
         self.cWindow = tk.Toplevel(self.master)
-        self.cWindow.title("Select or Edit Channel")
+        self.cWindow.title("Add or Edit Channel")
         
         # list of variables
-        self.listbox = tk.Listbox(self.cWindow, width=50, height=8)
-        for i in range(8):
+        self.listbox = tk.Listbox(self.cWindow, width=60, height=16)
+        scrollbar = tk.Scrollbar(self.cWindow, command=self.listbox.yview)
+        self.listbox["yscrollcommand"] = scrollbar.set
+        
+        for i in range(len(self.channels)):
             # insert names into list
-            self.listbox.insert(i + 1, "Channel " + str(i + 1) + ": " + self.channelNames[i])
+            channel = self.channels[i]
+            self.listbox.insert(i + 1, "Channel " + str(i + 1) + " [" + channel.group + "]: " + channel.name)
         
-        # delete and select button
+        # delete and edit button
         deleteButton = tk.Button(self.cWindow, text="Delete", command=self._OnDeleteButton)
         editButton = tk.Button(self.cWindow, text="Edit", command=self._OnEditButton)
-        selectButton = tk.Button(self.cWindow, text="Select", command=lambda: self._OnSelectButton(source, name))
         
-        if not source:
-            selectButton["state"] = tk.DISABLED
+        # live data field of the device and the group of the new channel
+        fieldValue = None
+        groupValue = tk.StringVar(self.cWindow, value=self.lastGroup)
+        if device:
+            fields = list(device.scopeFields)
+            fieldValue = tk.StringVar(self.cWindow, value=fields[0])
+            fieldMenu = tk.OptionMenu(self.cWindow, fieldValue, *fields)
+            groupLabel = tk.Label(self.cWindow, text="Group")
+            groupEntry = tk.Entry(self.cWindow, textvariable=groupValue)
+            
+            fieldMenu.grid(row=1, column=0)
+            groupLabel.grid(row=1, column=1)
+            groupEntry.grid(row=1, column=2)
+        
+        addButton = tk.Button(self.cWindow, text="Add", command=lambda: self._OnAddButton(device, fieldValue, groupValue))
+        
+        if not device:
+            addButton["state"] = tk.DISABLED
         else:
             deleteButton["state"] = tk.DISABLED
             editButton["state"] = tk.DISABLED
         
         self.listbox.grid(row=0, column=0, columnspan=3)
-        selectButton.grid(row=1, column=0)
-        deleteButton.grid(row=1, column=1)
-        editButton.grid(row=1, column=2)
+        scrollbar.grid(row=0, column=3, sticky="ns")
+        addButton.grid(row=2, column=0)
+        deleteButton.grid(row=2, column=1)
+        editButton.grid(row=2, column=2)
         
         self.cWindow.wait_window()
         
@@ -125,11 +235,10 @@ class ScopeManager:
         return
     
     def _OnDeleteButton(self):
-        # get selected item and delete from list
-        items = self.listbox.curselection()
-        for i in items:
-            self.RemoveChannel(i)
-            self._SendChannelInvalidate(i)
+        # get selected items and delete from list
+        channels = [self.channels[i] for i in self.listbox.curselection()]
+        for channel in channels:
+            self.RemoveChannel(channel)
         
         # close the subwindow
         if self.cWindow:
@@ -137,12 +246,14 @@ class ScopeManager:
         
         return
     
-    def _OnSelectButton(self, source, name):
-        # get selected item and delete from list
-        items = self.listbox.curselection()
-        for i in items:
-            self.SetChannel(i, source, name)
-            self._SendChannelConfigData(i)
+    def _OnAddButton(self, device, fieldValue, groupValue):
+        # add a channel for the live data field of the device
+        fieldName = fieldValue.get()
+        name = device.deviceName + "-" + fieldName
+        group = groupValue.get().strip() or "Default"
+        
+        self.AddChannel(ScopeChannel(device, device.scopeFields[fieldName], name, group))
+        self.lastGroup = group
         
         # close the subwindow
         if self.cWindow:
@@ -153,102 +264,277 @@ class ScopeManager:
     def _OnEditButton(self):
         # open editor window
         items = self.listbox.curselection()
-        slot = -1
-        
-        for i in items:
-            slot = i
-        
-        if slot < 0:
+        if not items:
             return
         
+        channel = self.channels[items[-1]]
+        
         self.eWindow = tk.Toplevel(self.master)
-        self.eWindow.title("Edit Channel " + str(slot))
+        self.eWindow.title("Edit Channel " + channel.name)
         
         # string variables for entry fields
-        scaleValue = tk.StringVar(self.master, value=str(self.channelScales[slot]))
-        offsetValue = tk.StringVar(self.master, value=str(self.channelOffsets[slot]))
+        scaleValue = tk.StringVar(self.master, value=str(channel.scale))
+        offsetValue = tk.StringVar(self.master, value=str(channel.offset))
+        groupValue = tk.StringVar(self.master, value=channel.group)
         
         scaleLabel = tk.Label(self.eWindow, text="Scale")
         offsetLabel = tk.Label(self.eWindow, text="Offset")
+        groupLabel = tk.Label(self.eWindow, text="Group")
         scaleEntry = tk.Entry(self.eWindow, textvariable=scaleValue)
         offsetEntry = tk.Entry(self.eWindow, textvariable=offsetValue)
+        groupEntry = tk.Entry(self.eWindow, textvariable=groupValue)
         saveButton = tk.Button(self.eWindow, text="OK", command=self._OnSaveButton)
         
         scaleLabel.grid(row=0, column=0)
         offsetLabel.grid(row=1, column=0)
+        groupLabel.grid(row=2, column=0)
         scaleEntry.grid(row=0, column=1)
         offsetEntry.grid(row=1, column=1)
-        saveButton.grid(row=2, column=0, columnspan=2)
+        groupEntry.grid(row=2, column=1)
+        saveButton.grid(row=3, column=0, columnspan=2)
         
         self.eWindow.wait_window()
         
         # get text from entries
         try:
-            scale = int(scaleValue.get())
-            offset = int(offsetValue.get())
-            self.channelScales[slot] = scale
-            self.channelOffsets[slot] = offset
+            channel.scale = int(scaleValue.get())
+            channel.offset = int(offsetValue.get())
         
         except Exception as e:
             print (e)
         
+        # moving the channel to another group changes both groups
+        group = groupValue.get().strip() or "Default"
+        if group != channel.group:
+            channel.group = group
+            self._UpdateGroups()
+        
         # write new config
-        self._SendChannelConfigData(slot)
+        self._SendChannelConfigs()
         
         return
     
     def _ScopeThread(self):
         # task that sends out data
         self.scopeConnected = True
-        data =[0] * 8
         
         # send channel configs
-        for i in range(8):
-            if self.channels[i]:
-                print ("Sending channel config data " + str(i))
-                self._SendChannelConfigData(i)
+        if self.streamMode:
+            self._StartStreams()
+        
+        self._SendChannelConfigs()
+        
+        if self.streamMode:
+            self._StreamChannelData()
+        else:
+            while self.scopeRunThread:
+                self._SendChannelData()
+                
+                time.sleep(0.1)
+        
+        self.scopeSocket.close()
+        self.scopeSocket = None
+        self.scopeConnected = False
         
+        return
+    
+    def _StreamChannelData(self):
+        # the live data adds the samples, the thread only sends the samples
+        # which waited too long
         while self.scopeRunThread:
-            # setup data
-            for i in range(8):
-                if self.channels[i]:
-                    data[i] = int(self.channels[i].GetValue())
-                else:
-                    data[i] = 0;
+            self._FlushDueSamples()
+            time.sleep(0.05)
+        
+        self._StopStreams()
+        
+        return
+    
+    def _StartStreams(self):
+        # every group gets a stream, they share the start time
+        with self.streamLock:
+            self.streamStartTime = time.monotonic()
+            for group in self.groups.values():
+                group.stream = ScopeStream(len(group.channels), group.groupId, startTime=self.streamStartTime)
+            
+            self.streaming = True
+        
+        return
+    
+    def _StopStreams(self):
+        with self.streamLock:
+            self.streaming = False
+        
+        return
+    
+    def _FlushDueSamples(self):
+        now = time.monotonic()
+        with self.streamLock:
+            if not self.streaming:
+                return
             
-            # pack and send data
-            bytes = struct.pack("<Iiiiiiiii", 17, *data)
+            for group in self.groups.values():
+                if group.stream.IsDue(now):
+                    self._SendToScope(group.stream.Flush())
+        
+        return
+    
+    def _SendChannelData(self):
+        # pack and send the latest values of the first channels
+        values = [channel.value for channel in self.channels[:ScopeManager.legacySlots]]
+        values += [0] * (ScopeManager.legacySlots - len(values))
+        bytes = struct.pack("<Iiiiiiiii", ScopeOpcode.LEGACY_DATA, *values)
+        
+        #print ("Sending channel data " + str(bytes))
+        self._SendToScope(bytes)
+        
+        return
+    
+    def _SendChannelConfigs(self):
+        # send the config of all channels, the changes are rare
+        if not self.scopeConnected:
+            return
+        
+        if not self.streaming:
+            for i in range(min(len(self.channels), ScopeManager.legacySlots)):
+                channel = self.channels[i]
+                channelBytes = struct.pack("<IiI", ScopeOpcode.LEGACY_CONFIG + i, channel.offset, channel.scale)
+                self._SendToScope(channelBytes + channel.name.encode('utf-8'))
             
-            #print ("Sending channel data " + str(bytes))
-            self.scopeSocket.sendto(bytes, (self.scopeIP, self.scopePort))
+            return
+        
+        # the groups first, then their channels with the index in the samples
+        for group in self.groups.values():
+            groupBytes = struct.pack("<IHH", ScopeOpcode.GROUP_CONFIG, group.groupId, len(group.channels))
+            self._SendToScope(groupBytes + group.name.encode('utf-8'))
             
-            time.sleep(0.1)
+            for i in range(len(group.channels)):
+                channel = group.channels[i]
+                channelBytes = struct.pack("<IIHHiI", ScopeOpcode.CHANNEL_CONFIG, channel.channelId, group.groupId,
+                    i, channel.offset, channel.scale)
+                self._SendToScope(channelBytes + channel.name.encode('utf-8'))
         
-        self.scopeSocket.close()
-        self.scopeSocket = None
-        self.scopeConnected = False
+        return
+    
+    def _SendChannelRemove(self, channel, index):
+        # the removed channel was at the index in the list of channels
+        if not self.scopeConnected:
+            return
+        
+        if self.streaming:
+            self._SendToScope(struct.pack("<II", ScopeOpcode.CHANNEL_REMOVE, channel.channelId))
+            return
+        
+        # the following channels move up one slot, the last slot is free
+        lastSlot = len(self.channels)
+        if index < ScopeManager.legacySlots and lastSlot < ScopeManager.legacySlots:
+            self._SendToScope(struct.pack("<I", ScopeOpcode.LEGACY_INVALIDATE + lastSlot))
         
         return
     
-    def _SendChannelConfigData(self, slot):
-        # send out the channel config data
+    def _SendToScope(self, data):
+        # send a datagram with the socket or the transport on the event loop
         if self.scopeSocket:
-            channelBytes = struct.pack("<IiI", 32 + slot, self.channelOffsets[slot], self.channelScales[slot])
-            configBytes = channelBytes + self.channelNames[slot].encode('utf-8')
-            self.scopeSocket.sendto(configBytes, (self.scopeIP, self.scopePort))
+            self.scopeSocket.sendto(data, (self.scopeIP, self.scopePort))
+        elif self.scopeTransport:
+            self.eventLoop.CallSoon(self.scopeTransport.sendto, data, (self.scopeIP, self.scopePort))
         
         return
     
-    def _SendChannelInvalidate(self, slot):
-        # send a single word
-        if self.scopeSocket:
-            invBytes = struct.pack("<I", 0x40 + slot)
-            self.scopeSocket.sendto(invBytes, (self.scopeIP, self.scopePort))
+    def _OpenScopeEndpoint(self):
+        # create the datagram endpoint on the event loop
+        endpoint = self.eventLoop.loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+            family=socket.AF_INET)
+        
+        try:
+            self.scopeTransport, _ = self.eventLoop.Submit(endpoint, timeout=1).result()
+        except Exception as e:
+            print (e)
+            return
+        
+        self.scopeConnected = True
+        
+        # send channel configs
+        if self.streamMode:
+            self._StartStreams()
+        
+        self._SendChannelConfigs()
+        
+        if self.streamMode:
+            self.scopeTimer = self.eventLoop.Every(0.05, self._FlushDueSamples)
+        else:
+            # send the channel data every 100 ms
+            self.scopeTimer = self.eventLoop.Every(0.1, self._SendChannelData)
+        
+        return
+    
+    def _CloseScopeEndpoint(self):
+        # stop the timer, the removals are sent before the transport closes
+        if self.scopeTimer is not None:
+            self.scopeTimer.cancel()
+            self.scopeTimer = None
+        
+        self._StopStreams()
+        
+        if self.scopeTransport is not None:
+            self.eventLoop.CallSoon(self.scopeTransport.close)
+            self.scopeTransport = None
+        
+        self.scopeConnected = False
+        
+        return
+    
+    def _UpdateGroups(self):
+        # build the groups from the channels. The waiting samples of the old
+        # groups are sent, the streams of the new groups go on with the
+        # sequence numbers.
+        groups = {}
+        for channel in self.channels:
+            if channel.group not in groups:
+                groupId = self.groupIds.setdefault(channel.group, len(self.groupIds) + 1)
+                groups[channel.group] = ScopeGroup(groupId, channel.group, [])
+            groups[channel.group].channels.append(channel)
+        
+        deviceChannels = {}
+        for group in groups.values():
+            for channel in group.channels:
+                channels, deviceGroups = deviceChannels.setdefault(channel.device, ([], []))
+                channels.append(channel)
+                if group not in deviceGroups:
+                    deviceGroups.append(group)
+        
+        with self.streamLock:
+            if self.streaming:
+                # groups without channels send their last samples
+                for name, oldGroup in self.groups.items():
+                    if name not in groups:
+                        datagram = oldGroup.stream.Flush()
+                        if datagram is not None:
+                            self._SendToScope(datagram)
+                
+                for name, group in groups.items():
+                    oldGroup = self.groups.get(name)
+                    sequence = 0
+                    if oldGroup is not None:
+                        datagram = oldGroup.stream.Flush()
+                        if datagram is not None:
+                            self._SendToScope(datagram)
+                        sequence = oldGroup.stream.sequence
+                    
+                    group.stream = ScopeStream(len(group.channels), group.groupId, sequence=sequence,
+                        startTime=self.streamStartTime)
+            
+            # both are replaced as a whole, the packet dispatch thread reads them
+            self.groups = groups
+            self.deviceChannels = deviceChannels
+        
+        return
     
     def _OnIPConfigSave(self, config):
         # store newly entered parameters
         self.scopeIP = config["IP Address"]
         self.scopePort = config["Scope Port"]
+        self.streamMode = bool(config["Streaming"])
+        self.sampleRate = config["Max Sample Rate"]
         return
     
     def _OnSaveButton(self):
@@ -0,0 +1,97 @@
+import struct
+import time
+
+class ScopeOpcode:
+    # first word of every datagram to the scope. The legacy opcodes carry up
+    # to 8 channels, the slot is added to the config and invalidate opcodes.
+    LEGACY_DATA = 17
+    LEGACY_CONFIG = 0x20
+    LEGACY_INVALIDATE = 0x40
+
+    # streaming, the channels are sent in groups of any size
+    SAMPLES = 18
+    GROUP_CONFIG = 19
+    CHANNEL_CONFIG = 20
+    CHANNEL_REMOVE = 21
+
+class ScopeStream:
+    # batches of timestamped samples of one channel group for the scope. A
+    # datagram starts with the header and carries as many samples as fit into
+    # it, the sequence number lets the receiver detect lost datagrams.
+
+    # opcode, sequence, time of the first sample in us since the stream
+    # started, group id, number of samples, number of channels
+    headerStruct = struct.Struct("<IIQHHH")
+
+    # datagrams stay below the usual MTU
+    maxDatagramSize = 1400
+
+    # at least one sample with its time has to fit into a datagram
+    maxChannels = (maxDatagramSize - headerStruct.size - 4) // 4
+
+    def __init__(self, channelCount = 8, groupId = 0, maxLatency = 0.1, sequence = 0, startTime = None):
+        self.channelCount = channelCount
+        self.groupId = groupId
+        self.maxLatency = maxLatency
+
+        # a sample is the time in us since the first sample of the datagram
+        # followed by the values of all channels
+        self.sampleStruct = struct.Struct("<I" + "i" * channelCount)
+        self.maxSamples = (ScopeStream.maxDatagramSize - ScopeStream.headerStruct.size) // self.sampleStruct.size
+
+        # the datagram is built in place
+        self.buffer = bytearray(ScopeStream.maxDatagramSize)
+        self.sampleCount = 0
+        self.firstSampleTime = 0.0
+        self.firstTimestamp = 0
+
+        # the streams of all groups share the start time, so their samples
+        # can be aligned
+        self.startTime = startTime if startTime is not None else time.monotonic()
+        self.sequence = sequence
+
+        # statistics
+        self.sentSamples = 0
+        self.sentDatagrams = 0
+
+    def AddSample(self, sampleTime, values):
+        # add the values sampled at the monotonic time sampleTime, returns the
+        # datagram if it is full and None otherwise
+        timestamp = int((sampleTime - self.startTime) * 1000000)
+
+        if not self.sampleCount:
+            self.firstSampleTime = sampleTime
+            self.firstTimestamp = timestamp
+
+        offset = ScopeStream.headerStruct.size + self.sampleCount * self.sampleStruct.size
+        self.sampleStruct.pack_into(self.buffer, offset, (timestamp - self.firstTimestamp) & 0xFFFFFFFF, *values)
+        self.sampleCount += 1
+
+        if self.sampleCount >= self.maxSamples:
+            return self.Flush()
+
+        return None
+
+    def IsDue(self, now) -> bool:
+        # the oldest sample waited long enough
+        return self.sampleCount > 0 and now - self.firstSampleTime >= self.maxLatency
+
+    def Flush(self):
+        # the datagram with all samples so far, None if there are none
+        if not self.sampleCount:
+            return None
+
+        ScopeStream.headerStruct.pack_into(self.buffer, 0, ScopeOpcode.SAMPLES, self.sequence,
+            self.firstTimestamp, self.groupId, self.sampleCount, self.channelCount)
+
+        datagram = bytes(self.buffer[:ScopeStream.headerStruct.size + self.sampleCount * self.sampleStruct.size])
+
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self.sentSamples += self.sampleCount
+        self.sentDatagrams += 1
+        self.sampleCount = 0
+
+        return datagram
+
+    def GetStatistics(self) -> dict:
+        return {"samples" : self.sentSamples, "datagrams" : self.sentDatagrams, "sequence" : self.sequence}
\ No newline at end of file
@@ -2,6 +2,8 @@ from enum import IntEnum
 from network.packets.serverrespond import ServerStatusPacket
 from network.packets.servercommand import *
 from network.packetdistributor import *
+from network.commandsequence import CommandSequence
+from network.sendscheduler import SendPriority
 
 class ServerStatus(IntEnum):
     GRID_LOADED = int("0x0001", 16)
@@ -22,6 +24,9 @@ class ServerManager:
         self.gridVersion = 0
         self.lastGridVersion = 0
         self.gridUpToDate = False
+        
+        # the next status is reported to the editor in any case
+        self.recheckStatus = False
     
     def Reset(self):
         self.gridLoaded = False
@@ -29,12 +34,22 @@ class ServerManager:
         self.gridVersion = 0
         self.lastGridVersion = 0
         self.gridUpToDate = False
+        self.recheckStatus = False
+        return
+    
+    def RecheckGridVersion(self):
+        # after a reconnect the server might have restarted, the grid version
+        # and status are compared again with the next status packet. The
+        # known version is kept, so an unchanged grid stays up to date.
+        self.recheckStatus = True
         return
     
     def GetGridStatus(self):
         return self.gridUpToDate, self.gridLoaded, self.gridStarted
     
-    def StartGrid(self):
+    # start and stop return at once, the optional callback is called on the Tk
+    # loop with the respond or None when the command failed
+    def StartGrid(self, callback = None):
         # check if grid is already started
         if self.gridStarted:
             return
@@ -42,21 +57,13 @@ class ServerManager:
         # create a StartGrid packet and send it so the network interface
         id, packet = ServerStartGridPacket.FromConfig()
         
-        result = self._SendPacket(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendPacket(id, packet, callback)
     
-    def StopGrid(self):
+    def StopGrid(self, callback = None):
         # create a StopGrid packet and send it to the server
         id, packet = ServerStopGridPacket.FromConfig()
         
-        result = self._SendPacket(id, packet)
-        if not result:
-            return False
-        
-        return True
+        return self._SendPacket(id, packet, callback, SendPriority.SAFETY)
     
     def NewPacket(self, packet):
         # a new packet for the server manager
@@ -70,7 +77,8 @@ class ServerManager:
     
     def _NewStatusPacket(self, statusPacket : ServerStatusPacket):
         # has something changed?
-        changed = False
+        changed = self.recheckStatus
+        self.recheckStatus = False
         
         # check if grid is loaded
         if (statusPacket.payload.status & ServerStatus.GRID_LOADED) != 0:
@@ -108,10 +116,11 @@ class ServerManager:
         
         return
     
-    def _SendPacket(self, id, packet):
-        # register packet, send data and wait for respond
-        self.packetDistributor.RegisterTransfer(id)
+    def _SendPacket(self, id, packet, callback, priority = SendPriority.CONTROL):
+        # send data without waiting for the respond
+        future = CommandSequence(self.packetDistributor, self.networkInterface, [(id, packet)], priority).Start()
         
-        self.networkInterface.SendData(packet.GetBytes())
+        if callback:
+            future.add_done_callback(lambda f: self.editor.tkBridge.Post(callback, None if f.cancelled() else f.result()))
         
-        return self.packetDistributor.WaitForTransferComplete(id)
\ No newline at end of file
+        return future
\ No newline at end of file
@@ -0,0 +1,349 @@
+import asyncio
+import heapq
+import itertools
+import time
+from math import ceil
+
+from network.streamframer import StreamFramer
+from network.headers.header import *
+from network.headers.command import CommandHeader
+from network.headers.commandrespond import CommandRespondHeader
+from network.headers.gridcommand import *
+from network.headers.gridrespond import *
+from network.headers.servercommand import *
+from network.headers.serverrespond import ServerRespond
+from network.packets.packet import Packet
+from network.payloads.gridrespond import GridGetLengthRespondPayload
+from network.payloads.serverrespond import ServerStatusPayload
+from network.payloads.gridelementconfigs.gridelementconfig import GridElementConfig
+from servermanager import ServerStatus
+
+from simulator.linkimpairments import LinkImpairments
+from simulator.simulateddevices import *
+
+class SimulatorSession(asyncio.Protocol):
+    # one client connection of the simulated server. Frames held back by the
+    # impairments wait in a heap sorted by their send time.
+    def __init__(self, server):
+        self.server = server
+        self.framer = StreamFramer()
+        self.transport = None
+
+        self.delayedFrames = []
+        self.delayTimer = None
+        self.sequence = itertools.count()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.sessions.add(self)
+        print ("Client connected: " + str(transport.get_extra_info("peername")))
+        return
+
+    def data_received(self, data):
+        for frame in self.framer.Feed(data):
+            try:
+                self.server.HandleFrame(self, frame)
+            except Exception as e:
+                print ("Exception for handling frame: " + str(e))
+        return
+
+    def connection_lost(self, exc):
+        self.server.sessions.discard(self)
+
+        if self.delayTimer is not None:
+            self.delayTimer.cancel()
+
+        print ("Client disconnected, received " + str(self.framer.GetStatistics()))
+        return
+
+    def Send(self, frames):
+        # send frames through the impairments of the link
+        impairments = self.server.impairments
+        if not impairments.IsActive():
+            self._Write(frames)
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        for frame in frames:
+            delay = impairments.GetDelay()
+            if delay is None:
+                continue
+
+            heapq.heappush(self.delayedFrames, (now + delay, next(self.sequence), frame))
+
+        # the timer always waits for the earliest frame
+        if self.delayedFrames and (self.delayTimer is None or
+                self.delayedFrames[0][0] < self.delayTimer.when()):
+            if self.delayTimer is not None:
+                self.delayTimer.cancel()
+            self.delayTimer = loop.call_at(self.delayedFrames[0][0], self._SendDelayedFrames)
+
+        return
+
+    def _SendDelayedFrames(self):
+        # write all frames, which are due
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        frames = []
+
+        while self.delayedFrames and self.delayedFrames[0][0] <= now:
+            frames.append(heapq.heappop(self.delayedFrames)[2])
+
+        self._Write(frames)
+
+        self.delayTimer = None
+        if self.delayedFrames:
+            self.delayTimer = loop.call_at(self.delayedFrames[0][0], self._SendDelayedFrames)
+
+        return
+
+    def _Write(self, frames):
+        if not frames or self.transport.is_closing():
+            return
+
+        data = b"".join(frames)
+        self.transport.write(data)
+
+        self.server.sentFrames += len(frames)
+        self.server.sentBytes += len(data)
+        return
+
+class KessServerSimulator:
+    # protocol compatible stand-in for the KESS server. It accepts grid uploads
+    # and downloads, answers start, stop and isAlive, sends the server status
+    # periodically and live data of the simulated devices at a fixed rate.
+    def __init__(self, host = "127.0.0.1", port = 50000, devices = None, liveDataRate = 10.0,
+            statusInterval = 1.0, impairments = None):
+        self.host = host
+        self.port = port
+        self.devices = devices if devices is not None else {}
+        self.liveDataRate = liveDataRate
+        self.statusInterval = statusInterval
+        self.impairments = impairments if impairments is not None else LinkImpairments()
+
+        self.sessions = set()
+
+        # grid configuration, the elements are stored as received
+        self.gridElements = []
+        self.uploadParts = {}
+        self.version = 0
+        self.subversion = 0
+        self.fileVersion = 0
+        self.status = 0
+
+        # time spent for one live data period in 0.01%
+        self.serverLoad = 0
+
+        # statistics
+        self.sentFrames = 0
+        self.sentBytes = 0
+        self.receivedCommands = 0
+        self.overruns = 0
+
+    async def Serve(self):
+        # run until cancelled
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: SimulatorSession(self), self.host, self.port)
+
+        print ("KESS server simulator listening on " + self.host + ":" + str(self.port) +
+            " with " + str(len(self.devices)) + " devices")
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._StatusLoop(), self._LiveDataLoop())
+
+    def GetStatistics(self) -> dict:
+        statistics = {
+            "sessions"  : len(self.sessions),
+            "frames"    : self.sentFrames,
+            "bytes"     : self.sentBytes,
+            "commands"  : self.receivedCommands,
+            "overruns"  : self.overruns,
+            "load"      : self.serverLoad / 100}
+        statistics.update(self.impairments.GetStatistics())
+        return statistics
+
+    def HandleFrame(self, session, frame):
+        # answer one frame of a client
+        packetType, deviceType, deviceId, length, connection = Header.ParseBytes(frame)
+
+        # isAlive packets are echoed, so the client can match its probes
+        if packetType == PacketType.ISALIVE:
+            session.Send([bytes(frame)])
+            return
+
+        if packetType != PacketType.COMMAND:
+            return
+
+        self.receivedCommands += 1
+        header = CommandHeader.GetSegmentFromBytes(frame)
+
+        if deviceType == DeviceType.GRID:
+            frames = self._HandleGridCommand(header, frame)
+        elif deviceType == DeviceType.SERVER:
+            frames = self._HandleServerCommand(header)
+        else:
+            frames = self._HandleDeviceCommand(header, frame)
+
+        session.Send(frames)
+        return
+
+    def _CreateRespond(self, header, result, payload = None) -> bytes:
+        # respond to a command, optionally followed by a payload
+        length = CommandRespondHeader.totalSize
+        if payload is not None:
+            length += payload.GetTotalSize()
+
+        respondHeader = CommandRespondHeader(deviceType=header.deviceType, deviceId=header.deviceId,
+            length=length, connection=header.connection, result=result, commandId=header.commandId)
+
+        if payload is None:
+            return respondHeader.GetBytes()
+
+        return respondHeader.GetBytes() + payload.GetBytes()
+
+    def _HandleGridCommand(self, header, frame) -> list:
+        command = header.command
+
+        if command == GridCommand.CLEAR_ALL:
+            self.gridElements = []
+            self.uploadParts = {}
+            self.status = 0
+            return [self._CreateRespond(header, GridRespond.SUCCESS)]
+
+        if command == GridCommand.LOAD_GRID_CONFIG:
+            # store the elements of the part until the grid is set up
+            loadHeader = GridCommandLoadFileHeader.GetSegmentFromBytes(frame)
+            elementsStart = GridCommandLoadFileHeader.totalSize
+            elementsEnd = elementsStart + loadHeader.numberGridElements * GridElementConfig.maxTotalSize
+
+            if elementsEnd > len(frame):
+                return [self._CreateRespond(header, GridRespond.BUFFER_SIZE)]
+
+            self.uploadParts[loadHeader.part] = bytes(frame[elementsStart:elementsEnd])
+            self.version = loadHeader.version
+            self.subversion = loadHeader.subversion
+            return [self._CreateRespond(header, GridRespond.SUCCESS)]
+
+        if command == GridCommand.SETUP_GRID:
+            # split the parts into single elements
+            elementBytes = b"".join(self.uploadParts[part] for part in sorted(self.uploadParts))
+            size = GridElementConfig.maxTotalSize
+            self.gridElements = [elementBytes[i:i + size] for i in range(0, len(elementBytes), size)]
+            self.uploadParts = {}
+
+            self.fileVersion = (self.fileVersion + 1) & 0xFFFF
+            self.status = ServerStatus.GRID_LOADED
+            print ("Grid set up with " + str(len(self.gridElements)) + " elements, version " + str(self.fileVersion))
+            return [self._CreateRespond(header, GridRespond.SUCCESS)]
+
+        if command == GridCommand.GET_CONFIG_LENGTH:
+            payload = GridGetLengthRespondPayload(len(self._GetDownloadParts()), 0, 0, 0)
+            return [self._CreateRespond(header, GridRespond.GET_CONFIG_LENGTH, payload)]
+
+        if command == GridCommand.GET_GRID_CONFIG:
+            return self._CreateDownloadFrames(header)
+
+        return [self._CreateRespond(header, GridRespond.UNKOWN_COMMAND)]
+
+    def _GetDownloadParts(self) -> list:
+        # the grid elements split like the upload of the client
+        elementsPerPart = (Packet.maxSizePacket - GridCommandGetFileHeader.totalSize) // GridElementConfig.maxTotalSize
+        return [self.gridElements[i:i + elementsPerPart] for i in range(0, len(self.gridElements), elementsPerPart)]
+
+    def _CreateDownloadFrames(self, header) -> list:
+        # one respond per part, all with the id of the command
+        parts = self._GetDownloadParts()
+        frames = []
+
+        for part, elements in enumerate(parts, 1):
+            length = GridCommandGetFileHeader.totalSize + len(elements) * GridElementConfig.maxTotalSize
+            fileHeader = GridCommandGetFileHeader(deviceId=header.deviceId, length=length,
+                connection=header.connection, result=GridRespond.GET_CONFIG_DATA,
+                commandId=header.commandId, version=self.version, subversion=self.subversion,
+                totalParts=len(parts), part=part, numberGridElements=len(elements))
+
+            frame = bytearray(Packet.GetPaddedSize(length))
+            offset = fileHeader.PackInto(frame, 0)
+            frame[offset:length] = b"".join(elements)
+            frames.append(bytes(frame))
+
+        return frames
+
+    def _HandleServerCommand(self, header) -> list:
+        if header.command == ServerCommand.START_GRID:
+            # only a loaded grid can be started
+            if not self.status & ServerStatus.GRID_LOADED:
+                return [self._CreateRespond(header, ServerRespond.UNKNOWN_COMMAND)]
+
+            self.status |= ServerStatus.GRID_STARTED
+        elif header.command == ServerCommand.STOP_GRID:
+            self.status &= ~ServerStatus.GRID_STARTED
+        else:
+            return [self._CreateRespond(header, ServerRespond.UNKNOWN_COMMAND)]
+
+        # the new status is reported at once
+        return [self._CreateRespond(header, ServerRespond.SUCCESS), self._CreateStatusFrame()]
+
+    def _HandleDeviceCommand(self, header, frame) -> list:
+        device = self.devices.get((header.deviceType, header.deviceId))
+        payloadBytes = frame[CommandHeader.totalSize:]
+
+        if device is None or not device.HandleCommand(header.command, payloadBytes):
+            return [self._CreateRespond(header, ServerRespond.UNKNOWN_COMMAND)]
+
+        return [self._CreateRespond(header, ServerRespond.SUCCESS)]
+
+    def _CreateStatusFrame(self) -> bytes:
+        # unsolicited status respond with command id 0
+        payload = ServerStatusPayload(usedConnections=len(self.sessions), status=self.status,
+            serverLoad=self.serverLoad, connectedDevices=len(self.devices), fileVersion=self.fileVersion)
+
+        header = CommandRespondHeader(deviceType=DeviceType.SERVER, deviceId=0,
+            length=CommandRespondHeader.totalSize + ServerStatusPayload.totalSize, connection=0,
+            result=ServerRespond.STATUS_DATA, commandId=0)
+
+        return header.GetBytes() + payload.GetBytes()
+
+    async def _StatusLoop(self):
+        while True:
+            await asyncio.sleep(self.statusInterval)
+
+            frame = self._CreateStatusFrame()
+            for session in list(self.sessions):
+                session.Send([frame])
+
+    async def _LiveDataLoop(self):
+        # send the live data of all devices with periodic data on, the periods
+        # don't drift. Periods missed by a busy loop are skipped and counted.
+        if not self.liveDataRate:
+            return
+
+        loop = asyncio.get_running_loop()
+        period = 1 / self.liveDataRate
+        nextPeriod = loop.time()
+
+        while True:
+            nextPeriod += period
+            delay = nextPeriod - loop.time()
+            if delay < 0:
+                missed = ceil(-delay / period)
+                self.overruns += missed
+                nextPeriod += missed * period
+                delay += missed * period
+
+            await asyncio.sleep(delay)
+
+            if not self.sessions:
+                continue
+
+            start = time.perf_counter()
+
+            now = time.monotonic()
+            frames = [device.GetLiveDataFrame(now) for device in self.devices.values() if device.liveData]
+
+            for session in list(self.sessions):
+                session.Send(frames)
+
+            self.serverLoad = min(int((time.perf_counter() - start) / period * 10000), 10000)
\ No newline at end of file
@@ -0,0 +1,43 @@
+import random
+
+class LinkImpairments:
+    # delay, loss and reordering of the frames the simulator sends. A
+    # reordered frame is held back for reorderDelay, so the frames sent
+    # meanwhile overtake it.
+    def __init__(self, delay = 0.0, jitter = 0.0, loss = 0.0, reorder = 0.0,
+            reorderDelay = 0.005, seed = None):
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.reorder = reorder
+        self.reorderDelay = reorderDelay
+
+        # a seed makes a run reproducible
+        self.random = random.Random(seed)
+
+        # statistics
+        self.lostFrames = 0
+        self.reorderedFrames = 0
+
+    def IsActive(self) -> bool:
+        # without impairments the frames are written at once
+        return bool(self.delay or self.jitter or self.loss or self.reorder)
+
+    def GetDelay(self):
+        # seconds to hold back the next frame, None if it is lost
+        if self.loss and self.random.random() < self.loss:
+            self.lostFrames += 1
+            return None
+
+        delay = self.delay
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+
+        if self.reorder and self.random.random() < self.reorder:
+            self.reorderedFrames += 1
+            delay += self.reorderDelay
+
+        return delay
+
+    def GetStatistics(self) -> dict:
+        return {"lost" : self.lostFrames, "reordered" : self.reorderedFrames}
\ No newline at end of file
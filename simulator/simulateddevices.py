@@ -0,0 +1,204 @@
+import math
+
+from network.headers.header import *
+from network.headers.devicedata import DeviceDataHeader
+from network.headers.convertercommand import *
+from network.headers.fenswitchgearcommand import *
+from network.headers.scibreakbreakercommand import *
+from network.payloads.converterrespond import *
+from network.payloads.fenswitchgearrespond import *
+from network.payloads.scibreakbreaker import SciBreakBreakerTripLevelPayload
+from network.payloads.scibreakbreakerrespond import *
+
+class SimulatedDevice:
+    # device of the simulated server. The live data frame is preallocated and
+    # the values are written into it for every period.
+    deviceType = DeviceType.NONE
+    payloadSize = 0
+
+    def __init__(self, deviceId):
+        self.deviceId = deviceId
+        self.liveData = False
+
+        # the id of the header counts the live data frames
+        self.header = DeviceDataHeader(deviceType=self.deviceType, deviceId=deviceId,
+            length=DeviceDataHeader.totalSize + self.payloadSize, connection=0, id=0)
+        self.frame = bytearray(self.header.length)
+
+    def HandleCommand(self, command, payloadBytes) -> bool:
+        # change the state for a command, False for unknown commands
+        return False
+
+    def GetLiveDataFrame(self, now) -> bytes:
+        # live data frame with the values at the monotonic time now
+        self.header.id = (self.header.id + 1) & 0xFFFFFFFF
+        offset = self.header.PackInto(self.frame, 0)
+        self._PackLiveData(now, offset)
+        return bytes(self.frame)
+
+    def _PackLiveData(self, now, offset):
+        pass
+
+    def _GetValue(self, now, mean, amplitude, period = 1.0) -> int:
+        # measurement with a slow ripple, every device has its own phase
+        return int(mean + amplitude * math.sin(2 * math.pi * now / period + self.deviceId))
+
+class SimulatedConverter(SimulatedDevice):
+    deviceType = DeviceType.CONVERTER
+    payloadSize = ConverterLiveData.LIVE_DATA_LENGTH
+
+    def __init__(self, deviceId):
+        super().__init__(deviceId)
+
+        self.statusData = ConverterStatusData(state=ConverterStatus.STATUS_OK, mode=ConverterModes.MODE_OFF)
+        self.voltageData = ConverterVoltageData()
+        self.currentData = ConverterCurrentData()
+
+    def HandleCommand(self, command, payloadBytes) -> bool:
+        # the lower byte of the command is the argument
+        group = command & 0xFF00
+        value = command & 0x00FF
+
+        if group == ConverterCommand.SET_MODE:
+            # a reset turns the converter off
+            self.statusData.mode = ConverterModes.MODE_OFF if value == ConverterModes.MODE_RESET else value
+            return True
+
+        if group == ConverterCommand.UPDATE_DATA:
+            return True
+
+        if group == ConverterCommand.PERIODIC_DATA:
+            self.liveData = value == ConverterCommand.PERIODIC_DATA_ON
+            return True
+
+        return False
+
+    def _PackLiveData(self, now, offset):
+        ConverterLiveDataPayload._struct.pack_into(self.frame, offset, ConverterStatusBits.ONLINE)
+
+        # only a running converter carries a current
+        running = self.statusData.mode not in (ConverterModes.MODE_OFF, ConverterModes.MODE_IDLE)
+        current = self._GetValue(now, 200, 20) if running else 0
+
+        self.voltageData.voltageP1 = self._GetValue(now, 4000, 50)
+        self.voltageData.voltageM1 = self._GetValue(now, 4000, 50, 1.3)
+        self.voltageData.voltageP2 = self._GetValue(now, 2000, 30)
+        self.voltageData.voltageM2 = self._GetValue(now, 2000, 30, 1.3)
+        self.currentData.currentP1 = current
+        self.currentData.currentM1 = -current
+        self.currentData.currentP2 = -current * 2
+        self.currentData.currentM2 = current * 2
+
+        # the converter structure starts at byte 8
+        converterStructure = offset + 8
+        self.statusData.PackInto(self.frame, converterStructure + 0)
+        self.voltageData.PackInto(self.frame, converterStructure + 16)
+        self.currentData.PackInto(self.frame, converterStructure + 24)
+        return
+
+class SimulatedFENSwitchgear(SimulatedDevice):
+    deviceType = DeviceType.FENSWITCHGEAR
+    payloadSize = FENSwitchgearLiveDataPayload.totalSize
+
+    def __init__(self, deviceId):
+        super().__init__(deviceId)
+
+        self.payload = FENSwitchgearLiveDataPayload(hvOnLine=1, deviceStatus=FENSwitchgearStatus.ONLINE)
+
+    def HandleCommand(self, command, payloadBytes) -> bool:
+        # the lower byte of the command is the mask of switches
+        group = command & 0xFF00
+        value = command & 0x00FF
+
+        if group == FENSwitchgearCommand.SET_SWITCH:
+            self.payload.closedSwitches |= value
+            return True
+
+        if group == FENSwitchgearCommand.RESET_SWITCH:
+            self.payload.closedSwitches &= ~value & 0xFF
+            return True
+
+        if group == FENSwitchgearCommand.GET_DATA:
+            return True
+
+        if group == FENSwitchgearCommand.PERIODIC_DATA:
+            self.liveData = value == FENSwitchgearCommand.PERIODIC_DATA_ON
+            return True
+
+        return False
+
+    def _PackLiveData(self, now, offset):
+        # closed switches carry a current
+        closed = self.payload.closedSwitches
+        current = self._GetValue(now, 100, 10)
+
+        self.payload.voltageP = self._GetValue(now, 4000, 50)
+        self.payload.voltageM = self._GetValue(now, 4000, 50, 1.3)
+        self.payload.current1 = current if closed & 0x01 else 0
+        self.payload.current2 = current if closed & 0x02 else 0
+        self.payload.current3 = current if closed & 0x04 else 0
+        self.payload.current4 = current if closed & 0x08 else 0
+
+        self.payload.PackInto(self.frame, offset)
+        return
+
+class SimulatedSciBreakBreaker(SimulatedDevice):
+    deviceType = DeviceType.SCIBREAKBREAKER
+    payloadSize = SciBreakBreakerLiveDataPayload.totalSize
+
+    # both sides of the breaker
+    closedBits = SciBreakBreakerStatus.CLOSED_TOP | SciBreakBreakerStatus.CLOSED_BOT
+
+    def __init__(self, deviceId):
+        super().__init__(deviceId)
+
+        self.payload = SciBreakBreakerLiveDataPayload(status=SciBreakBreakerStatus.ONLINE,
+            tripLevelTop=1000, tripLevelBot=1000)
+
+    def HandleCommand(self, command, payloadBytes) -> bool:
+        if command == SciBreakBreakerCommand.TURN_ON:
+            self.payload.status |= SciBreakBreakerStatus.ONLINE
+        elif command == SciBreakBreakerCommand.TURN_OFF:
+            # a breaker turned off opens as well
+            self.payload.status = 0
+        elif command == SciBreakBreakerCommand.OPEN:
+            self.payload.status &= ~SimulatedSciBreakBreaker.closedBits
+        elif command == SciBreakBreakerCommand.CLOSE:
+            if self.payload.status & SciBreakBreakerStatus.ONLINE:
+                self.payload.status |= SimulatedSciBreakBreaker.closedBits
+        elif command == SciBreakBreakerCommand.PERIODIC_DATA_ON:
+            self.liveData = True
+        elif command == SciBreakBreakerCommand.PERIODIC_DATA_OFF:
+            self.liveData = False
+        elif command == SciBreakBreakerCommand.SETTRIPLEVEL:
+            level = min(SciBreakBreakerTripLevelPayload.ParseBytes(payloadBytes)[0], 0x7FFF)
+            self.payload.tripLevelTop = level
+            self.payload.tripLevelBot = level
+        else:
+            return False
+
+        return True
+
+    def _PackLiveData(self, now, offset):
+        # only a closed breaker carries a current
+        closed = self.payload.status & SimulatedSciBreakBreaker.closedBits
+        current = self._GetValue(now, 300, 30) if closed else 0
+
+        self.payload.voltageTop = self._GetValue(now, 4000, 50)
+        self.payload.voltageBot = self._GetValue(now, 4000, 50) if closed else 0
+        self.payload.currentTop = current
+        self.payload.currentBot = current
+
+        self.payload.PackInto(self.frame, offset)
+        return
+
+def CreateDevices(converters = 0, switchgears = 0, breakers = 0) -> dict:
+    # devices by (deviceType, deviceId), the ids of every type start at 1
+    devices = {}
+
+    for deviceClass, count in ((SimulatedConverter, converters),
+            (SimulatedFENSwitchgear, switchgears), (SimulatedSciBreakBreaker, breakers)):
+        for deviceId in range(1, count + 1):
+            devices[(deviceClass.deviceType, deviceId)] = deviceClass(deviceId)
+
+    return devices
\ No newline at end of file
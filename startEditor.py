@@ -1,5 +1,8 @@
+import sys
+
 from editorclass import *
 
-editor = EditorMain()
+# --asyncio runs network and scope on one event loop instead of threads
+editor = EditorMain(eventLoopBackend = "--asyncio" in sys.argv)
 
 editor.Mainloop()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+
+from simulator.kessserver import *
+
+async def ReportStatistics(simulator, interval):
+    # print the rates of the last interval
+    lastFrames = 0
+    lastBytes = 0
+
+    while True:
+        await asyncio.sleep(interval)
+
+        statistics = simulator.GetStatistics()
+        print ("{:d} sessions, {:8.0f} frames/s, {:8.1f} kB/s, load {:5.1f}%, overruns {:d}, lost {:d}, reordered {:d}".format(
+            statistics["sessions"], (statistics["frames"] - lastFrames) / interval,
+            (statistics["bytes"] - lastBytes) / interval / 1000, statistics["load"],
+            statistics["overruns"], statistics["lost"], statistics["reordered"]))
+
+        lastFrames = statistics["frames"]
+        lastBytes = statistics["bytes"]
+
+async def Main():
+    parser = argparse.ArgumentParser(description="Local KESS server simulator")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=50000, help="server port")
+    parser.add_argument("--converters", type=int, default=4, help="number of simulated converters")
+    parser.add_argument("--switchgears", type=int, default=4, help="number of simulated FEN switchgears")
+    parser.add_argument("--breakers", type=int, default=4, help="number of simulated SciBreak breakers")
+    parser.add_argument("--rate", type=float, default=10.0, help="live data frames per second and device")
+    parser.add_argument("--live-data", action="store_true", help="send live data without a request")
+    parser.add_argument("--delay", type=float, default=0.0, help="delay of every frame in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random delay in seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability a frame is lost")
+    parser.add_argument("--reorder", type=float, default=0.0, help="probability a frame is reordered")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the impairments")
+    parser.add_argument("--report", type=float, default=5.0, help="seconds between statistics, 0 for none")
+    args = parser.parse_args()
+
+    devices = CreateDevices(args.converters, args.switchgears, args.breakers)
+    for device in devices.values():
+        device.liveData = args.live_data
+
+    impairments = LinkImpairments(delay=args.delay, jitter=args.jitter, loss=args.loss,
+        reorder=args.reorder, seed=args.seed)
+
+    simulator = KessServerSimulator(args.host, args.port, devices, args.rate, impairments=impairments)
+
+    if args.report:
+        reportTask = asyncio.get_running_loop().create_task(ReportStatistics(simulator, args.report))
+
+    await simulator.Serve()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(Main())
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file